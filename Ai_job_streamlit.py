@@ -1,164 +1,433 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 
-st.set_page_config(page_title="AI Job Dataset Insights", layout='wide')
-st.title("📊 AI Job Dataset Insights")
+import calendar_dim
+import chart_reduce
+import compute_worker
+import data_loader
+import figure_cache
+import ingest
+import perf
+import sections
+import sketches
+from agg_engine import Agg, AggEngine, arrange
+from data_loader import load_artifact, load_dataset
+from filter_index import FilterIndex
+from sections import Section
+from skill_index import SkillIndex
 
-# Load Dataset
-df = pd.read_csv("Ai_job.csv")
 
-# Parse dates safely
-df['posting_date'] = pd.to_datetime(df['posting_date'], errors='coerce')
-df['application_deadline'] = pd.to_datetime(df.get('application_deadline'), errors='coerce')
+def build_engine(df):
+    engine = AggEngine(df)
+    engine.add_mask("ai_titles", df['job_title'].str.contains("AI", case=False, na=False))
+    return engine
+
+
+# Every chart's aggregation, answered together in one pass over the coded columns
+AGGREGATIONS = {
+    "experience": Agg(by=("job_title", "experience_level")),
+    "employment": Agg(by=("job_title", "employment_type"), where="ai_titles"),
+    "countries": Agg(by=("company_location",), sort="desc", top=10),
+    "company_size": Agg(by=("company_size",), sort="desc"),
+    "remote_ratio": Agg(by=("company_name",), measure="mean", value="remote_ratio", sort="desc", top=10),
+    "residence": Agg(by=("employee_residence",), where="ai_titles", sort="desc", top=5),
+    "deadline_days": Agg(by=("company_name",), measure="mean", value="diff_days", sort="desc", top=10),
+}
+
+
+# Aggregations the ingest feed keeps running totals of: AGGREGATIONS name -> ingest aggregate
+INGESTED = {
+    "experience": "title_experience",
+    "countries": "company_location",
+    "company_size": "company_size",
+    "remote_ratio": "remote_ratio",
+    "deadline_days": "diff_days",
+}
+
+
+def aggregate(df):
+    """Every aggregation over all rows.
+
+    When the ingest feed's saved state covers the file, the ``INGESTED`` ones,
+    postings per month ("posting_months") and skill counts ("skills") are read
+    from its running aggregates instead of being recomputed.
+    """
+    state = ingest.current_state()
+    if state is None:
+        return compute_worker.run("ai_job", AGGREGATIONS, build_engine)
+    rest = {name: agg for name, agg in AGGREGATIONS.items() if name not in INGESTED}
+    results = compute_worker.run("ai_job", rest, build_engine)
+    for name, source in INGESTED.items():
+        results[name] = arrange(ingest.as_frame(state, source), AGGREGATIONS[name])
+    by_month = ingest.as_frame(state, "posting_month")
+    by_month = pd.DataFrame({"period": pd.PeriodIndex(by_month["posting_month_key"], freq="M"),
+                             "count": by_month["count"]})
+    results["posting_months"] = by_month.sort_values("period", ignore_index=True)
+    results["skills"] = ingest.as_frame(state, "skills")
+    return results
+
+
+def build_sketches(df):
+    """Top-N sketches: the ingest feed's saved ones when they cover the file, else built from the frame."""
+    return ingest.current_sketches() or {name: sketches.build(df[col]) for name, col in ingest.SKETCHES.items()}
+
+
+# ------------------------ Filters ------------------------
+FILTER_CATEGORIES = ["experience_level", "company_size", "company_location", "industry"]
+FILTER_RANGES = ["salary_usd", "years_experience", "posting_date"]
+
+
+def build_filter_index(df):
+    return FilterIndex.build(df, categories=[c for c in FILTER_CATEGORIES if c in df.columns],
+                             ranges=[c for c in FILTER_RANGES if c in df.columns])
+
+
+def filter_panel(index):
+    """Sidebar filters; returns ``(rows, selection)``: a boolean row mask (None: all rows) and the widget values."""
+    st.sidebar.header("🔎 Filter Postings")
+    values = {}
+    for col in index.bitmaps:
+        values[col] = st.sidebar.multiselect(col.replace('_', ' ').title(), index.labels(col), key=f"filter_{col}")
+    ranges = {}
+    for col in index.ranges:
+        lo, hi = index.bounds(col)
+        if lo is None or lo == hi:
+            continue
+        label = col.replace('_', ' ').title()
+        if isinstance(lo, pd.Timestamp):
+            start, end = st.sidebar.slider(label, min_value=lo.date(), max_value=hi.date(),
+                                           value=(lo.date(), hi.date()), key=f"filter_{col}")
+            # whole days: the end date includes every posting made on it
+            ranges[col] = (pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(1))
+        else:
+            ranges[col] = st.sidebar.slider(label, min_value=lo, max_value=hi, value=(lo, hi), key=f"filter_{col}")
+    combine = st.sidebar.radio("Combine filters", ["and", "or"], horizontal=True, key="filter_combine",
+                               format_func={"and": "Match all", "or": "Match any"}.get)
+    return index.select(values, ranges, combine), (values, ranges, combine)
+
+
+def filtered_results(df, rows, selection):
+    """Aggregations over ``rows``; the last filtered result is kept per session."""
+    if rows is None:
+        return load_artifact("ai_job", "aggregations", aggregate)
+    key = (id(df), repr(selection))
+    cached = st.session_state.get("ai_job_filtered")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    results = compute_worker.run("ai_job", AGGREGATIONS, build_engine, rows=rows)
+    st.session_state["ai_job_filtered"] = (key, results)
+    return results
+
 
 # Data Preview
-st.subheader("🔍 Data Preview")
-st.dataframe(df.head())
+def preview_section(df, results, rows):
+    if rows is None:
+        st.dataframe(df.head())
+        return
+    st.caption(f"{int(rows.sum()):,} of {len(df):,} postings match the filters")
+    st.dataframe(df.iloc[np.flatnonzero(rows)[:5]])
+
 
 # 1️⃣ Experience Level Distribution
-st.subheader("1️⃣ What is the distribution of experience levels across all jobs?")
-grouped = df.groupby(['job_title', 'experience_level']).size().reset_index(name='count')
-fig1 = px.bar(
-    grouped,
-    x='job_title',
-    y='count',
-    color='experience_level',
-    title="Experience Level by Job Title",
-    color_discrete_sequence=px.colors.qualitative.Set1
-)
-fig1.update_layout(xaxis_title="Job Title", yaxis_title="Count", xaxis_tickangle=45)
-st.plotly_chart(fig1, use_container_width=True)
+def experience_section(df, results, rows):
+    grouped = results["experience"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig1 = px.bar(
+            grouped,
+            x='job_title',
+            y='count',
+            color='experience_level',
+            title="Experience Level by Job Title",
+            color_discrete_sequence=px.colors.qualitative.Set1
+        )
+        fig1.update_layout(xaxis_title="Job Title", yaxis_title="Count", xaxis_tickangle=45)
+        return fig1
+
+    figure_cache.plotly_chart(figure)
+
 
 # 2️⃣ Most Common Employment Type in AI Job Titles
-st.subheader("2️⃣ Which employment type is most common in AI job postings?")
-ai_job_filtered = df[df['job_title'].str.contains("AI", case=False, na=False)]
-group2 = ai_job_filtered.groupby(['job_title', 'employment_type']).size().reset_index(name='count')
-fig2 = px.bar(
-    group2,
-    x='job_title',
-    y='count',
-    color='employment_type',
-    title="Employment Type by AI Job Title",
-    color_discrete_sequence=px.colors.qualitative.Pastel
-)
-fig2.update_layout(xaxis_title="Job Title", yaxis_title="Count", xaxis_tickangle=45)
-st.plotly_chart(fig2, use_container_width=True)
+def employment_section(df, results, rows):
+    group2 = results["employment"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig2 = px.bar(
+            group2,
+            x='job_title',
+            y='count',
+            color='employment_type',
+            title="Employment Type by AI Job Title",
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
+        fig2.update_layout(xaxis_title="Job Title", yaxis_title="Count", xaxis_tickangle=45)
+        return fig2
+
+    figure_cache.plotly_chart(figure)
+
 
 # 3️⃣ Top 10 Countries or Regions for AI Jobs
-st.subheader("3️⃣ What are the top 10 countries or regions for AI job postings (by company location)?")
-top_countries = df['company_location'].value_counts().head(10).reset_index()
-top_countries.columns = ['company_location', 'count']
-fig3 = px.bar(
-    top_countries,
-    x='company_location',
-    y='count',
-    title="Top 10 Countries/Regions for AI Jobs",
-    color='company_location',
-    color_discrete_sequence=px.colors.sequential.Plasma
-)
-fig3.update_layout(showlegend=False, xaxis_title="Country", yaxis_title="Number of Jobs")
-st.plotly_chart(fig3, use_container_width=True)
+def countries_section(df, results, rows):
+    top_countries = results["countries"]
+    if sketches.enabled():
+        if rows is None:
+            sketch = load_artifact("ai_job", "sketches", build_sketches)["company_location"]
+            top_countries = sketch.top(10, "company_location")
+            st.caption(sketch.bounds(top_countries))
+        else:
+            st.caption("Approximate counts cover all postings; with filters applied the counts are exact.")
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig3 = px.bar(
+            top_countries,
+            x='company_location',
+            y='count',
+            title="Top 10 Countries/Regions for AI Jobs",
+            color='company_location',
+            color_discrete_sequence=px.colors.sequential.Plasma
+        )
+        fig3.update_layout(showlegend=False, xaxis_title="Country", yaxis_title="Number of Jobs")
+        return fig3
+
+    figure_cache.plotly_chart(figure)
+
 
 # 4️⃣ Company Size Posting Most Jobs
-st.subheader("4️⃣ Which company size is posting the most jobs?")
-posting = df['company_size'].value_counts().reset_index()
-posting.columns = ['company_size', 'count']
-fig4 = px.bar(
-    posting,
-    x='company_size',
-    y='count',
-    title="Jobs by Company Size",
-    color='company_size',
-    color_discrete_sequence=px.colors.qualitative.Vivid
-)
-fig4.update_layout(showlegend=False, xaxis_title="Company Size", yaxis_title="Job Postings")
-st.plotly_chart(fig4, use_container_width=True)
+def company_size_section(df, results, rows):
+    posting = results["company_size"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig4 = px.bar(
+            posting,
+            x='company_size',
+            y='count',
+            title="Jobs by Company Size",
+            color='company_size',
+            color_discrete_sequence=px.colors.qualitative.Vivid
+        )
+        fig4.update_layout(showlegend=False, xaxis_title="Company Size", yaxis_title="Job Postings")
+        return fig4
+
+    figure_cache.plotly_chart(figure)
+
 
 # 5️⃣ Average Remote Ratio
-st.subheader("5️⃣ What is the average remote ratio across companies?")
-top_10 = df.groupby("company_name")["remote_ratio"].mean().sort_values(ascending=False).head(10).reset_index()
-fig5 = px.bar(
-    top_10,
-    x="company_name",
-    y="remote_ratio",
-    title="Top 10 Companies with Highest Average Remote Ratio",
-    color="remote_ratio",
-    color_continuous_scale="rainbow"
-)
-fig5.update_layout(xaxis_title="Company Name", yaxis_title="Average Remote Ratio", xaxis_tickangle=45)
-st.plotly_chart(fig5, use_container_width=True)
+def remote_ratio_section(df, results, rows):
+    top_10 = results["remote_ratio"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig5 = px.bar(
+            top_10,
+            x="company_name",
+            y="remote_ratio",
+            title="Top 10 Companies with Highest Average Remote Ratio",
+            color="remote_ratio",
+            color_continuous_scale="rainbow"
+        )
+        fig5.update_layout(xaxis_title="Company Name", yaxis_title="Average Remote Ratio", xaxis_tickangle=45)
+        return fig5
+
+    figure_cache.plotly_chart(figure)
+
 
 # 6️⃣ Most Common Employee Residences
-st.subheader("6️⃣ What are the top 5 most common employee residences in AI jobs?")
-top5 = ai_job_filtered['employee_residence'].value_counts().head(5)
-fig6 = px.pie(
-    values=top5.values,
-    names=top5.index,
-    title="Top 5 Most Common Employee Residences",
-    color_discrete_sequence=px.colors.sequential.RdBu
-)
-st.plotly_chart(fig6, use_container_width=True)
+def residence_section(df, results, rows):
+    top5 = results["residence"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig6 = px.pie(
+            values=top5['count'],
+            names=top5['employee_residence'],
+            title="Top 5 Most Common Employee Residences",
+            color_discrete_sequence=px.colors.sequential.RdBu
+        )
+        return fig6
+
+    figure_cache.plotly_chart(figure)
+
 
 # 7️⃣ Job Postings Over Time
-st.subheader("7️⃣ How has the number of job postings changed over time?")
-jobs_by_month = df['posting_date'].dt.to_period("M").value_counts().sort_index()
-jobs_by_month.index = jobs_by_month.index.astype(str)
-fig7 = px.line(
-    x=jobs_by_month.index,
-    y=jobs_by_month.values,
-    title="Job Postings Over Time",
-    markers=True
-)
-fig7.update_layout(xaxis_title="Month", yaxis_title="Number of Postings")
-st.plotly_chart(fig7, use_container_width=True)
+def postings_over_time_section(df, results, rows):
+    def figure():
+        import plotly.express as px
+        by_month = results.get("posting_months")
+        if rows is not None or by_month is None:
+            by_month = calendar_dim.load("ai_job", 'posting_date').counts(("period",), rows=rows)
+        jobs_by_month = chart_reduce.downsample(by_month, 'period', 'count')
+        perf.phase("figure")
+        fig7 = px.line(
+            x=jobs_by_month['period'].astype(str),
+            y=jobs_by_month['count'],
+            title="Job Postings Over Time",
+            markers=True
+        )
+        fig7.update_layout(xaxis_title="Month", yaxis_title="Number of Postings")
+        return fig7
+
+    figure_cache.plotly_chart(figure)
+
 
 # 8️⃣ Time Between Post Date and Application Deadline
-st.subheader("8️⃣ Average time between post date and application deadline across companies")
-df['diff_days'] = (df['application_deadline'] - df['posting_date']).dt.days
-group_by_company = df.groupby("company_name")["diff_days"].mean().sort_values(ascending=False).head(10).reset_index()
-fig8 = px.bar(
-    group_by_company,
-    x="company_name",
-    y="diff_days",
-    title="Average Time Between Post Date and Deadline by Company",
-    color="diff_days",
-    color_continuous_scale="Agsunset"
-)
-fig8.update_layout(xaxis_title="Company", yaxis_title="Avg Days", xaxis_tickangle=45)
-st.plotly_chart(fig8, use_container_width=True)
-
-# 9️⃣ Seasonal Trends in Job Postings
-st.subheader("9️⃣ Are there seasonal trends in AI job postings?")
-df['posting_month'] = df['posting_date'].dt.month_name()
-posting_jobs = df['posting_month'].value_counts().reset_index()
-posting_jobs.columns = ['Month', 'Count']
-posting_jobs = posting_jobs.sort_values(by='Count', ascending=False)
-fig9 = px.line(
-    posting_jobs,
-    x='Month',
-    y='Count',
-    title='Monthly Trends in Job Postings',
-    markers=True
-)
-fig9.update_layout(xaxis_title="Month", yaxis_title="Number of Posts")
-st.plotly_chart(fig9, use_container_width=True)
-
-# 🔟 Most Frequent Skills
-st.subheader("🔟 Which skills are most frequently required in AI job postings?")
-if 'required_skills' in df.columns:
-    df['required_skills'] = df['required_skills'].apply(lambda x: x.split(',') if pd.notnull(x) else [])
-    Top_10_skill = df.explode("required_skills")['required_skills'].value_counts().head(10).reset_index()
-    Top_10_skill.columns = ['Skill', 'Count']
-    fig10 = px.bar(
-        Top_10_skill,
-        x='Skill',
-        y='Count',
-        title="Top 10 Skills Required in AI Job Postings",
-        color='Count',
-        color_continuous_scale='Inferno'
-    )
-    fig10.update_layout(xaxis_title="Skill", yaxis_title="Count")
-    st.plotly_chart(fig10, use_container_width=True)
-else:
-    st.warning("⚠️ 'required_skills' column not found in dataset.")
+def deadline_days_section(df, results, rows):
+    group_by_company = results["deadline_days"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig8 = px.bar(
+            group_by_company,
+            x="company_name",
+            y="diff_days",
+            title="Average Time Between Post Date and Deadline by Company",
+            color="diff_days",
+            color_continuous_scale="Agsunset"
+        )
+        fig8.update_layout(xaxis_title="Company", yaxis_title="Avg Days", xaxis_tickangle=45)
+        return fig8
+
+    figure_cache.plotly_chart(figure)
+
+
+# 9️⃣ Seasonal Trends in Job Postings (months in calendar order)
+def seasonal_section(df, results, rows):
+    def figure():
+        import plotly.express as px
+        by_month = results.get("posting_months")
+        if rows is None and by_month is not None:
+            months = by_month['period'].dt.month.to_numpy() - 1
+            counts = np.bincount(months, weights=by_month['count'].to_numpy(), minlength=12).astype(np.int64)
+            posting_jobs = pd.DataFrame({'Month': calendar_dim.MONTHS, 'Count': counts})
+        else:
+            posting_jobs = calendar_dim.load("ai_job", 'posting_date').counts(("month",), rows=rows, empty=True,
+                                                                               name='Count')
+            posting_jobs = posting_jobs.rename(columns={'month': 'Month'})
+        perf.phase("figure")
+        fig9 = px.line(
+            posting_jobs,
+            x='Month',
+            y='Count',
+            title='Monthly Trends in Job Postings',
+            markers=True
+        )
+        fig9.update_layout(xaxis_title="Month", yaxis_title="Number of Posts")
+        return fig9
+
+    figure_cache.plotly_chart(figure)
+
+
+# 🔟 Most Frequent Skills (the job title picker reruns only this section)
+def skills_section(df, results, rows):
+    if 'required_skills' not in df.columns:
+        st.warning("⚠️ 'required_skills' column not found in dataset.")
+        return
+    skill_index = load_artifact("ai_job", "skill_index", lambda df: SkillIndex.build(df['required_skills']))
+    skill_title = st.selectbox("Job title", ["All job titles"] + sorted(df['job_title'].dropna().unique()),
+                               key="skill_title")
+    skill_rows = None if skill_title == "All job titles" else (df['job_title'] == skill_title).to_numpy()
+    if rows is not None:
+        skill_rows = rows if skill_rows is None else skill_rows & rows
+
+    def figure():
+        import plotly.express as px
+        skill_counts = results.get("skills")
+        if skill_rows is None and skill_counts is not None:
+            # same order as SkillIndex.top: the vocabulary is in first-seen order there too
+            counts = skill_counts['count'].to_numpy()
+            order = np.argsort(-counts, kind="stable")[:10]
+            order = order[counts[order] > 0]
+            Top_10_skill = pd.DataFrame({'Skill': skill_counts['skill'].to_numpy()[order], 'Count': counts[order]})
+        else:
+            Top_10_skill = skill_index.top(10, rows=skill_rows)
+        perf.phase("figure")
+        fig10 = px.bar(
+            Top_10_skill,
+            x='Skill',
+            y='Count',
+            title="Top 10 Skills Required in AI Job Postings",
+            color='Count',
+            color_continuous_scale='Inferno'
+        )
+        fig10.update_layout(xaxis_title="Skill", yaxis_title="Count")
+        return fig10
+
+    figure_cache.plotly_chart(figure)
+
+    def figure():
+        import plotly.express as px
+        skill_pairs = skill_index.cooccurrence(10, rows=skill_rows)
+        skill_pairs['Pair'] = skill_pairs['Skill A'] + ' + ' + skill_pairs['Skill B']
+        perf.phase("figure")
+        fig11 = px.bar(
+            skill_pairs,
+            x='Count',
+            y='Pair',
+            orientation='h',
+            title="Skills Most Often Required Together",
+            color='Count',
+            color_continuous_scale='Inferno'
+        )
+        fig11.update_layout(xaxis_title="Postings", yaxis_title="Skill Pair", yaxis={'categoryorder': 'total ascending'})
+        return fig11
+
+    figure_cache.plotly_chart(figure)
+
+
+SECTIONS = [
+    Section("preview", "🔍 Data Preview", preview_section),
+    Section("experience", "1️⃣ What is the distribution of experience levels across all jobs?", experience_section),
+    Section("employment", "2️⃣ Which employment type is most common in AI job postings?", employment_section),
+    Section("countries", "3️⃣ What are the top 10 countries or regions for AI job postings (by company location)?",
+            countries_section),
+    Section("company_size", "4️⃣ Which company size is posting the most jobs?", company_size_section),
+    Section("remote_ratio", "5️⃣ What is the average remote ratio across companies?", remote_ratio_section),
+    Section("residence", "6️⃣ What are the top 5 most common employee residences in AI jobs?", residence_section),
+    Section("postings_over_time", "7️⃣ How has the number of job postings changed over time?",
+            postings_over_time_section),
+    Section("deadline_days", "8️⃣ Average time between post date and application deadline across companies",
+            deadline_days_section),
+    Section("seasonal", "9️⃣ Are there seasonal trends in AI job postings?", seasonal_section),
+    Section("skills", "🔟 Which skills are most frequently required in AI job postings?", skills_section,
+            inputs=("skill_title",)),
+]
+
+
+def main():
+    st.set_page_config(page_title="AI Job Dataset Insights", layout='wide')
+    st.title("📊 AI Job Dataset Insights")
+
+    chart_reduce.controls()
+    sketches.controls()
+    perf.start("ai_job")
+
+    # Load Dataset (dates and derived columns are parsed once by the shared loader)
+    perf.section("load", phase="load")
+    df = load_dataset("ai_job")
+    perf.section("filters")
+    rows, selection = filter_panel(load_artifact("ai_job", "filter_index", build_filter_index))
+    if rows is not None and not rows.any():
+        st.warning("⚠️ No postings match the selected filters.")
+        perf.finish()
+        return
+    perf.section("aggregations")
+    results = filtered_results(df, rows, selection)
+
+    version = (data_loader.version("ai_job"), repr(selection))
+    sections.render("ai_job", SECTIONS, df, results, rows, version=version)
+    perf.finish()
+
+
+if __name__ == "__main__":
+    main()
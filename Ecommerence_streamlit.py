@@ -1,56 +1,142 @@
 import streamlit as st 
-import pandas as pd 
-import plotly.express as px
-import plotly.figure_factory as ff
-
-st.set_page_config(page_title='Ecommerence Data Insights', layout='wide')
-st.title("🛒 Ecommerence Data Insights Dashboard")
-
-df = pd.read_csv("Ecommerence cleaned data.csv") 
-
-st.subheader("📊 Data Set Preview")
-st.dataframe(df.head())
-
-st.subheader("1️⃣ Which Platform is Used the Most?")
-platform = df['Platform'].value_counts().reset_index()
-platform.columns = ['Platform', 'Count']
-fig1 = px.bar(platform, x='Platform', y='Count', title='Most Used Platforms',
-              color='Count', color_continuous_scale='Plasma', template='plotly_dark')
-st.plotly_chart(fig1, use_container_width=True)
-
-st.subheader("2️⃣ Product Category Distribution")
-product = df['Product Category'].value_counts().reset_index()
-product.columns = ['Product Category', 'Count']
-fig2 = px.pie(product, names='Product Category', values='Count', title='Product Category Share')
-st.plotly_chart(fig2, use_container_width=True)
-
-st.subheader("3️⃣ Service Rating Distribution")
-service = df['Service Rating'].value_counts().reset_index()
-service.columns = ['Service Rating', 'Count']
-fig3 = px.bar(service, x='Service Rating', y='Count', title='Rating Distribution (1 to 5)',
-              color='Count', color_continuous_scale='Viridis', template='plotly_white')
-st.plotly_chart(fig3, use_container_width=True)
-
-st.subheader("4️⃣ Delivery Delay Insights")
-delay = df['Delivery Delay'].value_counts().reset_index()
-delay.columns = ['Delivery Delay', 'Count']
-fig4 = px.bar(delay, x='Delivery Delay', y='Count', title='Delivery Delay Distribution',
-              color='Count', color_continuous_scale='Cividis', template='ggplot2')
-st.plotly_chart(fig4, use_container_width=True)
-
-st.subheader("5️⃣ Refund Requested Distribution")
-refund = df['Refund Requested'].value_counts().reset_index()
-refund.columns = ['Refund Requested', 'Count']
-fig5 = px.pie(refund, names='Refund Requested', values='Count', title='Refund Requested Pie')
-st.plotly_chart(fig5, use_container_width=True)
-
-st.subheader("6️⃣ Order Value by Product Category")
-fig6 = px.box(df, x='Product Category', y='Order Value (INR)', color='Product Category',
-              title='Order Value Distribution by Product Category', template='seaborn')
-st.plotly_chart(fig6, use_container_width=True)
-
-st.subheader("7️⃣ Correlation Heatmap of Numeric Columns")
-numeric_cols = df[['Delivery Time (Minutes)', 'Order Value (INR)', 'Service Rating', 'Platform_numeric']]
-corr = numeric_cols.corr()
-fig7 = px.imshow(corr, text_auto=True, color_continuous_scale='RdBu_r', title='Correlation Heatmap')
-st.plotly_chart(fig7, use_container_width=True)
+
+import chart_reduce
+import data_loader
+import figure_cache
+import perf
+import sections
+from data_loader import load_artifact, load_dataset
+from sections import Section
+
+
+def counts(column):
+    """Builder of the ``[column, 'Count']`` frame of ``column``'s value counts."""
+    def build(df):
+        table = df[column].value_counts().reset_index()
+        table.columns = [column, 'Count']
+        return table
+    return build
+
+
+def preview_section(df):
+    st.dataframe(df.head())
+
+
+def platform_section(df):
+    platform = load_artifact("ecommerce", "platform", counts('Platform'))
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig1 = px.bar(platform, x='Platform', y='Count', title='Most Used Platforms',
+                      color='Count', color_continuous_scale='Plasma', template='plotly_dark')
+        return fig1
+
+    figure_cache.plotly_chart(figure)
+
+
+def category_section(df):
+    product = load_artifact("ecommerce", "category", counts('Product Category'))
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig2 = px.pie(product, names='Product Category', values='Count', title='Product Category Share')
+        return fig2
+
+    figure_cache.plotly_chart(figure)
+
+
+def rating_section(df):
+    service = load_artifact("ecommerce", "rating", counts('Service Rating'))
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig3 = px.bar(service, x='Service Rating', y='Count', title='Rating Distribution (1 to 5)',
+                      color='Count', color_continuous_scale='Viridis', template='plotly_white')
+        return fig3
+
+    figure_cache.plotly_chart(figure)
+
+
+def delay_section(df):
+    delay = load_artifact("ecommerce", "delay", counts('Delivery Delay'))
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig4 = px.bar(delay, x='Delivery Delay', y='Count', title='Delivery Delay Distribution',
+                      color='Count', color_continuous_scale='Cividis', template='ggplot2')
+        return fig4
+
+    figure_cache.plotly_chart(figure)
+
+
+def refund_section(df):
+    refund = load_artifact("ecommerce", "refund", counts('Refund Requested'))
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig5 = px.pie(refund, names='Refund Requested', values='Count', title='Refund Requested Pie')
+        return fig5
+
+    figure_cache.plotly_chart(figure)
+
+
+def order_value_section(df):
+    def figure():
+        perf.phase("figure")
+        fig6 = chart_reduce.box_figure(df, x='Product Category', y='Order Value (INR)',
+                                       title='Order Value Distribution by Product Category', template='seaborn')
+        return fig6
+
+    figure_cache.plotly_chart(figure)
+
+
+def correlation_table(df):
+    numeric_cols = df[['Delivery Time (Minutes)', 'Order Value (INR)', 'Service Rating', 'Platform_numeric']]
+    return numeric_cols.corr()
+
+
+def correlation_section(df):
+    corr = load_artifact("ecommerce", "correlation", correlation_table)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig7 = px.imshow(corr, text_auto=True, color_continuous_scale='RdBu_r', title='Correlation Heatmap')
+        return fig7
+
+    figure_cache.plotly_chart(figure)
+
+
+SECTIONS = [
+    Section("preview", "📊 Data Set Preview", preview_section),
+    Section("platform", "1️⃣ Which Platform is Used the Most?", platform_section),
+    Section("category", "2️⃣ Product Category Distribution", category_section),
+    Section("rating", "3️⃣ Service Rating Distribution", rating_section),
+    Section("delay", "4️⃣ Delivery Delay Insights", delay_section),
+    Section("refund", "5️⃣ Refund Requested Distribution", refund_section),
+    Section("order_value", "6️⃣ Order Value by Product Category", order_value_section),
+    Section("correlation", "7️⃣ Correlation Heatmap of Numeric Columns", correlation_section),
+]
+
+
+def main():
+    st.set_page_config(page_title='Ecommerence Data Insights', layout='wide')
+    st.title("🛒 Ecommerence Data Insights Dashboard")
+
+    chart_reduce.controls()
+    perf.start("ecommerce")
+
+    perf.section("load", phase="load")
+    df = load_dataset("ecommerce")
+
+    sections.render("ecommerce", SECTIONS, df, version=data_loader.version("ecommerce"))
+    perf.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Declarative single-scan aggregations over integer-coded columns.
+
+Dashboards declare each chart's group keys and measure as an ``Agg``; the
+engine factorizes every key column once, then answers all requests with
+``np.bincount`` over combined integer codes instead of one pandas groupby per
+chart. Requests that share keys and filter also share their group counts.
+
+    engine = AggEngine(df)
+    engine.add_mask("ai_titles", df["job_title"].str.contains("AI"))
+    out = engine.run({
+        "by_size": Agg(by=("company_size",), sort="desc"),
+        "remote": Agg(by=("company_name",), measure="mean", value="remote_ratio", sort="desc", top=10),
+    })
+
+Result ordering mirrors the pandas calls the dashboards used before:
+``sort="key"`` matches ``groupby(...).size()/mean()``, ``sort="desc"`` on a
+count matches ``value_counts()``, and ``sort="desc"`` on a sum/mean matches
+``groupby(...).mean().sort_values(ascending=False)``. ``arrange`` puts groups
+aggregated elsewhere (e.g. by ``ingest``) in the same order.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Agg:
+    by: tuple
+    measure: str = "count"  # "count", "sum" or "mean"
+    value: str = None       # column aggregated by "sum"/"mean"
+    where: str = None       # name of a mask registered with add_mask()
+    sort: str = "key"       # "key" or "desc"
+    top: int = None
+    name: str = None        # output column name, defaults to "count" / value
+
+    @property
+    def output(self):
+        return self.name or (self.value if self.measure != "count" else "count")
+
+
+def _descending(values):
+    """Indexer sorting ``values`` descending, NaN last.
+
+    Follows the same steps as pandas' ``nargsort(ascending=False)`` so that
+    ties land exactly where ``value_counts()``/``sort_values()`` put them.
+    """
+    missing = np.isnan(values) if values.dtype.kind == "f" else np.zeros(len(values), dtype=bool)
+    idx = np.flatnonzero(~missing)[::-1]
+    idx = idx[values[idx].argsort(kind="quicksort")][::-1]
+    return np.concatenate([idx, np.flatnonzero(missing)])
+
+
+def arrange(frame, agg):
+    """Order and cut ``frame``, ``agg``'s groups aggregated elsewhere, as ``AggEngine.run`` would.
+
+    ``frame`` holds the ``agg.by`` labels and the ``agg.output`` column, one
+    row per group in first-appearance order (as ``groupby(sort=False)`` gives
+    them), e.g. the running aggregates of ``ingest``.
+    """
+    frame = frame.reset_index(drop=True)
+    order = np.arange(len(frame))
+    if not (agg.sort == "desc" and agg.measure == "count"):
+        order = np.lexsort([frame[col].to_numpy() for col in reversed(agg.by)])
+    if agg.sort == "desc":
+        order = order[_descending(frame[agg.output].to_numpy()[order])]
+    if agg.top is not None:
+        order = order[:agg.top]
+    return frame.iloc[order].reset_index(drop=True)
+
+
+class AggEngine:
+    def __init__(self, df):
+        self.df = df
+        self.n = len(df)
+        self._keys = {}    # column -> (integer codes, uniques, sort rank of each unique)
+        self._values = {}  # column -> (float values with NaN zeroed, non-NaN flags)
+        self._masks = {}
+
+    @classmethod
+    def from_arrays(cls, n, keys, values=None, masks=None):
+        """An engine over already-coded columns (as ``columns`` returns them) instead of a frame.
+
+        The arrays are used as given, so they may be views of shared memory.
+        """
+        engine = cls(pd.DataFrame(index=pd.RangeIndex(0)))
+        engine.n = n
+        engine._keys.update(keys)
+        engine._values.update(values or {})
+        engine._masks.update(masks or {})
+        return engine
+
+    # ------------------------ Inputs ------------------------
+    def add_key(self, name, values):
+        """Register a derived key column (e.g. a month period) by name."""
+        values = pd.Series(values).reset_index(drop=True)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Already integer-coded; unused categories simply end up with no rows.
+            codes, uniques = values.cat.codes.to_numpy().astype(np.int64), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values, sort=False)
+        ranks = np.empty(len(uniques), dtype=np.int64)
+        ranks[uniques.argsort()] = np.arange(len(uniques))
+        self._keys[name] = (codes, uniques, ranks)
+
+    def add_mask(self, name, mask):
+        self._masks[name] = np.asarray(mask, dtype=bool)
+
+    def key(self, col):
+        if col not in self._keys:
+            self.add_key(col, self.df[col])
+        return self._keys[col]
+
+    def value(self, col):
+        if col not in self._values:
+            values = pd.to_numeric(self.df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            valid = ~np.isnan(values)
+            self._values[col] = (np.where(valid, values, 0.0), valid)
+        return self._values[col]
+
+    def columns(self, aggs):
+        """``(keys, values, masks)``: the coded columns every supported agg in ``aggs`` reads."""
+        keys, values, masks = {}, {}, {}
+        for agg in aggs.values():
+            if not self.supports(agg):
+                continue
+            for col in agg.by:
+                keys[col] = self.key(col)
+            if agg.value:
+                values[agg.value] = self.value(agg.value)
+            if agg.where:
+                masks[agg.where] = self._masks[agg.where]
+        return keys, values, masks
+
+    def supports(self, agg):
+        """True if every column ``agg`` needs is present."""
+        columns = set(agg.by) | ({agg.value} if agg.value else set())
+        return all(col in self._keys or col in self._values or col in self.df.columns for col in columns)
+
+    # ------------------------ Execution ------------------------
+    def _groups(self, by, where, rows):
+        """Combined group code per row, its cardinality and per-group row counts."""
+        combined = np.zeros(self.n, dtype=np.int64)
+        valid = np.ones(self.n, dtype=bool)
+        size = 1
+        for col in by:
+            codes, uniques, _ = self.key(col)
+            combined = combined * len(uniques) + codes
+            valid &= codes >= 0
+            size *= len(uniques)
+        if where is not None:
+            valid &= self._masks[where]
+        if rows is not None:
+            valid &= rows
+        combined = combined[valid]
+        return combined, valid, size, np.bincount(combined, minlength=size)
+
+    def _split(self, by, groups):
+        """Per-key unique codes of each combined group code."""
+        split = {}
+        for col in reversed(by):
+            _, uniques, _ = self.key(col)
+            groups, split[col] = np.divmod(groups, len(uniques))
+        return split
+
+    def _first_seen(self, combined, size):
+        first = np.full(size, self.n, dtype=np.int64)
+        np.minimum.at(first, combined, np.arange(len(combined)))
+        return first
+
+    def run(self, aggs, rows=None):
+        """Evaluate a ``{name: Agg}`` mapping; returns ``{name: DataFrame}``.
+
+        Aggregations over columns the frame does not have are left out of the
+        result, so dashboards can keep their "column not found" warnings.
+
+        ``rows`` optionally restricts every aggregation to a boolean row
+        selection (e.g. the output of a filter panel).
+        """
+        shared = {}
+        results = {}
+        for name, agg in aggs.items():
+            if not self.supports(agg):
+                continue
+            group_key = (tuple(agg.by), agg.where)
+            if group_key not in shared:
+                shared[group_key] = self._groups(agg.by, agg.where, rows)
+            combined, valid, size, counts = shared[group_key]
+
+            groups = np.flatnonzero(counts)
+            if agg.measure == "count":
+                measure = counts[groups]
+            else:
+                values, present = self.value(agg.value)
+                sums = np.bincount(combined, weights=values[valid], minlength=size)
+                if agg.measure == "sum":
+                    measure = sums[groups]
+                else:
+                    n_valid = np.bincount(combined, weights=present[valid], minlength=size)[groups]
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        measure = np.where(n_valid > 0, sums[groups] / n_valid, np.nan)
+
+            split = self._split(agg.by, groups)
+            order = np.lexsort([self.key(col)[2][split[col]] for col in reversed(agg.by)])
+            if agg.sort == "desc":
+                if agg.measure == "count":
+                    # value_counts() starts from first-appearance order
+                    order = np.argsort(self._first_seen(combined, size)[groups], kind="stable")
+                order = order[_descending(measure[order])]
+            if agg.top is not None:
+                order = order[:agg.top]
+
+            frame = pd.DataFrame({col: np.asarray(self.key(col)[1].take(split[col][order])) for col in agg.by})
+            frame[agg.output] = measure[order]
+            results[name] = frame
+        return results
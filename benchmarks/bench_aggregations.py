@@ -0,0 +1,92 @@
+"""Per-rerun compute time of the Ai_job charts: pandas groupbys vs AggEngine.
+
+The engine side includes the two time charts, which count postings on the
+posting_date calendar dimension (``calendar_dim``) instead of the engine.
+
+    python -m benchmarks.bench_aggregations --rows 1000000,5000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import data_loader
+from Ai_job_streamlit import AGGREGATIONS, build_engine
+from calendar_dim import TimeDim
+from benchmarks import synthetic
+
+
+def pandas_sections(df):
+    """The aggregations Ai_job_streamlit.py ran before it used the engine."""
+    ai = df[df['job_title'].str.contains("AI", case=False, na=False)]
+    return [
+        df.groupby(['job_title', 'experience_level'], observed=True).size().reset_index(name='count'),
+        ai.groupby(['job_title', 'employment_type'], observed=True).size().reset_index(name='count'),
+        df['company_location'].value_counts().head(10).reset_index(),
+        df['company_size'].value_counts().reset_index(),
+        df.groupby("company_name", observed=True)["remote_ratio"].mean().sort_values(ascending=False).head(10).reset_index(),
+        ai['employee_residence'].value_counts().head(5),
+        df['posting_date'].dt.to_period("M").value_counts().sort_index(),
+        df.groupby("company_name", observed=True)["diff_days"].mean().sort_values(ascending=False).head(10).reset_index(),
+        df['posting_month'].value_counts().reset_index(),
+    ]
+
+
+def engine_sections(engine, posting):
+    results = engine.run(AGGREGATIONS)
+    results["by_month"] = posting.counts(("period",))
+    results["seasonal"] = posting.counts(("month",), empty=True)
+    return results
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows_list, repeat):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "Ai_job.csv")
+            synthetic.write_csv("ai_job", path, rows)
+            data_loader.DATA_DIR = data_dir
+            df = data_loader.read_source("ai_job")
+
+        start = time.perf_counter()
+        engine = build_engine(df)
+        posting = TimeDim.build(df['posting_date'])
+        engine_sections(engine, posting)
+        build = time.perf_counter() - start
+
+        result = {
+            "rows": rows,
+            "pandas_s": _best_of(lambda: pandas_sections(df), repeat),
+            "engine_first_run_s": build,
+            "engine_rerun_s": _best_of(lambda: engine_sections(engine, posting), repeat),
+        }
+        results.append(result)
+        print(f"{rows:>10,} rows  pandas {result['pandas_s']:.3f}s  "
+              f"engine first run {build:.3f}s  rerun {result['engine_rerun_s']:.3f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", default="1000000,5000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run([int(r) for r in args.rows.split(",")], args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
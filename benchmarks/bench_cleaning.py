@@ -0,0 +1,117 @@
+"""Throughput of cleaning.py on synthetic raw exports, against the notebooks' row-wise code.
+
+For each scale the raw e-commerce and flight exports are written to a
+temporary directory and cleaned three times: cold (no cache), warm (nothing
+changed: only the raw file is hashed), and after the output was removed
+(every stage served from the cache, only the CSV rewritten). The notebooks'
+per-row ``apply`` transforms are timed on the first ``--notebook-rows`` rows
+for comparison.
+
+    python -m benchmarks.bench_cleaning --rows 1000000,10000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import cleaning
+import data_loader
+from benchmarks import synthetic
+
+
+# ------------------------ Notebook Baseline ------------------------
+def convert_custom_time(time_str):
+    """Ecommerence_DA.ipynb's parser, verbatim."""
+    try:
+        parts = time_str.split(":")
+        hours = int(parts[0])
+        minute_str, sec_frac_str = parts[1].split(".")
+        minutes = int(minute_str)
+        sec_frac = float("0." + sec_frac_str)
+        seconds = int(sec_frac * 60)
+        microsecond = int(((sec_frac * 60) - seconds) * 1_000_000)
+        return datetime.strptime(f"{hours:02d}:{minutes:02d}:{seconds:02d}", "%H:%M:%S").replace(microsecond=microsecond)
+    except Exception:
+        return pd.NaT
+
+
+def notebook_transforms(name, df):
+    """The notebooks' row-wise transforms (reading and writing excluded)."""
+    if name == "ecommerce":
+        df["Order Date & Time"] = df["Order Date & Time"].apply(convert_custom_time).fillna("Not Available")
+        df["Platform_numeric"] = df["Platform"].apply(lambda p: cleaning.PLATFORMS.get(p))
+        return df
+    for col in ["Departure Date & Time", "Arrival Date & Time"]:
+        df[col] = pd.to_datetime(df[col])
+    df["Stopovers_numeric"] = df["Stopovers"].apply(lambda v: cleaning.STOPOVERS.get(v))
+    df["Class_numeric"] = df["Class"].apply(lambda v: cleaning.FLIGHT_CLASSES.get(v))
+    df["Booking Source numeric"] = df["Booking Source"].apply(lambda v: cleaning.BOOKING_SOURCES.get(v))
+    df["Seasonality Numeric"] = df["Seasonality"].apply(lambda v: cleaning.SEASONS.get(v))
+    df["Month"] = df["Departure Date & Time"].dt.month_name()
+    df["Arrival_Hour"] = df["Arrival Date & Time"].dt.hour
+    df["Arrival_Day"] = df["Arrival Date & Time"].dt.day_name()
+    return df
+
+
+# ------------------------ Driver ------------------------
+def _quiet(*_):
+    pass
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(rows_list, notebook_rows):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_loader.DATA_DIR = data_dir
+            cleaning.CACHE_DIR = os.path.join(data_dir, ".cleaning_cache")
+            for name in cleaning.PIPELINES:
+                synthetic.write_csv(name, cleaning.raw_path(name), rows, raw=True)
+                start = time.perf_counter()
+                stages = cleaning.run(name, force=True, log=_quiet)
+                cold = time.perf_counter() - start
+                warm = _timed(lambda: cleaning.run(name, log=_quiet))
+                os.remove(data_loader.dataset_path(name))
+                rewrite = _timed(lambda: cleaning.run(name, log=_quiet))
+
+                sample = pd.read_csv(cleaning.raw_path(name), nrows=notebook_rows)
+                transforms = sum(t for stage, t in stages.items() if stage not in ("hash", "read", "write"))
+                result = {
+                    "dataset": name, "rows": rows,
+                    "cold_s": cold, "warm_s": warm, "rewrite_s": rewrite, "stages_s": stages,
+                    "transform_rows_per_s": rows / transforms if transforms else None,
+                    "notebook_rows": len(sample),
+                    "notebook_transform_rows_per_s": len(sample) / _timed(lambda: notebook_transforms(name, sample.copy())),
+                }
+                results.append(result)
+                print(f"{name:<10} {rows:>11,} rows  cold {cold:7.2f}s  warm {warm:6.2f}s  cached-rewrite {rewrite:7.2f}s  "
+                      f"transforms {result['transform_rows_per_s'] / 1e6:6.1f}M rows/s "
+                      f"(notebook {result['notebook_transform_rows_per_s'] / 1e6:.2f}M rows/s)")
+                print("           " + "  ".join(f"{stage} {t:.2f}s" for stage, t in stages.items()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000000,10000000")
+    parser.add_argument("--notebook-rows", type=int, default=1_000_000,
+                        help="rows the row-wise notebook baseline is timed on")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run([int(r) for r in args.rows.split(",")], args.notebook_rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
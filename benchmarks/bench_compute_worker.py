@@ -0,0 +1,124 @@
+"""Simulated concurrent users of the Ai_job filter panel: in-process vs the worker pool.
+
+Every simulated user is a thread, as a Streamlit session is, and issues
+``--requests`` filtered aggregation requests. Selections are drawn from a
+pool of ``--distinct`` filter combinations, so users sometimes ask for the
+same rows at the same time (which the pool coalesces). ``in_process`` runs
+``AggEngine.run`` on the calling thread; ``workers=K`` goes through
+``compute_worker`` with K processes. Reported per mode: requests per second,
+requests coalesced, the shared-memory size and the largest private (not
+shared) memory of any worker, which stays flat as users are added.
+
+    python -m benchmarks.bench_compute_worker --rows 1000000 --users 1,4,16 --workers 0,2,4
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import compute_worker
+import data_loader
+from Ai_job_streamlit import AGGREGATIONS, build_engine, build_filter_index
+from benchmarks import synthetic
+
+
+def selections(df, index, count, seed=0):
+    """``count`` row masks of random experience-level / company-size / salary filters."""
+    rng = np.random.default_rng(seed)
+    levels, sizes = index.labels("experience_level"), index.labels("company_size")
+    lo, hi = index.bounds("salary_usd")
+    masks = []
+    for _ in range(count):
+        values = {"experience_level": list(rng.choice(levels, rng.integers(1, len(levels) + 1), replace=False)),
+                  "company_size": list(rng.choice(sizes, rng.integers(1, len(sizes) + 1), replace=False))}
+        start = rng.uniform(lo, (lo + hi) / 2)
+        masks.append(index.select(values, {"salary_usd": (start, rng.uniform(start, hi))}))
+    return masks
+
+
+def private_mb(pid):
+    """Private (unshared) resident memory of a process, from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    return sum(int(fields[k].split()[0]) for k in ("Private_Clean", "Private_Dirty")) / 1024
+
+
+def load_test(masks, users, requests, request):
+    rng = np.random.default_rng(users)
+    plans = [rng.integers(0, len(masks), requests) for _ in range(users)]
+    threads = [threading.Thread(target=lambda plan=plan: [request(masks[i]) for i in plan]) for plan in plans]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return users * requests / (time.perf_counter() - start)
+
+
+def run(rows, users_list, workers_list, requests, distinct):
+    with tempfile.TemporaryDirectory() as data_dir:
+        synthetic.write_csv("ai_job", os.path.join(data_dir, "Ai_job.csv"), rows)
+        data_loader.DATA_DIR = data_dir
+        df = data_loader.load_dataset("ai_job")
+    masks = selections(df, build_filter_index(df), distinct)
+    engine = build_engine(df)
+    engine.run(AGGREGATIONS)
+
+    results = []
+    for workers in workers_list:
+        if workers:
+            compute_worker.WORKERS = workers
+            shared = compute_worker.SharedColumns.publish("ai_job", engine, AGGREGATIONS)
+            pool = compute_worker.pool()
+            list(pool.map(compute_worker._run, [shared.spec] * workers * 2, [AGGREGATIONS] * workers * 2,
+                          [None] * workers * 2))  # start and attach every worker before timing
+            request = lambda rows: compute_worker.submit(shared, AGGREGATIONS, rows).result()  # noqa: E731
+        else:
+            shared, pool = None, None
+            request = lambda rows: engine.run(AGGREGATIONS, rows=rows)  # noqa: E731
+        for users in users_list:
+            before = dict(compute_worker.stats)
+            throughput = load_test(masks, users, requests, request)
+            result = {
+                "rows": rows, "workers": workers, "users": users, "requests_per_s": throughput,
+                "coalesced": compute_worker.stats["coalesced"] - before["coalesced"],
+                "shared_mb": shared.nbytes / 1e6 if shared else 0.0,
+                "worker_private_mb": max((private_mb(pid) or 0.0 for pid in pool._processes), default=0.0)
+                if pool else 0.0,
+            }
+            results.append(result)
+            mode = f"workers={workers}" if workers else "in_process"
+            print(f"{rows:>10,} rows  {mode:<10} {users:>3} users  {throughput:8.1f} req/s  "
+                  f"coalesced {result['coalesced']:>4}  shared {result['shared_mb']:6.1f} MB  "
+                  f"worker private {result['worker_private_mb']:6.1f} MB")
+        if pool:
+            compute_worker.shutdown()
+            del shared
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", default="1,4,16")
+    parser.add_argument("--workers", default=f"0,{max(os.cpu_count() or 1, 2)}")
+    parser.add_argument("--requests", type=int, default=10, help="requests per user")
+    parser.add_argument("--distinct", type=int, default=8, help="distinct filter selections users pick from")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run(args.rows, [int(u) for u in args.users.split(",")], [int(w) for w in args.workers.split(",")],
+                  args.requests, args.distinct)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Row selection time of the Ai_job filter panel: boolean masks vs FilterIndex.
+
+    python -m benchmarks.bench_filters --rows 1000000,5000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import data_loader
+from Ai_job_streamlit import build_filter_index
+from benchmarks import synthetic
+
+
+def _selection(df):
+    """A typical panel state: two categorical filters and two ranges."""
+    return (
+        {"experience_level": list(df["experience_level"].cat.categories[:2]),
+         "company_location": list(df["company_location"].cat.categories[:5])},
+        {"salary_usd": (60_000, 180_000), "years_experience": (2, 10)},
+    )
+
+
+def pandas_select(df, values, ranges):
+    mask = None
+    for col, keep in values.items():
+        part = df[col].isin(keep)
+        mask = part if mask is None else mask & part
+    for col, (lo, hi) in ranges.items():
+        mask &= df[col].between(lo, hi)
+    return mask.to_numpy()
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows_list, repeat):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            synthetic.write_csv("ai_job", os.path.join(data_dir, "Ai_job.csv"), rows)
+            data_loader.DATA_DIR = data_dir
+            df = data_loader.read_source("ai_job")
+
+        start = time.perf_counter()
+        index = build_filter_index(df)
+        build = time.perf_counter() - start
+        values, ranges = _selection(df)
+        assert (index.select(values, ranges) == pandas_select(df, values, ranges)).all()
+
+        result = {
+            "rows": rows,
+            "index_build_s": build,
+            "index_mb": index.nbytes() / 1e6,
+            "pandas_s": _best_of(lambda: pandas_select(df, values, ranges), repeat),
+            "index_s": _best_of(lambda: index.select(values, ranges), repeat),
+        }
+        results.append(result)
+        print(f"{rows:>10,} rows  build {build:.3f}s ({result['index_mb']:.1f} MB)  "
+              f"pandas {result['pandas_s'] * 1000:.1f}ms  index {result['index_s'] * 1000:.1f}ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", default="1000000,5000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run([int(r) for r in args.rows.split(",")], args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Season selections over the match store vs re-grouping the whole frame.
+
+``pandas`` is what the cricket dashboard would do per rerun with every season
+in one frame: mask the selected seasons, then group the team columns for the
+win table and the toss-win/match-win counts. ``store`` answers the same from
+the partition manifest: the selection is a union of row ranges and the team
+table is the sum of the selected partitions' summaries. A team filter (the
+preview) is timed both ways too. The one-off split (``sync``) is reported
+separately.
+
+    python -m benchmarks.bench_match_store --rows 20000,100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import match_store
+from benchmarks import synthetic
+
+SEASONS = 3  # the most recent seasons are selected
+TEAMS = ["CSK", "MI"]
+
+
+def pandas_selection(df, seasons):
+    rows = df['date'].dt.year.isin(seasons).to_numpy()
+    view = df[rows]
+    played = pd.concat([view['team1'], view['team2']]).value_counts()
+    won = view['match_winner'].value_counts().reindex(played.index).fillna(0)
+    toss_match = int((view['toss_winner'] == view['match_winner']).sum())
+    return rows, pd.DataFrame({'Matches Played': played, 'Matches Won': won}), toss_match
+
+
+def store_selection(manifest, df, seasons):
+    parts = match_store.partitions(manifest, seasons=seasons)
+    stats = match_store.team_stats(parts)
+    return match_store.select_rows(df, parts), stats, int(stats['Won Toss and Match'].sum())
+
+
+def pandas_teams(df, rows):
+    return rows & (df['team1'].isin(TEAMS) | df['team2'].isin(TEAMS)).to_numpy()
+
+
+def store_teams(manifest, df, seasons):
+    return match_store.select_rows(df, match_store.partitions(manifest, seasons=seasons), teams=TEAMS)
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows_list, repeat):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            synthetic.write_csv("cricket", os.path.join(data_dir, data_loader.DATASETS["cricket"]["path"]), rows)
+            data_loader.DATA_DIR = data_dir
+            start = time.perf_counter()
+            manifest = match_store.sync()
+            split = time.perf_counter() - start
+            df = data_loader.read_source("matches")
+
+            start = time.perf_counter()
+            match_store.sync()
+            unchanged = time.perf_counter() - start
+
+        seasons = sorted({part["season"] for part in manifest["partitions"]})[-SEASONS:]
+        mask, expected, toss_match = pandas_selection(df, seasons)
+        selected, stats, store_toss_match = store_selection(manifest, df, seasons)
+        stats = stats.set_index('Team')
+        assert np.array_equal(mask, selected) and toss_match == store_toss_match
+        assert (stats['Matches Played'] == expected['Matches Played'].reindex(stats.index)).all()
+        assert (stats['Matches Won'] == expected['Matches Won'].reindex(stats.index)).all()
+        assert np.array_equal(pandas_teams(df, mask), store_teams(manifest, df, seasons))
+
+        result = {
+            "rows": rows,
+            "partitions": len(manifest["partitions"]),
+            "split_s": split,
+            "sync_unchanged_ms": unchanged * 1000,
+            "pandas_ms": _best_of(lambda: pandas_selection(df, seasons), repeat) * 1000,
+            "store_ms": _best_of(lambda: store_selection(manifest, df, seasons), repeat) * 1000,
+            "pandas_teams_ms": _best_of(lambda: pandas_teams(df, mask), repeat) * 1000,
+            "store_teams_ms": _best_of(lambda: store_teams(manifest, df, seasons), repeat) * 1000,
+        }
+        results.append(result)
+        print(f"{rows:>10,} rows  {result['partitions']} partitions  split {split:.2f}s  "
+              f"sync {result['sync_unchanged_ms']:.2f}ms  "
+              f"seasons: pandas {result['pandas_ms']:.2f}ms store {result['store_ms']:.2f}ms  "
+              f"teams: pandas {result['pandas_teams_ms']:.2f}ms store {result['store_teams_ms']:.2f}ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="20000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run([int(r) for r in args.rows.split(",")], args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Route and airport top-10s: per-rerun pandas vs the RouteIndex.
+
+``pandas`` is what the flight dashboard did on every rerun before the index:
+a ``Source -> Destination`` string per row, ``value_counts()`` on it, and a
+``concat`` of both airport columns for the airport traffic. ``index`` answers
+the same two charts (plus a per-class top 10) from the prebuilt matrix; its
+one-off build time and size are reported separately.
+
+    python -m benchmarks.bench_routes --rows 1000000,5000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import data_loader
+from benchmarks import synthetic
+from flight_streamlit import build_route_index
+
+
+def pandas_top(df):
+    routes = (df['Source Name'].astype(str) + ' -> ' + df['Destination Name'].astype(str)).value_counts().head(10)
+    airports = pd.concat([df['Source Name'].rename('Airport'), df['Destination Name'].rename('Airport')])
+    return routes, airports.value_counts().head(10)
+
+
+def index_top(index):
+    routes = index.top_routes(10)
+    return routes, index.traffic().head(10), index.top_routes(10, index.matrix("Class", ["Business"]))
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows_list, repeat):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            synthetic.write_csv("flight", os.path.join(data_dir, data_loader.DATASETS["flight"]["path"]), rows)
+            data_loader.DATA_DIR = data_dir
+            df = data_loader.read_source("flight")
+
+        start = time.perf_counter()
+        index = build_route_index(df)
+        build = time.perf_counter() - start
+        routes, airports = pandas_top(df)
+        top, traffic, _ = index_top(index)
+        assert (top['Source Name'] + ' -> ' + top['Destination Name']).tolist() == routes.index.tolist()
+        assert top['count'].tolist() == routes.tolist() and traffic.tolist() == airports.tolist()
+
+        result = {
+            "rows": rows,
+            "index_build_s": build,
+            "index_kb": index.nbytes() / 1e3,
+            "pandas_s": _best_of(lambda: pandas_top(df), repeat),
+            "index_s": _best_of(lambda: index_top(index), repeat),
+        }
+        results.append(result)
+        print(f"{rows:>10,} rows  build {build:.3f}s ({result['index_kb']:.0f} kB)  "
+              f"pandas {result['pandas_s'] * 1000:.1f}ms  index {result['index_s'] * 1000:.2f}ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000000,5000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run([int(r) for r in args.rows.split(",")], args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
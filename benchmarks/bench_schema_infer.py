@@ -0,0 +1,128 @@
+"""Time and accuracy of schema_infer on the dashboards' CSVs.
+
+For every dataset, the repo's own CSV (where it is checked in) and a
+synthetic one of ``--rows`` rows are read once; then, with reading excluded:
+
+* ``original``: stream.py's former column detection on the whole frame
+  (``pd.to_datetime`` on each text column until one parses, ``nunique`` on
+  each text column until one has fewer than 20 values)
+* ``exact``: every column classified by brute force on the whole frame,
+  which is the reference the accuracy is measured against
+* ``infer``: ``schema_infer.infer`` on a random sample of ``--sample`` rows
+  (drawing the sample included)
+
+    python -m benchmarks.bench_schema_infer --rows 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+import data_loader
+import schema_infer
+from benchmarks import synthetic
+
+
+def original_detection(df):
+    """stream.py's column detection before schema_infer, on a copy of ``df``."""
+    df = df.copy()
+    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    date_col = None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        for col in df.select_dtypes(include=['datetime64', 'object']).columns:
+            try:
+                df[col] = pd.to_datetime(df[col])
+                date_col = col
+                break
+            except Exception:
+                continue
+    cat_col = next((col for col in df.select_dtypes(include=['object']).columns if df[col].nunique() < 20), None)
+    return numeric_cols, date_col, cat_col
+
+
+def exact_kind(name, values, max_categories=schema_infer.MAX_CATEGORIES):
+    """The kind schema_infer's rules give when applied to the whole column."""
+    values = values.dropna()
+    if not len(values):
+        return schema_infer.EMPTY
+    if pd.api.types.is_bool_dtype(values):
+        return schema_infer.CATEGORICAL
+    if pd.api.types.is_numeric_dtype(values):
+        if schema_infer._ID_NAME.search(str(name)) and (values % 1 == 0).all() and values.is_unique:
+            return schema_infer.ID
+        return schema_infer.NUMERIC
+    if pd.to_numeric(values, errors="coerce").notna().all():
+        return schema_infer.NUMERIC
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            pd.to_datetime(values)
+        return schema_infer.DATETIME
+    except (ValueError, TypeError, OverflowError):
+        pass
+    distinct = values.nunique()
+    if distinct < max_categories:
+        return schema_infer.CATEGORICAL
+    if distinct >= schema_infer.ID_RATIO * len(values) and not values.astype(str).str.contains(r"\s").any():
+        return schema_infer.ID
+    return schema_infer.TEXT
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def measure(dataset, source, df, sample_rows):
+    _, original = _timed(lambda: original_detection(df))
+    exact, exact_s = _timed(lambda: {col: exact_kind(col, df[col]) for col in df.columns})
+    inferred, infer_s = _timed(
+        lambda: schema_infer.infer(df.sample(n=min(len(df), sample_rows), random_state=0)))
+    mismatches = {col: f"{inferred[col].kind} (exact: {exact[col]})"
+                  for col in df.columns if inferred[col].kind != exact[col]}
+    result = {
+        "dataset": dataset, "source": source, "rows": len(df), "columns": len(df.columns),
+        "original_s": original, "exact_s": exact_s, "infer_s": infer_s,
+        "accuracy": 1 - len(mismatches) / len(df.columns), "mismatches": mismatches,
+    }
+    print(f"{dataset:<10} {source:<9} {len(df):>10,} rows  original {original * 1000:8.1f}ms  "
+          f"exact {exact_s * 1000:8.1f}ms  infer {infer_s * 1000:7.1f}ms  "
+          f"accuracy {result['accuracy']:.0%} ({len(df.columns) - len(mismatches)}/{len(df.columns)})")
+    for col, detail in mismatches.items():
+        print(f"           {col}: {detail}")
+    return result
+
+
+def run(rows, sample_rows):
+    results = []
+    for name in synthetic.GENERATORS:
+        path = data_loader.dataset_path(name)
+        if os.path.exists(path):
+            results.append(measure(name, "repo", pd.read_csv(path), sample_rows))
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = synthetic.write_csv(name, os.path.join(data_dir, "data.csv"), rows)
+            df = pd.read_csv(path)
+        results.append(measure(name, "synthetic", df, sample_rows))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=10_000, help="rows schema_infer sees")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = run(args.rows, args.sample)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
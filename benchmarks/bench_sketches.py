@@ -0,0 +1,77 @@
+"""Exact vs sketched top-N counts on a high-cardinality key.
+
+A Zipf-distributed key of ``--rows`` values over ``--distinct`` labels is fed
+in chunks to both ``value_counts`` (exact, summed across chunks) and
+``sketches.TopK``. Reported per size: time, state size (the exact table vs
+the serialized sketch), top-10 recall, the largest overcount against its
+stated bound, and HyperLogLog's distinct-count error.
+
+    python -m benchmarks.bench_sketches --rows 1000000,10000000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+import sketches
+
+CHUNK_ROWS = 100_000
+
+
+def chunks(rows, distinct, seed=0):
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, rows - start)
+        yield pd.Series(np.minimum(rng.zipf(1.3, n), distinct)).map("label-{}".format)
+
+
+def measure(rows, distinct, n=10):
+    exact = pd.Series(dtype=np.int64)
+    sketch = sketches.TopK()
+    exact_s = sketch_s = 0.0
+    for chunk in chunks(rows, distinct):
+        start = time.perf_counter()
+        exact = exact.add(chunk.value_counts(), fill_value=0)
+        exact_s += time.perf_counter() - start
+        start = time.perf_counter()
+        sketch.add(chunk)
+        sketch_s += time.perf_counter() - start
+
+    exact = exact.astype(np.int64)
+    true_top = exact.sort_values(ascending=False, kind="stable").head(n)
+    top = sketch.top(n)
+    truth = exact.reindex(top["label"]).fillna(0).to_numpy()
+    overcount = top["count"].to_numpy() - truth
+    result = {
+        "rows": rows, "distinct": int(len(exact)),
+        "exact_s": exact_s, "sketch_s": sketch_s,
+        "exact_kb": exact.memory_usage(deep=True) / 1e3,
+        "sketch_kb": len(json.dumps(sketch.to_dict())) / 1e3,
+        "recall": len(set(top["label"]) & set(true_top.index)) / n,
+        "max_overcount": int(overcount.max()), "stated_error": int(top["error"].max()),
+        "within_bounds": bool((overcount >= 0).all() and (overcount <= top["error"].to_numpy()).all()),
+        "distinct_error": sketch.distinct() / len(exact) - 1,
+    }
+    print(f"{rows:>11,} rows {result['distinct']:>9,} distinct  exact {exact_s:6.2f}s {result['exact_kb']:9.0f} kB  "
+          f"sketch {sketch_s:6.2f}s {result['sketch_kb']:6.0f} kB  recall {result['recall']:.0%}  "
+          f"overcount {result['max_overcount']:,} (stated {result['stated_error']:,}, "
+          f"{'ok' if result['within_bounds'] else 'VIOLATED'})  distinct {result['distinct_error']:+.2%}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000000,10000000")
+    parser.add_argument("--distinct", type=int, default=1_000_000, help="largest label")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    results = [measure(int(r), args.distinct) for r in args.rows.split(",")]
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
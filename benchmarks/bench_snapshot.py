@@ -0,0 +1,99 @@
+"""Cold-start load time and peak RSS: CSV parse vs columnar snapshot.
+
+Each measurement runs in a fresh subprocess so that timings are cold and the
+reported peak RSS belongs to that load alone.
+
+    python -m benchmarks.bench_snapshot --rows 15000,1000000,10000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+
+# Columns used by the "company size" chart, i.e. a typical single chart.
+CHART_COLUMNS = ["company_size", "remote_ratio"]
+
+
+def peak_rss_mb():
+    # VmHWM is reset on exec, unlike ru_maxrss which a child inherits from
+    # the (large) parent that generated the data.
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _measure(mode):
+    import pandas as pd  # noqa: F401  (library import is not part of the load time)
+    import data_loader
+    import snapshot
+
+    start = time.perf_counter()
+    if mode == "csv":
+        df = data_loader.read_source("ai_job")
+    elif mode == "snapshot":
+        df = snapshot.read_snapshot("ai_job", materialize_strings=True)
+    elif mode == "snapshot_categorical":
+        df = snapshot.read_snapshot("ai_job")
+    else:
+        df = snapshot.read_snapshot("ai_job", columns=CHART_COLUMNS)
+    # Touch a few columns so memory-mapped pages are actually read.
+    checksum = sum(len(df[col].value_counts()) for col in df.columns[:3])
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+        "checksum": checksum,
+    }))
+
+
+def _run_child(mode, data_dir):
+    env = dict(os.environ, DASHBOARD_DATA_DIR=data_dir)
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_snapshot", "--child", mode],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(rows_list, modes):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            synthetic.write_csv("ai_job", os.path.join(data_dir, "Ai_job.csv"), rows)
+            subprocess.run(
+                [sys.executable, "snapshot.py", "ai_job"],
+                env=dict(os.environ, DASHBOARD_DATA_DIR=data_dir), check=True, capture_output=True,
+            )
+            for mode in modes:
+                result = {"rows": rows, "mode": mode, **_run_child(mode, data_dir)}
+                results.append(result)
+                print(f"{rows:>10,} rows  {mode:<22} {result['seconds']:8.3f}s  {result['peak_rss_mb']:9.1f} MB")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", default="15000,1000000,10000000")
+    parser.add_argument("--modes", default="csv,snapshot,snapshot_categorical,snapshot_columns")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure(args.child)
+        return
+    results = run([int(r) for r in args.rows.split(",")], args.modes.split(","))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Import time and time to first paint of every dashboard script.
+
+Each measurement runs in a fresh interpreter on synthetic data:
+
+* ``import``: importing the page module (its top-level imports), and which
+  heavy libraries (``HEAVY``) that already pulled in
+* ``first_paint``: the first full run of the page under ``AppTest``, what the
+  first visitor of a freshly started server waits for
+* ``warm_paint``: the same first run after ``warm_start.warm`` preloaded the
+  page's libraries and data, as ``python warm_start.py <script>`` does
+  before the server starts listening (the warm-up itself is reported too)
+
+Pass an earlier ``--output`` file as ``--baseline`` to fail (exit status 1)
+when an import or first paint got slower than ``--tolerance`` allows.
+
+    python -m benchmarks.bench_startup --rows 10000 --output startup.json
+    python -m benchmarks.bench_startup --rows 10000 --baseline startup.json
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+from benchmarks.run_dashboards import SCRIPTS, _write_datasets
+
+HEAVY = ("plotly.express", "matplotlib", "seaborn", "statsmodels", "scipy", "plotly.figure_factory")
+METRICS = ("import_seconds", "first_paint_seconds", "warm_paint_seconds")
+SLACK_SECONDS = 0.05  # timer noise allowed on top of the relative tolerance
+
+
+# ------------------------ Child Process ------------------------
+def _first_paint(script, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    return seconds, [e.value for e in at.exception]
+
+
+def _child(mode, script, timeout):
+    if mode == "import":
+        start = time.perf_counter()
+        importlib.import_module(os.path.splitext(script)[0])
+        result = {"import_seconds": time.perf_counter() - start,
+                  "heavy_modules": [name for name in HEAVY if name in sys.modules]}
+    elif mode == "paint":
+        seconds, exceptions = _first_paint(script, timeout)
+        result = {"first_paint_seconds": seconds, "exceptions": exceptions}
+    else:
+        import warm_start
+
+        start = time.perf_counter()
+        steps = warm_start.warm(script)
+        warm_up = time.perf_counter() - start
+        seconds, exceptions = _first_paint(script, timeout)
+        result = {"warm_up_seconds": warm_up, "warm_up_steps": steps, "warm_paint_seconds": seconds,
+                  "exceptions": exceptions}
+    print(json.dumps(result))
+
+
+def _run_child(mode, script, env, timeout):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode, script, "--timeout", str(timeout)],
+        env=env, capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"exit {out.returncode}"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ------------------------ Driver ------------------------
+def measure(script, env, repeat, timeout):
+    """Median of ``repeat`` fresh-process runs of every mode."""
+    result = {"script": script}
+    for mode in ("import", "paint", "warm"):
+        runs = [_run_child(mode, script, env, timeout) for _ in range(repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            result["error"] = errors[0]
+            return result
+        for key, value in runs[0].items():
+            if isinstance(value, float):
+                result[key] = statistics.median(run[key] for run in runs)
+            else:
+                result[key] = value
+    return result
+
+
+def run(scripts, rows, repeat, timeout):
+    import weather_stub_server
+
+    results = []
+    csv_datasets = sorted({SCRIPTS[s] for s in scripts} & set(synthetic.GENERATORS))
+    server, url = weather_stub_server.start_in_thread()
+    try:
+        with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as store_dir:
+            _write_datasets(data_dir, csv_datasets, rows, snapshots=False)
+            env = dict(os.environ, DASHBOARD_DATA_DIR=data_dir, OPEN_METEO_URL=url, WEATHER_STORE_DIR=store_dir)
+            for script in scripts:
+                result = {"rows": rows, **measure(script, env, repeat, timeout)}
+                results.append(result)
+                _print(result)
+    finally:
+        server.shutdown()
+    return results
+
+
+def _print(result):
+    label = f"{result['script']:<26}"
+    if "error" in result:
+        print(f"{label}  ERROR {result['error']}")
+        return
+    heavy = ",".join(result["heavy_modules"]) or "-"
+    print(f"{label}  import {result['import_seconds']:6.2f}s  first paint {result['first_paint_seconds']:6.2f}s  "
+          f"warm-up {result['warm_up_seconds']:6.2f}s + paint {result['warm_paint_seconds']:6.2f}s  "
+          f"heavy at import: {heavy}")
+
+
+def regressions(results, baseline, tolerance):
+    """``(script, metric, old, new)`` for every metric slower than ``baseline`` beyond ``tolerance``."""
+    previous = {r["script"]: r for r in baseline["results"] if "error" not in r}
+    slower = []
+    for result in results:
+        old = previous.get(result["script"])
+        if old is None or "error" in result:
+            continue
+        for metric in METRICS:
+            if metric in old and result[metric] > old[metric] * (1 + tolerance) + SLACK_SECONDS:
+                slower.append((result["script"], metric, old[metric], result[metric]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="rows of each synthetic dataset")
+    parser.add_argument("--scripts", default=",".join(SCRIPTS))
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per measurement (median)")
+    parser.add_argument("--timeout", type=float, default=600, help="per-run AppTest timeout, in seconds")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier --output file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SCRIPT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child, args.timeout)
+        return 0
+
+    results = run(args.scripts.split(","), args.rows, args.repeat, args.timeout)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for script, metric, old, new in slower:
+            print(f"REGRESSION {script:<26} {metric} {old:.2f}s -> {new:.2f}s")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Peak RSS and time of stream.py's chart statistics: whole-frame vs streaming.
+
+Uploads are simulated with a synthetic CSV of a numeric pair, a date column
+and a low-cardinality category. ``in_memory`` runs the in-memory mode's
+computations (read, corr, to_datetime, sort, groupby mean); ``streaming``
+feeds the same file through ``stream.ChartStats`` chunk by chunk. Each
+measurement runs in a fresh subprocess so the peak RSS is its own.
+
+    python -m benchmarks.bench_stream --rows 1000000,5000000,20000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_snapshot import peak_rss_mb
+
+CHUNK_ROWS = 1_000_000
+
+
+def write_upload(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01")
+    for offset in range(0, rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, rows - offset)
+        price = rng.gamma(2.0, 50.0, n)
+        pd.DataFrame({
+            "order_date": (start + pd.to_timedelta(offset + rng.integers(0, rows, n), unit="min")).strftime("%Y-%m-%d %H:%M"),
+            "region": rng.choice(["North", "South", "East", "West", "Central"], n),
+            "price": price.round(2),
+            "quantity": rng.integers(1, 20, n),
+            "discount": (price * rng.uniform(0, 0.3, n)).round(2),
+        }).to_csv(path, mode="a", header=offset == 0, index=False)
+
+
+def _measure(mode, path):
+    import stream
+
+    start = time.perf_counter()
+    if mode == "in_memory":
+        df = pd.read_csv(path)
+        numeric_cols = df.select_dtypes(include=["float64", "int64"]).columns.tolist()
+        corr = df[numeric_cols].corr()
+        df["order_date"] = pd.to_datetime(df["order_date"])
+        df = df.sort_values(by="order_date")
+        bars = df.groupby("region")[numeric_cols[0]].mean().sort_values()
+    else:
+        reader = pd.read_csv(path, chunksize=stream.CHUNK_ROWS)
+        first = next(reader)
+        stats = stream.ChartStats(first.head(stream.SAMPLE_ROWS))
+        stats.add(first)
+        for chunk in reader:
+            stats.add(chunk)
+        corr = stats.cov.corr()
+        stats.line.series("price")
+        bars = stats.bars["region"].means()
+    print(json.dumps({
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb(),
+        "corr": corr.to_numpy().tolist(),
+        "bars": bars.round(6).to_dict(),
+    }))
+
+
+def _run_child(mode, path):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_stream", "--child", mode, path],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(rows_list, modes):
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "upload.csv")
+            write_upload(path, rows)
+            size_mb = os.path.getsize(path) / 1e6
+            for mode in modes:
+                result = {"rows": rows, "file_mb": size_mb, "mode": mode, **_run_child(mode, path)}
+                results.append(result)
+                print(f"{rows:>11,} rows ({size_mb:7.0f} MB)  {mode:<10} {result['seconds']:8.2f}s  "
+                      f"{result['peak_rss_mb']:9.1f} MB peak")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000000,5000000,20000000")
+    parser.add_argument("--modes", default="in_memory,streaming")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure(*args.child)
+        return
+    results = run([int(r) for r in args.rows.split(",")], args.modes.split(","))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
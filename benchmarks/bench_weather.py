@@ -0,0 +1,65 @@
+"""Weather fetch latency against the local stub server with injected latency.
+
+Compares fetching every city serially, concurrently via fetch_many(), and
+again from the warm response cache.
+
+    python -m benchmarks.bench_weather --latency 200
+"""
+import argparse
+import json
+import time
+
+import weather_client
+import weather_stub_server
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(latency_ms):
+    server, url = weather_stub_server.start_in_thread(latency=latency_ms / 1000)
+    weather_client.BASE_URL = url
+    cities = weather_client.city_coords
+
+    weather_client.clear_cache()
+    single = _timed(lambda: weather_client.get_forecast(*cities["Delhi"]))
+
+    weather_client.clear_cache()
+    serial = _timed(lambda: [weather_client.get_forecast(lat, lon) for lat, lon in cities.values()])
+
+    weather_client.clear_cache()
+    parallel = _timed(lambda: weather_client.fetch_many(cities))
+    cached = _timed(lambda: weather_client.fetch_many(cities))
+
+    server.shutdown()
+    result = {
+        "latency_ms": latency_ms,
+        "cities": len(cities),
+        "single_fetch_s": single,
+        "serial_s": serial,
+        "parallel_s": parallel,
+        "cached_s": cached,
+        "upstream_requests": server.stats["requests"],
+        "client_stats": dict(weather_client.stats),
+    }
+    print(f"{len(cities)} cities @ {latency_ms:.0f} ms: single {single:.3f}s  serial {serial:.3f}s  "
+          f"parallel {parallel:.3f}s  cached {cached * 1000:.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=200, help="stub latency per request, in ms")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    result = run(args.latency)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Headless benchmark of every dashboard script on synthetic data.
+
+For each scale, synthetic CSVs are written to a temporary directory that the
+dashboards read through ``DASHBOARD_DATA_DIR``; ``wether.py`` is pointed at a
+local Open-Meteo stub. Each script then runs in a fresh subprocess under
+Streamlit's ``AppTest`` and reports:
+
+* cold start: the first run, including imports and the dataset load
+* warm rerun: later full-page runs in the same process (what a sidebar change
+  costs; widgets owned by a section rerun only that section's fragment, which
+  AppTest does not model)
+* per-section time, split into load / compute / figure / serialize phases,
+  and chart payload bytes, from the dashboards' ``perf`` markers
+* peak RSS of the subprocess
+
+Results are written as JSON; pass an earlier file as ``--baseline`` to print
+the change against it.
+
+    python -m benchmarks.run_dashboards --rows 10000,1000000 --output bench.json
+    python -m benchmarks.run_dashboards --rows 10000 --baseline bench.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import data_loader
+from benchmarks import synthetic
+from benchmarks.bench_snapshot import peak_rss_mb
+
+# script -> dataset it reads ("open_meteo": the stub server; None: file upload)
+SCRIPTS = {
+    "Ai_job_streamlit.py": "ai_job",
+    "stream1.py": "cricket",
+    "flight_streamlit.py": "flight",
+    "Ecommerence_streamlit.py": "ecommerce",
+    "wether.py": "open_meteo",
+    "stream.py": None,
+}
+
+
+# ------------------------ Child Process ------------------------
+def _sections(report):
+    """``{section: {phase: seconds, "payload_bytes": n}}`` from a perf report."""
+    sections = {}
+    for record in report["records"]:
+        section = sections.setdefault(record["section"], {})
+        if record["phase"] == "payload":
+            section["payload_bytes"] = section.get("payload_bytes", 0) + record["payload_bytes"]
+        else:
+            section[record["phase"]] = section.get(record["phase"], 0.0) + record["seconds"]
+    return sections
+
+
+def _timed_run(at):
+    import perf
+
+    runs = len(perf.history)
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    report = perf.history[-1] if len(perf.history) > runs else None
+    if report is None:
+        return seconds, {}, seconds
+    # Time outside the instrumented sections: imports, page config, AppTest itself.
+    return seconds, _sections(report), seconds - report["run_seconds"]
+
+
+def _median_sections(runs):
+    merged = {}
+    for sections in runs:
+        for section, phases in sections.items():
+            for phase, value in phases.items():
+                merged.setdefault(section, {}).setdefault(phase, []).append(value)
+    return {section: {phase: statistics.median(values) for phase, values in phases.items()}
+            for section, phases in merged.items()}
+
+
+def _measure(script, warm_runs, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=timeout)
+    cold, cold_sections, cold_outside = _timed_run(at)
+    warm = [_timed_run(at) for _ in range(warm_runs)]
+    print(json.dumps({
+        "cold_seconds": cold,
+        "warm_seconds": statistics.median(w[0] for w in warm) if warm else None,
+        "cold_outside_sections_seconds": cold_outside,
+        "warm_outside_sections_seconds": statistics.median(w[2] for w in warm) if warm else None,
+        "cold_sections": cold_sections,
+        "warm_sections": _median_sections(w[1] for w in warm),
+        "peak_rss_mb": peak_rss_mb(),
+        "charts": len(at.get("plotly_chart")) + len(at.get("imgs")) + len(at.get("arrow_vega_lite_chart")),
+        "exceptions": [e.value for e in at.exception],
+    }))
+
+
+def _run_child(script, env, warm_runs, timeout):
+    env = dict(env, DASHBOARD_PERF="1")
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run_dashboards", "--child", script,
+         "--warm-runs", str(warm_runs), "--timeout", str(timeout)],
+        env=env, capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"exit {out.returncode}"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ------------------------ Driver ------------------------
+def _write_datasets(data_dir, datasets, rows, snapshots):
+    for name in datasets:
+        synthetic.write_csv(name, os.path.join(data_dir, data_loader.DATASETS[name]["path"]), rows)
+    if snapshots and datasets:
+        subprocess.run(
+            [sys.executable, "snapshot.py", *datasets],
+            env=dict(os.environ, DASHBOARD_DATA_DIR=data_dir), check=True, capture_output=True,
+        )
+
+
+def run(scripts, rows_list, weather_days, warm_runs, timeout, snapshots):
+    import weather_stub_server
+
+    results = []
+    csv_datasets = sorted({SCRIPTS[s] for s in scripts} & set(synthetic.GENERATORS))
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            start = time.perf_counter()
+            _write_datasets(data_dir, csv_datasets, rows, snapshots)
+            print(f"{rows:,} rows written in {time.perf_counter() - start:.1f}s")
+            for script in scripts:
+                dataset = SCRIPTS[script]
+                if dataset == "open_meteo":
+                    continue
+                env = dict(os.environ, DASHBOARD_DATA_DIR=data_dir)
+                result = {"script": script, "dataset": dataset, "rows": rows,
+                          **_run_child(script, env, warm_runs, timeout)}
+                if dataset is None:
+                    result["note"] = "AppTest cannot upload files; measures the empty upload page"
+                results.append(result)
+                _print(result)
+
+    if "wether.py" in scripts:
+        for days in weather_days:
+            server, url = weather_stub_server.start_in_thread(days=days)
+            with tempfile.TemporaryDirectory() as store_dir:
+                env = dict(os.environ, OPEN_METEO_URL=url, WEATHER_STORE_DIR=store_dir)
+                result = {"script": "wether.py", "dataset": "open_meteo", "rows": days * 24,
+                          **_run_child("wether.py", env, warm_runs, timeout)}
+            server.shutdown()
+            results.append(result)
+            _print(result)
+    return results
+
+
+def _print(result):
+    label = f"{result['script']:<26} {result['rows']:>10,} rows"
+    if "error" in result:
+        print(f"{label}  ERROR {result['error']}")
+        return
+    print(f"{label}  cold {result['cold_seconds']:7.2f}s  warm {result['warm_seconds'] or 0:7.2f}s  "
+          f"peak {result['peak_rss_mb']:8.1f} MB" + (f"  {len(result['exceptions'])} exception(s)"
+                                                     if result["exceptions"] else ""))
+
+
+def compare(results, baseline):
+    """Print each result's change against the matching run in ``baseline``."""
+    previous = {(r["script"], r["rows"]): r for r in baseline["results"] if "error" not in r}
+    for result in results:
+        old = previous.get((result["script"], result["rows"]))
+        if old is None or "error" in result:
+            continue
+        changes = []
+        for key in ("cold_seconds", "warm_seconds", "peak_rss_mb"):
+            if result.get(key) and old.get(key):
+                changes.append(f"{key} {result[key] / old[key] - 1:+.0%}")
+        print(f"{result['script']:<26} {result['rows']:>10,} rows  " + "  ".join(changes))
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10000,1000000", help="comma-separated scales, e.g. 10000,10000000")
+    parser.add_argument("--weather-days", default="7,90", help="forecast lengths served to wether.py")
+    parser.add_argument("--scripts", default=",".join(SCRIPTS))
+    parser.add_argument("--warm-runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600, help="per-run AppTest timeout, in seconds")
+    parser.add_argument("--snapshots", action="store_true", help="build columnar snapshots before running")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure(args.child, args.warm_runs, args.timeout)
+        return
+    scripts = args.scripts.split(",")
+    unknown = sorted(set(scripts) - set(SCRIPTS))
+    if unknown:
+        parser.error(f"unknown script(s): {', '.join(unknown)}")
+    results = run(
+        scripts,
+        [int(r) for r in args.rows.split(",")],
+        [int(d) for d in args.weather_days.split(",")],
+        args.warm_runs, args.timeout, args.snapshots,
+    )
+    report = {"commit": _commit(), "python": sys.version.split()[0], "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""Schema-faithful synthetic data for the dashboard datasets.
+
+Generators yield DataFrame chunks so that multi-million-row files can be
+written without holding the whole frame in memory. Column names, value pools
+and cardinalities follow the files the dashboards read (the cleaned flight
+and e-commerce files are the notebooks' outputs); popular values are skewed
+with Zipf weights.
+"""
+import numpy as np
+import pandas as pd
+
+from cleaning import BOOKING_SOURCES, FLIGHT_CLASSES, PLATFORMS, SEASONS, STOPOVERS
+from weather_stub_server import synthetic_payload
+
+CHUNK_ROWS = 500_000
+
+# ------------------------ Ai_job.csv ------------------------
+JOB_TITLES = [
+    "Machine Learning Researcher", "AI Software Engineer", "Autonomous Systems Engineer",
+    "Machine Learning Engineer", "AI Architect", "Head of AI", "NLP Engineer",
+    "Robotics Engineer", "Data Analyst", "AI Research Scientist", "Data Engineer",
+    "AI Product Manager", "Research Scientist", "Principal Data Scientist", "AI Specialist",
+    "ML Ops Engineer", "Computer Vision Engineer", "Data Scientist", "Deep Learning Engineer",
+    "AI Consultant",
+]
+EXPERIENCE_LEVELS = ["Mid-Level", "Executive-level", "Senior-Level ", "Entry-Level"]
+EMPLOYMENT_TYPES = ["Full-Time", "Freelance", "Contract", "Part-Time"]
+COUNTRIES = [
+    "Germany", "Denmark", "Canada", "France", "Austria", "Singapore", "China", "India",
+    "Sweden", "Israel", "Ireland", "Switzerland", "Japan", "Finland", "Australia",
+    "Netherlands", "United Kingdom", "United States", "South Korea", "Norway",
+]
+COMPANY_SIZES = ["Small", "Large", "Medium"]
+EDUCATION = ["Bachelor", "Associate", "Master", "PhD"]
+INDUSTRIES = [
+    "Retail", "Media", "Automotive", "Consulting", "Technology", "Real Estate", "Government",
+    "Transportation", "Telecommunications", "Healthcare", "Finance", "Energy", "Gaming",
+    "Manufacturing", "Education",
+]
+COMPANIES = [
+    "TechCorp Inc", "Cognitive Computing", "AI Innovations", "Digital Transformation LLC",
+    "Quantum Computing Inc", "Future Systems", "Cloud AI Solutions", "Predictive Systems",
+    "Smart Analytics", "Advanced Robotics", "Neural Networks Co", "Machine Intelligence Group",
+    "Autonomous Tech", "DataVision Ltd", "DeepTech Ventures", "Algorithmic Solutions",
+]
+SKILLS = [
+    "Python", "SQL", "TensorFlow", "Kubernetes", "Scala", "PyTorch", "Linux", "Git", "Java",
+    "GCP", "Hadoop", "Tableau", "R", "Computer Vision", "Data Visualization", "Deep Learning",
+    "MLOps", "Spark", "NLP", "Azure", "AWS", "Mathematics", "Docker", "Statistics",
+]
+AI_JOB_COLUMNS = [
+    "", "job_id", "job_title", "salary_usd", "salary_currency", "experience_level",
+    "employment_type", "company_location", "company_size", "employee_residence", "remote_ratio",
+    "required_skills", "education_required", "years_experience", "industry", "posting_date",
+    "application_deadline", "job_description_length", "benefits_score", "company_name",
+    "remote_ratio_numeric", "difference_application_post_dates",
+]
+
+
+def zipf_weights(n, s=1.1):
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+
+def _pick(rng, values, n, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=p)]
+
+
+def _skill_pool(rng, size=20_000):
+    p = zipf_weights(len(SKILLS), s=0.5)
+    return np.array([
+        ", ".join(rng.choice(SKILLS, size=k, replace=False, p=p))
+        for k in rng.integers(3, 6, size=size)
+    ], dtype=object)
+
+
+def ai_job_chunks(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    rng = np.random.default_rng(seed)
+    skill_pool = _skill_pool(rng)
+    start_day = np.datetime64("2024-01-01")
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        idx = np.arange(offset, offset + n)
+        posted = start_day + rng.integers(0, 486, size=n).astype("timedelta64[D]")
+        window = rng.integers(14, 75, size=n)
+        remote = rng.choice([0, 50, 100], size=n)
+        yield pd.DataFrame({
+            "": idx,
+            "job_id": np.char.add("AI", np.char.zfill((idx + 1).astype(str), 7)),
+            "job_title": _pick(rng, JOB_TITLES, n),
+            "salary_usd": rng.lognormal(11.5, 0.45, size=n).astype(np.int64),
+            "salary_currency": _pick(rng, ["USD", "EUR", "GBP"], n, p=[0.8, 0.15, 0.05]),
+            "experience_level": _pick(rng, EXPERIENCE_LEVELS, n),
+            "employment_type": _pick(rng, EMPLOYMENT_TYPES, n),
+            "company_location": _pick(rng, COUNTRIES, n, p=zipf_weights(len(COUNTRIES), 0.3)),
+            "company_size": _pick(rng, COMPANY_SIZES, n),
+            "employee_residence": _pick(rng, COUNTRIES, n, p=zipf_weights(len(COUNTRIES), 0.3)),
+            "remote_ratio": remote,
+            "required_skills": skill_pool[rng.integers(0, len(skill_pool), size=n)],
+            "education_required": _pick(rng, EDUCATION, n),
+            "years_experience": rng.integers(0, 20, size=n),
+            "industry": _pick(rng, INDUSTRIES, n),
+            "posting_date": posted.astype(str),
+            "application_deadline": (posted + window.astype("timedelta64[D]")).astype(str),
+            "job_description_length": rng.integers(500, 2500, size=n),
+            "benefits_score": np.round(rng.uniform(5.0, 10.0, size=n), 1),
+            "company_name": _pick(rng, COMPANIES, n, p=zipf_weights(len(COMPANIES), 0.3)),
+            "remote_ratio_numeric": pd.Series(remote).map({0: "On-site", 50: "Hybrid", 100: "Remote"}).to_numpy(),
+            "difference_application_post_dates": window,
+        }, columns=AI_JOB_COLUMNS)
+
+
+# ------------------------ Cricket_data_set.csv ------------------------
+VENUES = [
+    "Narendra Modi Stadium, Ahmedabad", "Ekana Cricket Stadium, Lucknow", "Eden Gardens, Kolkata",
+    "Wankhede Stadium, Mumbai", "Arun Jaitley Stadium, Delhi", "Sawai Mansingh Stadium, Jaipur",
+    "New PCA Cricket Stadium, Mullanpur", "Rajiv Gandhi International Stadium, Hyderabad",
+    "MA Chidambaram Stadium, Chennai", "M. Chinnaswamy Stadium, Bangalore",
+    "ACA-VDCA Cricket Stadium, Vishakhapatnam", "Barsapara Stadium, Guwahati", "HPCA Stadium, Dharamshala",
+]
+TEAMS = ["PBKS", "KKR", "RCB", "GT", "RR", "CSK", "LSG", "DC", "MI", "SRH"]
+PLAYERS = [
+    "Virat Kohli", "Nicholas Pooran", "Ishan Kishan", "Sai Sudarshan", "Ryan Rickelton", "Shubman Gill",
+    "KL Rahul", "Yashasvi Jaiswal", "Shreyas Iyer", "Krunal Pandya", "Prasidh Krishna", "Noor Ahmad",
+    "Arshdeep Singh", "Josh Hazlewood", "Varun Chakravarthy", "Jasprit Bumrah", "Jofra Archer",
+    "Suryakumar Yadav", "Abhishek Sharma", "Mitchell Marsh", "Jos Buttler", "Phil Salt", "Rohit Sharma",
+    "Prabhsimran Singh", "Kuldeep Yadav", "Mohammed Siraj", "Trent Boult", "Pat Cummins", "Sunil Narine",
+    "Heinrich Klassen", "Riyan Parag", "Rajat Patidar", "Yuzvendra Chahal", "Mitchell Starc",
+    "Digvesh Singh", "Harshal Patel", "Andre Russell", "Priyansh Arya", "Aiden Markram", "MS Dhoni",
+]
+CRICKET_COLUMNS = [
+    "", "match_id", "date", "venue", "team1", "team2", "stage", "toss_winner", "toss_decision",
+    "first_innings_score", "first_innings_wickets", "second_innings_score", "second_innings_wickets",
+    "match_result", "match_winner", "wide ball runs", "wide wickets", "balls_left", "player_of_the_match",
+    "top_scorer", "highscore", "best_bowling", "best_bowling_figure", "best_bowling_wickets1",
+    "best_bowling_runs", "toss_win_match_win",
+]
+
+
+def _with_missing(rng, values, fraction):
+    values = values.astype(float)
+    values[rng.random(len(values)) < fraction] = np.nan
+    return values
+
+
+def cricket_chunks(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    rng = np.random.default_rng(seed)
+    first_day = np.datetime64("2008-03-22")
+    span_days = 6_500  # matches are spread evenly over the seasons to date
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        idx = np.arange(offset, offset + n)
+        team1 = rng.integers(0, len(TEAMS), size=n)
+        team2 = (team1 + rng.integers(1, len(TEAMS), size=n)) % len(TEAMS)
+        toss = np.where(rng.random(n) < 0.5, team1, team2)
+        result = _pick(rng, ["completed", "tied"], n, p=[0.96, 0.04])
+        winner = np.where(rng.random(n) < 0.5, team1, team2)
+        match_winner = np.asarray(TEAMS, dtype=object)[winner]
+        match_winner[result == "tied"] = np.nan
+        wickets = rng.choice([1, 2, 3, 4, 5], size=n, p=[0.05, 0.3, 0.45, 0.15, 0.05])
+        bowling_runs = np.clip(rng.normal(29, 10, size=n), 7, 74).astype(np.int64)
+        yield pd.DataFrame({
+            "": idx,
+            "match_id": idx + 1,
+            "date": (first_day + (idx * span_days // max(rows, 1)).astype("timedelta64[D]")).astype(str),
+            "venue": _pick(rng, VENUES, n, p=zipf_weights(len(VENUES), 0.4)),
+            "team1": np.asarray(TEAMS, dtype=object)[team1],
+            "team2": np.asarray(TEAMS, dtype=object)[team2],
+            "stage": _pick(rng, ["League", "Playoffs", "Final"], n, p=[0.95, 0.04, 0.01]),
+            "toss_winner": np.asarray(TEAMS, dtype=object)[toss],
+            "toss_decision": _pick(rng, ["Bowl", "Bat"], n, p=[0.82, 0.18]),
+            "first_innings_score": _with_missing(rng, np.clip(rng.normal(190, 37, size=n), 95, 290).round(), 0.01),
+            "first_innings_wickets": _with_missing(rng, rng.integers(2, 11, size=n), 0.01),
+            "second_innings_score": _with_missing(rng, np.clip(rng.normal(174, 38, size=n), 7, 250).round(), 0.03),
+            "second_innings_wickets": _with_missing(rng, rng.integers(0, 11, size=n), 0.03),
+            "match_result": result,
+            "match_winner": match_winner,
+            "wide ball runs": np.clip(rng.normal(28, 19, size=n), 1, 110).round(),
+            "wide wickets": rng.integers(1, 11, size=n).astype(float),
+            "balls_left": _with_missing(rng, np.minimum(rng.exponential(10.8, size=n), 114).round(), 0.03),
+            "player_of_the_match": _pick(rng, PLAYERS, n, p=zipf_weights(len(PLAYERS), 0.6)),
+            "top_scorer": _pick(rng, PLAYERS, n, p=zipf_weights(len(PLAYERS), 0.6)),
+            "highscore": _with_missing(rng, np.clip(rng.normal(74, 20, size=n), 37, 141).round(), 0.04),
+            "best_bowling": _pick(rng, PLAYERS, n, p=zipf_weights(len(PLAYERS), 0.6)),
+            "best_bowling_figure": np.char.add(np.char.add(wickets.astype(str), "--"), bowling_runs.astype(str)),
+            "best_bowling_wickets1": wickets,
+            "best_bowling_runs": bowling_runs,
+            "toss_win_match_win": (toss == winner) & (result == "completed"),
+        }, columns=CRICKET_COLUMNS)
+
+
+# ------------------------ Flight_Price_Dataset_of_Bangladesh_Cleaned.csv ------------------------
+AIRPORTS = {
+    "DAC": "Hazrat Shahjalal International Airport, Dhaka",
+    "CGP": "Shah Amanat International Airport, Chittagong",
+    "ZYL": "Osmani International Airport, Sylhet",
+    "CXB": "Cox's Bazar Airport",
+    "JSR": "Jessore Airport",
+    "RJH": "Shah Makhdum Airport, Rajshahi",
+    "SPD": "Saidpur Airport",
+    "BZL": "Barisal Airport",
+    "CCU": "Netaji Subhas Chandra Bose International Airport, Kolkata",
+    "DEL": "Indira Gandhi International Airport, Delhi",
+    "KUL": "Kuala Lumpur International Airport",
+    "SIN": "Singapore Changi Airport",
+    "BKK": "Suvarnabhumi Airport, Bangkok",
+    "DXB": "Dubai International Airport",
+    "DOH": "Hamad International Airport, Doha",
+    "JED": "King Abdulaziz International Airport, Jeddah",
+    "IST": "Istanbul Airport",
+    "LHR": "London Heathrow Airport",
+    "JFK": "John F. Kennedy International Airport, New York",
+    "YYZ": "Toronto Pearson International Airport",
+}
+DOMESTIC_AIRPORTS = ["DAC", "CGP", "ZYL", "CXB", "JSR", "RJH", "SPD", "BZL"]
+AIRLINES = [
+    "US-Bangla Airlines", "Vistara", "Lufthansa", "FlyDubai", "Biman Bangladesh Airlines", "Emirates",
+    "Saudia", "Thai Airways", "AirAsia", "Air Astra", "Malaysian Airlines", "Cathay Pacific", "Air India",
+    "Singapore Airlines", "NovoAir", "Etihad Airways", "Qatar Airways", "Kuwait Airways", "Gulf Air",
+    "IndiGo", "Turkish Airlines", "British Airways", "SriLankan Airlines", "Air Arabia",
+]
+AIRCRAFT = ["Airbus A320", "Boeing 737", "Airbus A350", "Boeing 787", "Boeing 777"]
+FLIGHT_COLUMNS = [
+    "", "Airline", "Source", "Source Name", "Destination", "Destination Name", "Departure Date & Time",
+    "Arrival Date & Time", "Duration (hrs)", "Stopovers", "Aircraft Type", "Class", "Booking Source",
+    "Base Fare (BDT)", "Tax & Surcharge (BDT)", "Total Fare (BDT)", "Seasonality", "Days Before Departure",
+    "Stopovers_numeric", "Class_numeric", "Booking Source numeric", "Seasonality Numeric", "Month",
+    "Arrival_Hour", "Arrival_Day",
+]
+FLIGHT_RAW_COLUMNS = FLIGHT_COLUMNS[1:FLIGHT_COLUMNS.index("Stopovers_numeric")]
+
+
+def _coded(rng, mapping, n, p=None):
+    labels = _pick(rng, list(mapping), n, p=p)
+    return labels, pd.Series(labels).map(mapping).to_numpy()
+
+
+def flight_chunks(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    rng = np.random.default_rng(seed)
+    codes = np.asarray(list(AIRPORTS), dtype=object)
+    names = pd.Series(AIRPORTS)
+    # Every route starts at a Bangladeshi airport; Dhaka dominates.
+    source_p = zipf_weights(len(DOMESTIC_AIRPORTS), 0.3)
+    airline_p = np.r_[2.0, np.ones(len(AIRLINES) - 1)]
+    year_start = np.datetime64("2025-01-01T00:00")
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        source = _pick(rng, DOMESTIC_AIRPORTS, n, p=source_p)
+        destination = codes[rng.integers(0, len(codes), size=n)]
+        same = destination == source
+        destination[same] = np.where(source[same] == "DAC", "CGP", "DAC")
+        stopovers, stopovers_numeric = _coded(rng, STOPOVERS, n, p=[0.5, 0.35, 0.15])
+        duration = np.where(np.isin(destination, DOMESTIC_AIRPORTS), rng.uniform(0.5, 1.5, size=n),
+                            rng.uniform(1.0, 16.0, size=n)) + stopovers_numeric * rng.uniform(1.0, 4.0, size=n)
+        departure = year_start + rng.integers(0, 365 * 24 * 60, size=n).astype("timedelta64[m]")
+        arrival = departure + (duration * 3600).astype("timedelta64[s]")
+        flight_class, class_numeric = _coded(rng, FLIGHT_CLASSES, n)
+        booking, booking_numeric = _coded(rng, BOOKING_SOURCES, n)
+        season, season_numeric = _coded(rng, SEASONS, n, p=[0.7, 0.12, 0.12, 0.06])
+        base = rng.lognormal(10.0, 0.9, size=n) * (1 + (3 - class_numeric) * 1.5)
+        tax = base * rng.uniform(0.1, 0.2, size=n) + 200
+        departure_ts, arrival_ts = pd.DatetimeIndex(departure), pd.DatetimeIndex(arrival)
+        yield pd.DataFrame({
+            "": np.arange(offset, offset + n),
+            "Airline": _pick(rng, AIRLINES, n, p=airline_p / airline_p.sum()),
+            "Source": source,
+            "Source Name": names[source].to_numpy(),
+            "Destination": destination,
+            "Destination Name": names[destination].to_numpy(),
+            "Departure Date & Time": departure_ts.strftime("%Y-%m-%d %H:%M:%S"),
+            "Arrival Date & Time": arrival_ts.strftime("%Y-%m-%d %H:%M:%S"),
+            "Duration (hrs)": duration,
+            "Stopovers": stopovers,
+            "Aircraft Type": _pick(rng, AIRCRAFT, n),
+            "Class": flight_class,
+            "Booking Source": booking,
+            "Base Fare (BDT)": base,
+            "Tax & Surcharge (BDT)": tax,
+            "Total Fare (BDT)": base + tax,
+            "Seasonality": season,
+            "Days Before Departure": rng.integers(1, 91, size=n),
+            "Stopovers_numeric": stopovers_numeric,
+            "Class_numeric": class_numeric,
+            "Booking Source numeric": booking_numeric,
+            "Seasonality Numeric": season_numeric,
+            "Month": departure_ts.month_name(),
+            "Arrival_Hour": arrival_ts.hour,
+            "Arrival_Day": arrival_ts.day_name(),
+        }, columns=FLIGHT_COLUMNS)
+
+
+# ------------------------ Ecommerence cleaned data.csv ------------------------
+PRODUCT_CATEGORIES = ["Dairy", "Grocery", "Snacks", "Fruits & Vegetables", "Beverages", "Personal Care"]
+FEEDBACK = {
+    "good": ["Fast delivery, great service!", "Quick and reliable!", "Very satisfied with the service.",
+             "Good packaging and timely delivery."],
+    "bad": ["Items missing from order.", "Late delivery, very disappointed.", "Wrong item delivered.",
+            "Product was damaged."],
+}
+ECOMMERCE_COLUMNS = [
+    "", "Order ID", "Customer ID", "Platform", "Order Date & Time", "Delivery Time (Minutes)",
+    "Product Category", "Order Value (INR)", "Customer Feedback", "Service Rating", "Delivery Delay",
+    "Refund Requested", "Platform_numeric",
+]
+ECOMMERCE_RAW_COLUMNS = ECOMMERCE_COLUMNS[1:-1]
+
+
+def ecommerce_chunks(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    rng = np.random.default_rng(seed)
+    # The notebook's time parser only succeeds for ~40% of rows and fills
+    # the rest with "Not Available".
+    order_times = np.array([f"1900-01-01 {h:02d}:29:30" for h in range(24)], dtype=object)
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        idx = np.arange(offset, offset + n)
+        platform, platform_numeric = _coded(rng, PLATFORMS, n)
+        rating = rng.choice([5, 2, 1, 4, 3], size=n, p=[0.387, 0.306, 0.153, 0.077, 0.077])
+        happy = rating >= 4
+        feedback = np.where(happy, _pick(rng, FEEDBACK["good"], n), _pick(rng, FEEDBACK["bad"], n))
+        delivery = np.clip(rng.normal(30, 9, size=n), 5, 76).astype(np.int64)
+        order_time = order_times[rng.integers(0, 24, size=n)]
+        order_time[rng.random(n) < 0.6] = "Not Available"
+        yield pd.DataFrame({
+            "": idx,
+            "Order ID": np.char.add("ORD", np.char.zfill((idx + 1).astype(str), 6)),
+            "Customer ID": np.char.add("CUST", rng.integers(1000, 10000, size=n).astype(str)),
+            "Platform": platform,
+            "Order Date & Time": order_time,
+            "Delivery Time (Minutes)": delivery,
+            "Product Category": _pick(rng, PRODUCT_CATEGORIES, n),
+            "Order Value (INR)": rng.integers(50, 2000, size=n),
+            "Customer Feedback": feedback,
+            "Service Rating": rating,
+            "Delivery Delay": np.where(delivery > 40, "Yes", "No"),
+            "Refund Requested": np.where(~happy & (rng.random(n) < 0.75), "Yes", "No"),
+            "Platform_numeric": platform_numeric,
+        }, columns=ECOMMERCE_COLUMNS)
+
+
+# ------------------------ Raw exports (cleaning.py inputs) ------------------------
+def flight_raw_chunks(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Flight_Price_Dataset_of_Bangladesh.csv: the cleaned columns without the derived ones."""
+    for chunk in flight_chunks(rows, seed=seed, chunk_rows=chunk_rows):
+        yield chunk[FLIGHT_RAW_COLUMNS]
+
+
+def ecommerce_raw_chunks(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Ecommerce_Delivery_Analytics_New.csv, with order times as "MM:SS.f" strings.
+
+    The leading field runs 00-59, so the notebook's hours:minutes reading
+    keeps about 40% of them, as in the real export.
+    """
+    rng = np.random.default_rng(seed + 1)
+    for chunk in ecommerce_chunks(rows, seed=seed, chunk_rows=chunk_rows):
+        minutes = np.char.zfill(rng.integers(0, 60, size=len(chunk)).astype(str), 2)
+        seconds = np.char.zfill(rng.integers(0, 60, size=len(chunk)).astype(str), 2)
+        # 1-3 fraction digits, so some times land on whole seconds and others carry microseconds
+        digits = rng.integers(1, 4, size=len(chunk))
+        fraction = np.array([str(v).zfill(d) for v, d in zip(rng.integers(0, 10 ** digits), digits)])
+        stamps = np.char.add(np.char.add(np.char.add(minutes, ":"), seconds), np.char.add(".", fraction))
+        yield chunk[ECOMMERCE_RAW_COLUMNS].assign(**{"Order Date & Time": stamps})
+
+
+# ------------------------ Open-Meteo payloads ------------------------
+def open_meteo_payloads(coords, days=7, start=None):
+    """``{city: payload}`` forecasts of ``days`` hourly days for ``{city: (lat, lon)}``."""
+    return {city: synthetic_payload(lat, lon, days=days, start=start) for city, (lat, lon) in coords.items()}
+
+
+GENERATORS = {
+    "ai_job": ai_job_chunks,
+    "cricket": cricket_chunks,
+    "flight": flight_chunks,
+    "ecommerce": ecommerce_chunks,
+}
+RAW_GENERATORS = {
+    "flight": flight_raw_chunks,
+    "ecommerce": ecommerce_raw_chunks,
+}
+
+
+def write_csv(name, path, rows, seed=0, raw=False):
+    """Write ``rows`` synthetic rows of dataset ``name`` (its raw export if ``raw``) to ``path``."""
+    generators = RAW_GENERATORS if raw else GENERATORS
+    for i, chunk in enumerate(generators[name](rows, seed=seed)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
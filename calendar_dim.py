@@ -0,0 +1,185 @@
+"""Shared calendar dimension for the dashboards' time-based charts.
+
+A datetime column is converted once into compact integer keys: hours since
+the first day in the column (int32, -1 for missing). The day part of a key
+(``key // 24``) indexes a small calendar table with one row per day of the
+column's range, holding the integer code of every calendar attribute:
+
+* ``date``: the day itself
+* ``period``: year-month (labels are ``pd.Period``, as ``to_period("M")``)
+* ``year``
+* ``month``: January ... December, in calendar order
+* ``weekday``: Monday ... Sunday
+* ``season``: Winter (Dec-Feb), Spring, Summer, Autumn
+* ``hour``: 0 ... 23, taken from the key itself (``key % 24``)
+
+Time-bucketed counts and sums are two ``np.bincount`` calls: rows into
+hour-of-range cells (one pass over the keys), then the cells into the
+requested attribute codes (a pass over the calendar only). Results come back
+in calendar order rather than label or count order.
+
+    arrivals = TimeDim.build(df["Arrival Date & Time"])
+    arrivals.counts(("weekday", "hour"))                 # weekday, hour, count
+    arrivals.counts(("month",), rows=mask, empty=True)   # all twelve months, zeros included
+    arrivals.aggregate(("date",), df["Duration (hrs)"], "mean")
+
+``load(name, col)`` builds (or reuses) the dimension of a loaded dataset's
+column via ``data_loader.load_artifact``.
+"""
+import numpy as np
+import pandas as pd
+
+from data_loader import load_artifact
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+SEASONS = ["Winter", "Spring", "Summer", "Autumn"]
+HOURS = 24
+
+_SEASON_OF_MONTH = np.array([0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+
+def calendar(first_day, days):
+    """Attribute codes of ``days`` consecutive days from ``first_day`` (a ``datetime64[D]``)."""
+    dates = pd.DatetimeIndex(first_day + np.arange(days))
+    year, month = dates.year.to_numpy(), dates.month.to_numpy() - 1
+    first_year = year[0] if days else 0
+    return pd.DataFrame({
+        "date": np.arange(days, dtype=np.int32),
+        "period": ((year - first_year) * 12 + month - (month[0] if days else 0)).astype(np.int32),
+        "year": (year - first_year).astype(np.int16),
+        "month": month.astype(np.int8),
+        "weekday": dates.weekday.to_numpy().astype(np.int8),
+        "season": _SEASON_OF_MONTH[month],
+    }, index=dates)
+
+
+class TimeDim:
+    def __init__(self, keys, first_day, table):
+        self.keys = keys            # int32 hours since first_day per row, -1 if missing
+        self.first_day = first_day  # datetime64[D]
+        self.table = table          # calendar(first_day, days)
+
+    @classmethod
+    def build(cls, stamps):
+        stamps = pd.Series(stamps)
+        if getattr(stamps.dtype, "tz", None) is not None:
+            stamps = stamps.dt.tz_localize(None)  # bucket by local wall time
+        hours = stamps.to_numpy(dtype="datetime64[ns]").astype("datetime64[h]")
+        missing = np.isnat(hours)
+        if missing.all():
+            epoch = np.datetime64(0, "D")
+            return cls(np.full(len(hours), -1, dtype=np.int32), epoch, calendar(epoch, 0))
+        first_day = hours[~missing].min().astype("datetime64[D]")
+        last_day = hours[~missing].max().astype("datetime64[D]")
+        offsets = (hours - first_day.astype("datetime64[h]")).astype(np.int64)
+        keys = np.where(missing, -1, offsets).astype(np.int32)
+        return cls(keys, first_day, calendar(first_day, int((last_day - first_day).astype(np.int64)) + 1))
+
+    # ------------------------ Attributes ------------------------
+    def labels(self, attr):
+        """Labels of ``attr``'s codes, in calendar order."""
+        if attr == "hour":
+            return pd.Index(np.arange(HOURS), name=attr)
+        if attr == "month":
+            return pd.Index(MONTHS, name=attr)
+        if attr == "weekday":
+            return pd.Index(WEEKDAYS, name=attr)
+        if attr == "season":
+            return pd.Index(SEASONS, name=attr)
+        dates = self.table.index
+        if attr == "date":
+            return dates.rename(attr)
+        if not len(dates):
+            return pd.Index([], name=attr)
+        if attr == "period":
+            return pd.period_range(dates[0], dates[-1], freq="M", name=attr)
+        if attr == "year":
+            return pd.Index(np.arange(dates[0].year, dates[-1].year + 1), name=attr)
+        raise KeyError(attr)
+
+    # ------------------------ Aggregation ------------------------
+    def _cells(self, by):
+        """Combined ``by`` code of every hour of the calendar, and the number of codes."""
+        hours = np.arange(len(self.table) * HOURS)
+        combined = np.zeros(len(hours), dtype=np.int64)
+        size = 1
+        for attr in by:
+            codes = hours % HOURS if attr == "hour" else self.table[attr].to_numpy()[hours // HOURS]
+            n = len(self.labels(attr))
+            combined = combined * n + codes
+            size *= n
+        return combined, size
+
+    def _selected(self, rows):
+        """Keys of the selected rows with a timestamp, and the selection (None: every row)."""
+        keep = self.keys >= 0
+        if rows is not None:
+            keep &= np.asarray(rows, dtype=bool)
+        elif keep.all():
+            return self.keys, None
+        return self.keys[keep], keep
+
+    def _frame(self, by, groups):
+        frame = {}
+        for attr in reversed(by):
+            labels = self.labels(attr)
+            groups, codes = np.divmod(groups, len(labels))
+            frame[attr] = labels.take(codes)
+        return pd.DataFrame({attr: np.asarray(frame[attr]) for attr in by})
+
+    def counts(self, by, rows=None, empty=False, name="count"):
+        """Rows per combination of ``by`` attributes, in calendar order.
+
+        Combinations with no rows are left out unless ``empty`` is set.
+        ``rows`` optionally restricts the count to a boolean row selection.
+        """
+        keys, _ = self._selected(rows)
+        cells, size = self._cells(by)
+        per_hour = np.bincount(keys, minlength=len(cells))
+        counts = np.bincount(cells, weights=per_hour, minlength=size).astype(np.int64)
+        groups = np.arange(size) if empty else np.flatnonzero(counts)
+        frame = self._frame(by, groups)
+        frame[name] = counts[groups]
+        return frame
+
+    def aggregate(self, by, values, how="sum", rows=None, empty=False, name=None):
+        """``how`` ("sum", "mean", "max" or "min") of ``values`` per combination of ``by``.
+
+        Missing values are skipped, as in a pandas groupby: a group whose
+        values are all missing sums to 0 and has no mean/max/min (NaN).
+        """
+        name = name or getattr(values, "name", None) or how
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        keys, keep = self._selected(rows)
+        if keep is not None:
+            values = values[keep]
+        present = ~np.isnan(values)
+        cells, size = self._cells(by)
+        counts = np.bincount(cells, weights=np.bincount(keys, minlength=len(cells)), minlength=size)
+        if how in ("sum", "mean"):
+            per_hour = np.bincount(keys[present], weights=values[present], minlength=len(cells))
+            result = np.bincount(cells, weights=per_hour, minlength=size)
+            if how == "mean":
+                n = np.bincount(cells, weights=np.bincount(keys[present], minlength=len(cells)), minlength=size)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result = np.where(n > 0, result / n, np.nan)
+        else:
+            reduce = np.fmax if how == "max" else np.fmin
+            per_hour = np.full(len(cells), np.nan)
+            reduce.at(per_hour, keys[present], values[present])
+            result = np.full(size, np.nan)
+            reduce.at(result, cells, per_hour)
+        groups = np.arange(size) if empty else np.flatnonzero(counts)
+        frame = self._frame(by, groups)
+        frame[name] = result[groups]
+        return frame
+
+    def nbytes(self):
+        return self.keys.nbytes + int(self.table.memory_usage(index=True).sum())
+
+
+def load(name, col):
+    """The TimeDim of dataset ``name``'s ``col``, built once per loaded frame."""
+    return load_artifact(name, f"time_dim:{col}", lambda df: TimeDim.build(df[col]))
@@ -0,0 +1,239 @@
+"""Server-side reduction of chart payloads before they are sent to the browser.
+
+* ``lttb`` / ``downsample``: Largest-Triangle-Three-Buckets downsampling for
+  line and area charts.
+* ``box_figure``: box plots from server-computed quartiles/whiskers plus a
+  bounded sample of outliers, instead of shipping every raw value.
+* ``scatter_density_figure``: a binned 2-D density (for large data) with a
+  cached least-squares fit, instead of every point plus a statsmodels OLS
+  refit per rerun.
+
+``controls()`` adds a sidebar switch to turn reduction off and to show the
+payload size and serialization time of each chart for comparison.
+
+Every chart a page draws goes through ``plotly_chart`` or ``pyplot``; inside
+``recording(callback)`` each figure is also handed to ``callback`` (the static
+report export collects them this way). ``figure_cache.plotly_chart`` builds
+on ``plotly_chart`` to reuse finished figure specs across reruns.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import perf
+
+LINE_POINTS = 1000
+MAX_OUTLIERS = 200
+DENSITY_BINS = 60
+SCATTER_POINTS = 5000  # below this, raw points are smaller than a density grid
+MAX_FITS = 256  # cached trendlines, least recently used dropped first
+
+_fits_lock = threading.Lock()
+_fits = OrderedDict()  # digest of the (x, y) pairs -> (slope, intercept), at most MAX_FITS
+_recorders = []  # callbacks given every figure drawn, see ``recording``
+
+
+# ------------------------ Controls ------------------------
+def controls():
+    st.sidebar.header("⚡ Chart Payloads")
+    st.sidebar.checkbox("Reduce chart payloads", value=True, key="reduce_payloads")
+    st.sidebar.checkbox("Show payload size", value=False, key="show_payload_stats")
+
+
+def enabled():
+    return st.session_state.get("reduce_payloads", True)
+
+
+@contextmanager
+def recording(callback):
+    """Call ``callback(fig)`` with every plotly or matplotlib figure drawn inside the block."""
+    _recorders.append(callback)
+    try:
+        yield
+    finally:
+        _recorders.remove(callback)
+
+
+def recording_figures():
+    return bool(_recorders)
+
+
+def _record(fig):
+    for callback in list(_recorders):
+        callback(fig)
+
+
+def report_payload(nbytes, seconds=None):
+    """Attribute a chart payload to the perf section and caption it if "Show payload size" is ticked.
+
+    ``seconds`` is the serialization time; None for a spec served from ``figure_cache``.
+    """
+    perf.payload(nbytes)
+    if st.session_state.get("show_payload_stats", False):
+        mode = "reduced" if enabled() else "full"
+        source = "cached spec" if seconds is None else f"serialized in {seconds * 1000:.1f} ms"
+        st.caption(f"📦 {nbytes / 1024:,.1f} KB payload ({mode}) · {source}")
+
+
+def plotly_chart(fig, **kwargs):
+    """``st.plotly_chart`` that can report the figure's JSON payload size.
+
+    The call is timed as the current perf section's "serialize" phase; sizing
+    the payload is timed separately as "measure".
+    """
+    if st.session_state.get("show_payload_stats", False) or perf.recording():
+        perf.phase("measure")
+        start = time.perf_counter()
+        payload = fig.to_json()
+        report_payload(len(payload), time.perf_counter() - start)
+    _record(fig)
+    perf.phase("serialize")
+    st.plotly_chart(fig, use_container_width=True, **kwargs)
+    perf.phase("compute")
+
+
+def pyplot(fig):
+    """``st.pyplot``, timed as the "serialize" phase."""
+    _record(fig)
+    perf.phase("serialize")
+    st.pyplot(fig)
+    perf.phase("compute")
+
+
+# ------------------------ Line Charts ------------------------
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        # Ordered labels such as month periods: use their positions.
+        return np.arange(len(values), dtype=float)
+
+
+def lttb(x, y, threshold=LINE_POINTS):
+    """Indices of the ``threshold`` points LTTB keeps from the series (x, y)."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average point of the next bucket is the third triangle vertex.
+        nlo, nhi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(df, x, y, threshold=LINE_POINTS):
+    """Rows of ``df`` LTTB keeps for the line of ``y`` over ``x``."""
+    if not enabled() or len(df) <= threshold:
+        return df
+    return df.iloc[lttb(df[x].to_numpy(), df[y].to_numpy(), threshold)]
+
+
+# ------------------------ Box Plots ------------------------
+def box_summary(df, x, y, max_outliers=MAX_OUTLIERS, seed=0):
+    """Quartiles, Tukey whiskers and a sample of outliers of ``y`` per ``x``."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for category, values in df.groupby(x, sort=False, observed=True)[y]:
+        values = values.dropna().to_numpy()
+        if not len(values):
+            continue
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+        if len(outliers) > max_outliers:
+            outliers = rng.choice(outliers, max_outliers, replace=False)
+        rows.append({
+            x: category, "q1": q1, "median": median, "q3": q3,
+            "lowerfence": inside.min(), "upperfence": inside.max(),
+            "mean": values.mean(), "count": len(values), "outliers": outliers,
+        })
+    return pd.DataFrame(rows)
+
+
+def box_figure(df, x, y, title=None, template=None):
+    """Box plot coloured by ``x`` built from ``box_summary`` statistics."""
+    import plotly.express as px
+    if not enabled():
+        return px.box(df, x=x, y=y, color=x, title=title, template=template)
+    summary = box_summary(df, x, y)
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, row in summary.iterrows():
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            name=str(row[x]), x=[row[x]], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+            lowerfence=[row["lowerfence"]], upperfence=[row["upperfence"]], mean=[row["mean"]],
+            marker_color=color, boxpoints=False, legendgroup=str(row[x]),
+        ))
+        if len(row["outliers"]):
+            fig.add_trace(go.Scatter(
+                x=[row[x]] * len(row["outliers"]), y=row["outliers"], mode="markers",
+                marker=dict(color=color, size=4), showlegend=False, legendgroup=str(row[x]),
+                name=f"{row[x]} outliers",
+            ))
+    fig.update_layout(title=title, template=template, xaxis_title=x, yaxis_title=y, legend_title_text=x)
+    return fig
+
+
+# ------------------------ Scatter Plots ------------------------
+def fit_line(x, y):
+    """Least-squares slope and intercept, cached by a digest of the (x, y) pairs in order."""
+    x = pd.to_numeric(pd.Series(x), errors="coerce").to_numpy(dtype=float)
+    y = pd.to_numeric(pd.Series(y), errors="coerce").to_numpy(dtype=float)
+    ok = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[ok], y[ok]
+    key = hashlib.blake2b(np.column_stack([x, y]).tobytes(), digest_size=16).digest()
+    with _fits_lock:
+        fit = _fits.get(key)
+        if fit is not None:
+            _fits.move_to_end(key)
+            return fit
+    fit = tuple(np.polyfit(x, y, 1)) if len(x) > 1 else (np.nan, np.nan)
+    with _fits_lock:
+        _fits[key] = fit
+        while len(_fits) > MAX_FITS:
+            _fits.popitem(last=False)
+    return fit
+
+
+def scatter_density_figure(df, x, y, title=None, labels=None, color=None, bins=DENSITY_BINS):
+    """Binned point density of (x, y) with the least-squares trendline."""
+    import plotly.express as px
+    labels = labels or {}
+    if not enabled():
+        return px.scatter(df, x=x, y=y, trendline="ols", title=title, color=color, labels=labels)
+    data = df[[x, y]].dropna()
+    if len(data) <= SCATTER_POINTS:
+        fig = px.scatter(df, x=x, y=y, title=title, color=color, labels=labels)
+    else:
+        counts, xedges, yedges = np.histogram2d(data[x], data[y], bins=bins)
+        fig = go.Figure(go.Heatmap(
+            x=(xedges[:-1] + xedges[1:]) / 2, y=(yedges[:-1] + yedges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan), colorscale="Viridis", colorbar_title="Points",
+        ))
+    slope, intercept = fit_line(data[x], data[y])
+    line_x = np.array([data[x].min(), data[x].max()])
+    fig.add_trace(go.Scatter(x=line_x, y=slope * line_x + intercept, mode="lines",
+                             name=f"OLS fit: y = {slope:.2f}x + {intercept:.2f}", line=dict(color="red")))
+    fig.update_layout(title=title, xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y))
+    return fig
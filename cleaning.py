@@ -0,0 +1,232 @@
+"""Cleaning pipeline that turns the raw exports into the files the dashboards load.
+
+Vectorized ports of the notebook steps:
+
+* ``ecommerce`` (Ecommerence_DA.ipynb): "Ecommerce_Delivery_Analytics_New.csv"
+  -> "Ecommerence cleaned data.csv". Order times are parsed the way
+  ``convert_custom_time`` did (an "MM:SS.f" export read as hours:minutes,
+  invalid ones become "Not Available") and Platform_numeric is added.
+* ``flight`` (flight_price_DA.ipynb): "Flight_Price_Dataset_of_Bangladesh.csv"
+  -> "Flight_Price_Dataset_of_Bangladesh_Cleaned.csv". Datetimes are parsed,
+  the coded columns and Month / Arrival_Hour / Arrival_Day are added.
+
+Each dataset is a chain of stages. A stage's cache key hashes the previous
+key (the raw file's content hash for the first stage), the stage's source
+code and its parameters; outputs are pickled under ``CLEANING_CACHE_DIR``
+(default ``.cleaning_cache``). A rerun resumes after the last stage whose
+output is cached, and skips writing the cleaned CSV when it already holds
+the final key's output.
+
+    python cleaning.py                  # rebuild every cleaned file that is out of date
+    python cleaning.py flight --force   # ignore cached stages
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+CACHE_DIR = os.environ.get("CLEANING_CACHE_DIR", ".cleaning_cache")
+
+PLATFORMS = {"Swiggy Instamart": 3, "Blinkit": 2, "JioMart": 1}
+STOPOVERS = {"Direct": 0, "1 Stop": 1, "2 Stops": 2}
+FLIGHT_CLASSES = {"Economy": 3, "First Class": 2, "Business": 1}
+BOOKING_SOURCES = {"Online Website": 2, "Travel Agency": 1, "Direct Booking": 3}
+SEASONS = {"Regular": 1, "Winter Holidays": 2, "Eid": 3, "Hajj": 4}
+
+NOT_AVAILABLE = "Not Available"
+
+
+# ------------------------ Transforms ------------------------
+def read_raw(path):
+    return pd.read_csv(path)
+
+
+def order_times(df, column):
+    """``convert_custom_time`` over the distinct values of ``column``.
+
+    "19:29.5" is read as 19 h 29 min plus 0.5 of a minute, on 1900-01-01;
+    hours above 23 (most of the export) or unparsable strings become
+    "Not Available". Values are formatted as the notebook's CSV wrote them.
+    """
+    codes, uniques = pd.factorize(df[column])
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(r"^\s*(\d+):\s*(\d+)\.(\d+)\s*$")
+    hours = pd.to_numeric(parts[0])
+    minutes = pd.to_numeric(parts[1])
+    fraction = pd.to_numeric("0." + parts[2]) * 60
+    seconds = np.floor(fraction)
+    micros = np.floor((fraction - seconds) * 1_000_000)
+    valid = hours.between(0, 23) & minutes.between(0, 59)
+
+    stamps = (pd.Timestamp("1900-01-01")
+              + pd.to_timedelta((hours * 3600 + minutes * 60 + seconds).where(valid, 0), unit="s")
+              + pd.to_timedelta(micros.where(valid, 0), unit="us"))
+    text = stamps.dt.strftime("%Y-%m-%d %H:%M:%S")
+    has_micros = valid & (micros > 0)
+    micro_text = "." + micros.where(has_micros, 0).astype(np.int64).astype(str).str.zfill(6)
+    text = text.where(~has_micros, text + micro_text).where(valid, NOT_AVAILABLE)
+
+    labels = np.append(text.to_numpy(dtype=object), NOT_AVAILABLE)  # code -1: missing in the export
+    return df.assign(**{column: labels[codes]})
+
+
+def numeric_codes(df, columns):
+    """Add ``{source: (target, mapping)}`` coded columns (unknown labels -> NaN)."""
+    return df.assign(**{target: df[source].map(mapping) for source, (target, mapping) in columns.items()})
+
+
+def datetimes(df, columns):
+    return df.assign(**{col: pd.to_datetime(df[col], format="ISO8601") for col in columns})
+
+
+def flight_calendar(df):
+    departure, arrival = df["Departure Date & Time"].dt, df["Arrival Date & Time"].dt
+    return df.assign(Month=departure.month_name(), Arrival_Hour=arrival.hour, Arrival_Day=arrival.day_name())
+
+
+# ------------------------ Pipelines ------------------------
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: object
+    params: dict = field(default_factory=dict)
+
+    def key(self, previous):
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (previous, self.name, inspect.getsource(self.fn), repr(sorted(self.params.items()))):
+            digest.update(part.encode())
+        return digest.hexdigest()
+
+
+PIPELINES = {
+    "ecommerce": {
+        "raw": "Ecommerce_Delivery_Analytics_New.csv",
+        "stages": [
+            Stage("order_times", order_times, {"column": "Order Date & Time"}),
+            Stage("platform", numeric_codes, {"columns": {"Platform": ("Platform_numeric", PLATFORMS)}}),
+        ],
+    },
+    "flight": {
+        "raw": "Flight_Price_Dataset_of_Bangladesh.csv",
+        "stages": [
+            Stage("datetimes", datetimes, {"columns": ["Departure Date & Time", "Arrival Date & Time"]}),
+            Stage("codes", numeric_codes, {"columns": {
+                "Stopovers": ("Stopovers_numeric", STOPOVERS),
+                "Class": ("Class_numeric", FLIGHT_CLASSES),
+                "Booking Source": ("Booking Source numeric", BOOKING_SOURCES),
+                "Seasonality": ("Seasonality Numeric", SEASONS),
+            }}),
+            Stage("calendar", flight_calendar),
+        ],
+    },
+}
+
+
+def raw_path(name):
+    return os.path.join(data_loader.DATA_DIR, PIPELINES[name]["raw"])
+
+
+def _stage_path(name, stage, key):
+    return os.path.join(CACHE_DIR, name, f"{stage}-{key}.pkl")
+
+
+def _save_stage(name, stage, key, df):
+    directory = os.path.join(CACHE_DIR, name)
+    os.makedirs(directory, exist_ok=True)
+    # One cached output per stage: older keys of the same stage are dropped.
+    for old in os.listdir(directory):
+        if old.startswith(f"{stage}-") and old.endswith(".pkl"):
+            os.remove(os.path.join(directory, old))
+    tmp = _stage_path(name, stage, key) + ".tmp"
+    df.to_pickle(tmp)
+    os.replace(tmp, _stage_path(name, stage, key))
+
+
+def _output_manifest(name):
+    return os.path.join(CACHE_DIR, name, "output.json")
+
+
+def _output_is_current(name, key):
+    try:
+        with open(_output_manifest(name)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    try:
+        mtime_ns, size = data_loader.fingerprint(name)
+    except FileNotFoundError:
+        return False
+    return manifest == {"key": key, "mtime_ns": mtime_ns, "size": size}
+
+
+def run(name, force=False, log=print):
+    """Bring dataset ``name``'s cleaned CSV up to date; returns per-stage timings."""
+    pipeline = PIPELINES[name]
+    timings = {}
+    start = time.perf_counter()
+    keys = [data_loader.content_hash(raw_path(name))]
+    stages = [Stage("read", read_raw)] + pipeline["stages"]
+    for stage in stages:
+        keys.append(stage.key(keys[-1]))
+    timings["hash"] = time.perf_counter() - start
+
+    if not force and _output_is_current(name, keys[-1]):
+        log(f"{name}: up to date")
+        return timings
+
+    # Resume after the last stage with a cached output.
+    resume = 0
+    if not force:
+        for i in range(len(stages), 0, -1):
+            if os.path.exists(_stage_path(name, stages[i - 1].name, keys[i])):
+                resume = i
+                break
+    df = None
+    if resume:
+        start = time.perf_counter()
+        df = pd.read_pickle(_stage_path(name, stages[resume - 1].name, keys[resume]))
+        timings["cache_read"] = time.perf_counter() - start
+        log(f"{name}: stages up to {stages[resume - 1].name!r} cached")
+    for i in range(resume, len(stages)):
+        stage = stages[i]
+        start = time.perf_counter()
+        df = stage.fn(raw_path(name)) if stage.name == "read" else stage.fn(df, **stage.params)
+        timings[stage.name] = time.perf_counter() - start
+        _save_stage(name, stage.name, keys[i + 1], df)
+        log(f"{name}: {stage.name} {timings[stage.name]:.2f}s")
+
+    start = time.perf_counter()
+    out = data_loader.dataset_path(name)
+    tmp = out + ".tmp"
+    df.to_csv(tmp)  # with the index, as the notebooks saved it ("Unnamed: 0" when read back)
+    os.replace(tmp, out)
+    timings["write"] = time.perf_counter() - start
+    mtime_ns, size = data_loader.fingerprint(name)
+    with open(_output_manifest(name), "w") as f:
+        json.dump({"key": keys[-1], "mtime_ns": mtime_ns, "size": size}, f)
+    log(f"{name}: wrote {len(df):,} rows to {out} in {timings['write']:.2f}s")
+    return timings
+
+
+def main(argv):
+    force = "--force" in argv
+    names = [a for a in argv if a != "--force"] or list(PIPELINES)
+    unknown = sorted(set(names) - set(PIPELINES))
+    if unknown:
+        sys.exit(f"unknown dataset(s): {', '.join(unknown)}; choose from {', '.join(PIPELINES)}")
+    for name in names:
+        if not os.path.exists(raw_path(name)):
+            print(f"skip {name}: {raw_path(name)} not found")
+            continue
+        run(name, force=force)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,217 @@
+"""Aggregations answered by a pool of worker processes over shared memory.
+
+Streamlit runs every browser session as a thread of one server process, so
+filtered aggregations (a different row selection per session) queue on the
+GIL. With ``DASHBOARD_COMPUTE_WORKERS`` set, ``run`` sends them to a process
+pool instead:
+
+* the columns an ``AggEngine`` reads (integer key codes, numeric values,
+  masks) are copied once per loaded frame and set of columns into
+  ``multiprocessing`` shared-memory blocks; the labels go into one pickled
+  metadata block
+* each worker attaches the blocks (no copy) and keeps an engine over them
+  for as long as that frame is current
+* a request carries only the block names, the ``Agg`` mapping and the row
+  selection packed to one bit per row; the reply is the small result frames
+* identical requests (same frame, aggregations and rows) that arrive while
+  one is still being computed share its result instead of queueing again
+
+Without workers (the default) ``run`` is ``AggEngine.run`` in-process.
+
+    DASHBOARD_COMPUTE_WORKERS=4 streamlit run Ai_job_streamlit.py
+
+    results = compute_worker.run("ai_job", AGGREGATIONS, build_engine, rows=rows)
+"""
+import atexit
+import hashlib
+import multiprocessing
+import os
+import pickle
+import threading
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from agg_engine import AggEngine
+from data_loader import load_artifact
+
+WORKERS = int(os.environ.get("DASHBOARD_COMPUTE_WORKERS", 0))
+
+_lock = threading.Lock()
+_pool = None
+_inflight = {}  # request key -> Future
+stats = {"submitted": 0, "coalesced": 0}
+
+
+# ------------------------ Shared Columns ------------------------
+def _narrow_codes(codes):
+    """Key codes in the smallest signed integer type that holds them (-1 stays missing)."""
+    top = int(codes.max(initial=0))
+    for dtype in (np.int8, np.int16, np.int32):
+        if top <= np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes
+
+
+def _release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class SharedColumns:
+    """An engine's coded columns in shared memory; the blocks are unlinked when this is collected."""
+
+    def __init__(self, name, n, keys, values, masks):
+        self.name = name
+        self.token = uuid.uuid4().hex
+        self.nbytes = 0
+        self._blocks = []
+        layout = {
+            "n": n,
+            "keys": {col: (self._share(_narrow_codes(codes)), uniques, self._share(ranks))
+                     for col, (codes, uniques, ranks) in keys.items()},
+            "values": {col: (self._share(filled), self._share(present))
+                       for col, (filled, present) in values.items()},
+            "masks": {mask: self._share(flags) for mask, flags in masks.items()},
+        }
+        meta = np.frombuffer(pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8)
+        self.spec = (name, self.token, self._share(meta))
+        weakref.finalize(self, _release, self._blocks)
+
+    @classmethod
+    def publish(cls, name, engine, aggs):
+        return cls(name, engine.n, *engine.columns(aggs))
+
+    def _share(self, array):
+        """Copy ``array`` into a new block; returns ``(block name, dtype, length)``."""
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        self._blocks.append(block)
+        self.nbytes += array.nbytes
+        return block.name, array.dtype.str, len(array)
+
+
+# ------------------------ Worker Side ------------------------
+_attached = {}  # shared columns name (dataset and column set) -> (token, engine, blocks)
+
+
+def _view(ref, blocks):
+    name, dtype, length = ref
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray((length,), dtype=dtype, buffer=block.buf)
+
+
+def _engine(spec):
+    name, token, meta_ref = spec
+    if name in _attached and _attached[name][0] == token:
+        return _attached[name][1]
+    if name in _attached:
+        # A newer frame replaced this one: drop the old engine's views before closing their blocks.
+        blocks = _attached.pop(name)[2]
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # a view is still referenced somewhere; the mapping goes when it is collected
+    blocks = []
+    layout = pickle.loads(_view(meta_ref, blocks).tobytes())
+    engine = AggEngine.from_arrays(
+        layout["n"],
+        keys={col: (_view(codes, blocks), uniques, _view(ranks, blocks))
+              for col, (codes, uniques, ranks) in layout["keys"].items()},
+        values={col: (_view(filled, blocks), _view(present, blocks))
+                for col, (filled, present) in layout["values"].items()},
+        masks={mask: _view(flags, blocks) for mask, flags in layout["masks"].items()},
+    )
+    _attached[name] = (token, engine, blocks)
+    return engine
+
+
+def _run(spec, aggs, packed_rows):
+    engine = _engine(spec)
+    rows = None if packed_rows is None else np.unpackbits(
+        np.frombuffer(packed_rows, dtype=np.uint8), count=engine.n).astype(bool)
+    return engine.run(aggs, rows=rows)
+
+
+def _ready():
+    return os.getpid()
+
+
+# ------------------------ Client Side ------------------------
+def pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # Spawned, not forked: the Streamlit server process runs many threads.
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def warm():
+    """Start the worker processes now rather than on the first request."""
+    if WORKERS <= 0:
+        return
+    executor = pool()
+    # The executor starts a new process per submit while none is idle.
+    for future in [executor.submit(_ready) for _ in range(WORKERS)]:
+        future.result()
+
+
+@atexit.register
+def shutdown():
+    """Stop the worker processes; the next request starts a new pool."""
+    global _pool
+    with _lock:
+        executor, _pool = _pool, None
+    if executor is not None:
+        executor.shutdown()
+
+
+def submit(shared, aggs, rows=None):
+    """Future of ``AggEngine.run(aggs, rows)`` on a worker; joins an identical request in flight."""
+    packed = None if rows is None else np.packbits(np.asarray(rows, dtype=bool)).tobytes()
+    key = (shared.token, tuple(sorted(aggs.items())),
+           None if packed is None else hashlib.blake2b(packed, digest_size=16).digest())
+    executor = pool()
+    with _lock:
+        future = _inflight.get(key)
+        if future is not None:
+            stats["coalesced"] += 1
+            return future
+        future = _inflight[key] = executor.submit(_run, shared.spec, aggs, packed)
+        stats["submitted"] += 1
+    future.add_done_callback(lambda _: _forget(key, future))
+    return future
+
+
+def _forget(key, future):
+    with _lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def _column_set(aggs):
+    """The key columns, value columns and masks ``aggs`` read, each sorted."""
+    return (sorted({col for agg in aggs.values() for col in agg.by}),
+            sorted({agg.value for agg in aggs.values() if agg.value}),
+            sorted({agg.where for agg in aggs.values() if agg.where}))
+
+
+def run(name, aggs, build_engine, rows=None):
+    """``build_engine(df).run(aggs, rows)`` for dataset ``name``, on the worker pool when enabled.
+
+    The engine (in-process) is built once per loaded frame, its shared columns
+    (with workers) once per loaded frame and set of columns ``aggs`` reads.
+    """
+    if WORKERS <= 0:
+        return load_artifact(name, "agg_engine", build_engine).run(aggs, rows=rows)
+    key = f"shared_columns:{_column_set(aggs)}"
+    shared = load_artifact(name, key, lambda df: SharedColumns.publish(f"{name}/{key}", build_engine(df), aggs))
+    return submit(shared, aggs, rows).result()
@@ -0,0 +1,285 @@
+"""Shared dataset loader for the dashboards.
+
+Streamlit reruns a page script on every widget interaction, but imported
+modules stay in ``sys.modules`` for the life of the server process. Frames
+loaded here are therefore parsed once per process and shared by every browser
+session: never add or assign columns on a returned frame, or modify it in
+place. Different datasets load in parallel; concurrent requests for the same
+one wait for a single parse.
+
+String columns come back as categoricals and numeric columns narrowed, per
+the ``schema`` of each dataset (see ``schema.py``).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import schema
+
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", ".")
+
+# Cached frames are evicted (least recently used first) once their combined
+# deep memory usage goes over this budget.
+MEMORY_BUDGET_BYTES = int(os.environ.get("DASHBOARD_CACHE_BYTES", 1 << 30))
+
+
+# ------------------------ Derived Columns ------------------------
+def _ai_job_derived(df):
+    df['diff_days'] = (df['application_deadline'] - df['posting_date']).dt.days
+    df['posting_month'] = df['posting_date'].dt.month_name().astype("category")
+
+
+def _cricket_derived(df):
+    df['toss_win_match_win'] = (df['toss_winner'] == df['match_winner']).astype(np.int8)
+
+
+def _flight_derived(df):
+    df['Month'] = df['Departure Date & Time'].dt.month_name().astype("category")
+    df['Arrival_Hour'] = df['Arrival Date & Time'].dt.hour.astype(np.float32 if df['Arrival Date & Time'].isna().any() else np.int8)
+    df['Arrival_Day'] = df['Arrival Date & Time'].dt.day_name().astype("category")
+
+
+# ------------------------ Dataset Specs ------------------------
+CRICKET_SCHEMA = {
+    "categories": [
+        "venue", "team1", "team2", "stage", "toss_winner", "toss_decision", "match_result",
+        "match_winner", "player_of_the_match", "top_scorer", "best_bowling", "best_bowling_figure",
+    ],
+    "shared": [["team1", "team2", "toss_winner", "match_winner"]],
+    "numeric": {
+        "Unnamed: 0": "int32", "match_id": "int32",
+        "first_innings_score": "float32", "first_innings_wickets": "float32",
+        "second_innings_score": "float32", "second_innings_wickets": "float32",
+        "wide ball runs": "float32", "wide wickets": "float32", "balls_left": "float32",
+        "highscore": "float32", "best_bowling_wickets1": "int8", "best_bowling_runs": "int16",
+    },
+}
+
+DATASETS = {
+    "ai_job": {
+        "path": "Ai_job.csv",
+        "dates": ["posting_date", "application_deadline"],
+        "schema": {
+            "categories": [
+                "job_title", "salary_currency", "experience_level", "employment_type", "company_location",
+                "company_size", "employee_residence", "education_required", "industry", "company_name",
+                "remote_ratio_numeric",
+            ],
+            "shared": [["company_location", "employee_residence"]],
+            "numeric": {
+                "Unnamed: 0": "int32", "salary_usd": "int32", "remote_ratio": "uint8",
+                "years_experience": "uint8", "job_description_length": "uint16", "benefits_score": "float32",
+                "difference_application_post_dates": "int16",
+            },
+        },
+        "derived": _ai_job_derived,
+    },
+    "cricket": {
+        "path": "Cricket_data_set.csv",
+        "dates": ["date"],
+        "schema": CRICKET_SCHEMA,
+        "derived": _cricket_derived,
+    },
+    # Every season of every league: the partitions of ``match_store`` (its manifest marks a new version).
+    "matches": {
+        "path": os.path.join(".match_store", "manifest.json"),
+        "partitioned": True,
+        "dates": ["date"],
+        "schema": {
+            **CRICKET_SCHEMA,
+            "categories": ["league", *CRICKET_SCHEMA["categories"]],
+            "numeric": {**CRICKET_SCHEMA["numeric"], "season": "int16"},
+        },
+        "derived": _cricket_derived,
+    },
+    "flight": {
+        "path": "Flight_Price_Dataset_of_Bangladesh_Cleaned.csv",
+        "dates": ["Departure Date & Time", "Arrival Date & Time"],
+        "schema": {
+            "categories": [
+                "Airline", "Source", "Source Name", "Destination", "Destination Name", "Stopovers",
+                "Aircraft Type", "Class", "Booking Source", "Seasonality",
+            ],
+            "shared": [["Source", "Destination"], ["Source Name", "Destination Name"]],
+            "numeric": {
+                "Unnamed: 0": "int32", "Duration (hrs)": "float32", "Days Before Departure": "int16",
+                "Stopovers_numeric": "int8", "Class_numeric": "int8", "Booking Source numeric": "int8",
+                "Seasonality Numeric": "int8",
+            },
+        },
+        "derived": _flight_derived,
+    },
+    "ecommerce": {
+        "path": "Ecommerence cleaned data.csv",
+        "dates": [],
+        "schema": {
+            "categories": [
+                "Customer ID", "Platform", "Order Date & Time", "Product Category", "Customer Feedback",
+                "Delivery Delay", "Refund Requested",
+            ],
+            "numeric": {
+                "Unnamed: 0": "int32", "Delivery Time (Minutes)": "int16", "Order Value (INR)": "int32",
+                "Service Rating": "int8", "Platform_numeric": "int8",
+            },
+        },
+        "derived": None,
+    },
+}
+
+_lock = threading.Lock()  # guards _cache, _loading and stats; never held while reading a file
+_loading = {}  # name -> lock held while that dataset is hashed and parsed
+_cache = OrderedDict()  # name -> {"fingerprint", "content", "df", "bytes", "bytes_untyped", "artifacts"}
+stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0, "artifact_builds": 0}
+
+
+def dataset_path(name):
+    return os.path.join(DATA_DIR, DATASETS[name]["path"])
+
+
+def content_hash(path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(name):
+    """Return ``(mtime_ns, size)`` of the dataset's source file."""
+    st_ = os.stat(dataset_path(name))
+    return st_.st_mtime_ns, st_.st_size
+
+
+def read_source(name):
+    """Parse the source CSV, bypassing both the cache and any snapshot."""
+    spec = DATASETS[name]
+    if spec.get("partitioned"):
+        # Imported here because match_store builds on this module.
+        import match_store
+        df = match_store.read_partitions()
+    else:
+        df = pd.read_csv(dataset_path(name), dtype=schema.read_dtypes(spec["schema"]))
+    for col in spec["dates"]:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    schema.apply(df, spec["schema"])
+    if spec["derived"] is not None:
+        spec["derived"](df)
+    return df
+
+
+def _evict(keep):
+    while sum(entry["bytes"] for entry in _cache.values()) > MEMORY_BUDGET_BYTES:
+        oldest = next(iter(_cache))
+        if oldest == keep:
+            break
+        del _cache[oldest]
+        stats["evictions"] += 1
+
+
+def _cached(name, fp):
+    """The cached frame of ``name`` if it was loaded from a file with fingerprint ``fp``, else None."""
+    with _lock:
+        entry = _cache.get(name)
+        if entry is not None and entry["fingerprint"] == fp:
+            _cache.move_to_end(name)
+            stats["hits"] += 1
+            return entry["df"]
+    return None
+
+
+def load_dataset(name):
+    """Return the parsed frame for ``name``, reading the CSV only when needed.
+
+    A cached frame is reused while the file's mtime and size are unchanged. If
+    only the mtime moved (e.g. the file was touched or re-copied), the content
+    hash decides whether to re-parse.
+    """
+    fp = fingerprint(name)
+    df = _cached(name, fp)
+    if df is not None:
+        return df
+    with _lock:
+        loading = _loading.setdefault(name, threading.Lock())
+    with loading:
+        # Another thread may have loaded it while this one waited.
+        df = _cached(name, fp)
+        if df is not None:
+            return df
+        content = content_hash(dataset_path(name))
+        with _lock:
+            entry = _cache.get(name)
+            if entry is not None and entry["content"] == content:
+                entry["fingerprint"] = fp
+                _cache.move_to_end(name)
+                stats["hits"] += 1
+                return entry["df"]
+            if entry is not None:
+                stats["invalidations"] += 1
+            stats["misses"] += 1
+
+        # Imported here because snapshot builds on this module.
+        import snapshot
+        df = snapshot.read_snapshot(name)
+        memory = schema.memory_report(df)
+        with _lock:
+            _cache[name] = {
+                "fingerprint": fp,
+                "content": content,
+                "df": df,
+                "bytes": memory["after"],
+                "bytes_untyped": memory["before"],
+                "artifacts": {},
+            }
+            _cache.move_to_end(name)
+            _evict(keep=name)
+        return df
+
+
+def load_artifact(name, key, build):
+    """Return ``build(df)`` for dataset ``name``, built once per loaded frame.
+
+    Artifacts (encoded columns, indexes, ...) live in the same cache entry as
+    the frame, so they are invalidated and evicted together with it.
+    """
+    df = load_dataset(name)
+    with _lock:
+        entry = _cache.get(name)
+        if entry is not None and entry["df"] is df and key in entry["artifacts"]:
+            return entry["artifacts"][key]
+    artifact = build(df)
+    with _lock:
+        stats["artifact_builds"] += 1
+        entry = _cache.get(name)
+        if entry is not None and entry["df"] is df:
+            artifact = entry["artifacts"].setdefault(key, artifact)
+    return artifact
+
+
+def version(name):
+    """Content hash of the frame ``load_dataset(name)`` returns; it changes whenever the data does."""
+    load_dataset(name)
+    with _lock:
+        entry = _cache.get(name)
+        if entry is not None:
+            return entry["content"]
+    return content_hash(dataset_path(name))
+
+
+def cache_info():
+    with _lock:
+        return {
+            **stats,
+            "datasets": {name: entry["bytes"] for name, entry in _cache.items()},
+            "datasets_untyped": {name: entry["bytes_untyped"] for name, entry in _cache.items()},
+            "budget_bytes": MEMORY_BUDGET_BYTES,
+        }
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
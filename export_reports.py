@@ -0,0 +1,397 @@
+"""Headless export of every dashboard section to a static HTML/JSON bundle.
+
+Each section of each page is rendered on its own, without a browser, by
+running the page script under Streamlit's ``AppTest`` with only that section
+picked in the "Sections" selector. Widgets can be preset per variant: every
+team of the cricket preview, every city of the weather page (served by
+``weather_stub_server``, offline), every job title
+of the skills chart and every departure airport of the route chart.
+
+Sections and variants are independent, so they render in parallel on a
+process pool. Every output is keyed by a hash of its inputs (the dataset
+file contents or weather payloads, the dashboard code and the widget
+presets); outputs whose inputs are unchanged since the last export are
+skipped.
+
+Layout under ``--out``::
+
+    index.html                      links to every section and variant
+    plotly.min.js                   shared by every page
+    manifest.json                   output -> input hash, title
+    <page>/<section>[--<variant>].html / .json
+
+    python export_reports.py --out reports
+    python export_reports.py --out reports --pages cricket weather --workers 4
+    python export_reports.py --out reports --force
+"""
+import argparse
+import base64
+import glob
+import hashlib
+import html
+import importlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import data_loader
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = "manifest.json"
+TIMEOUT = 300  # seconds per section run
+
+
+# ------------------------ Pages ------------------------
+def _cricket_variants():
+    import match_store
+
+    teams = sorted(set().union(*(part["teams"] for part in match_store.sync()["partitions"])))
+    return {"selected_teams": [("All teams", teams)] + [(team, [team]) for team in teams]}
+
+
+def _ai_job_variants():
+    df = data_loader.load_dataset("ai_job")
+    titles = ["All job titles"] + sorted(df['job_title'].dropna().unique())
+    return {"skill_title": [(title, title) for title in titles]}
+
+
+def _flight_variants():
+    from flight_streamlit import route_index
+
+    index = route_index()
+    departures = index.airports[index.counts.sum(axis=1) > 0]
+    return {"route_airport": [(airport, airport) for airport in departures]}
+
+
+def _weather_variants():
+    from weather_client import city_coords
+
+    return {"city": [(city, city) for city in city_coords]}
+
+
+def _dataset_inputs(name):
+    return lambda variant, fixtures: [data_loader.content_hash(data_loader.dataset_path(name))]
+
+
+def _match_inputs(variant, fixtures):
+    import match_store
+
+    return [data_loader.content_hash(path) for path in match_store.sources()]
+
+
+def _weather_payload(city, fixtures):
+    """The payload the stub server answers for ``city`` with: its fixture, else the synthetic forecast."""
+    import weather_stub_server
+    from weather_client import city_coords
+
+    lat, lon = city_coords[city]
+    path = os.path.join(fixtures, weather_stub_server.fixture_name(lat, lon))
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    payload = json.dumps(weather_stub_server.synthetic_payload(lat, lon), sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _weather_inputs(variant, fixtures):
+    from weather_client import city_coords
+
+    cities = [variant["city"]] if "city" in variant else list(city_coords)
+    return [_weather_payload(city, fixtures) for city in cities]
+
+
+@dataclass(frozen=True)
+class Page:
+    name: str                    # the ``sections.render`` page key
+    script: str
+    title: str
+    registry: str = "SECTIONS"   # module attribute holding the page's sections
+    inputs: object = None        # inputs(widget presets, fixtures dir) -> hashes of the data a run reads
+    variants: object = None      # () -> {widget key: [(label, value), ...]}
+    preset: dict = field(default_factory=dict)  # widget values every run of the page starts from
+
+    def sections(self):
+        return getattr(importlib.import_module(self.script[:-len(".py")]), self.registry)
+
+
+PAGES = [
+    Page("ai_job", "Ai_job_streamlit.py", "AI Job Dataset Insights",
+         inputs=_dataset_inputs("ai_job"), variants=_ai_job_variants),
+    Page("cricket", "stream1.py", "IPL Cricket Analysis", inputs=_match_inputs, variants=_cricket_variants),
+    Page("flight", "flight_streamlit.py", "Flight Price Analysis",
+         inputs=_dataset_inputs("flight"), variants=_flight_variants),
+    Page("ecommerce", "Ecommerence_streamlit.py", "E-commerce Sales Analysis", inputs=_dataset_inputs("ecommerce")),
+    Page("weather", "wether.py", "Weather Dashboard", inputs=_weather_inputs, variants=_weather_variants),
+    Page("weather_compare", "wether.py", "Weather Dashboard: City Comparison", registry="COMPARE_SECTIONS",
+         inputs=_weather_inputs, preset={"weather_mode": "Compare cities"}),
+]
+PAGES_BY_NAME = {page.name: page for page in PAGES}
+
+
+# ------------------------ Tasks ------------------------
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-") or "x"
+
+
+def code_hash():
+    """Hash of every dashboard module: a code change re-renders everything."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(glob.glob(os.path.join(ROOT, "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def tasks(page, fixtures, code):
+    """``(page, section, variant labels, widget presets, output name, title, input hash)`` per output."""
+    sections = page.sections()
+    names = set()
+    owned = {key for section in sections for key in section.inputs}
+    variants = page.variants() if page.variants else {}
+    for section in sections:
+        keys = [key for key in variants if key in section.inputs or key not in owned]
+        for combination in itertools.product(*(variants[key] for key in keys)):
+            labels = {key: label for key, (label, _) in zip(keys, combination)}
+            values = {key: value for key, (_, value) in zip(keys, combination)}
+            name = section.id + "".join(f"--{_slug(label)}" for label in labels.values())
+            if name in names:  # distinct labels with the same slug
+                name += "-" + hashlib.blake2b(repr(labels).encode(), digest_size=3).hexdigest()
+            names.add(name)
+            digest = hashlib.blake2b(json.dumps(
+                [code, page.inputs(values, fixtures) if page.inputs else [], page.name, section.id,
+                 {**page.preset, **values}], sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+            title = section.title.format(**{key: str(label) for key, label in labels.items()})
+            yield page.name, section.id, labels, values, name, title, digest
+
+
+# ------------------------ Rendering ------------------------
+def _figure_json(fig):
+    if hasattr(fig, "to_plotly_json"):
+        return {"type": "plotly", "figure": json.loads(fig.to_json())}
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return {"type": "matplotlib", "png": base64.b64encode(buffer.getvalue()).decode()}
+
+
+def _script_json(value):
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def _figure_html(figure, i):
+    if figure["type"] == "plotly":
+        return (f'<div id="figure-{i}"></div><script>Plotly.newPlot("figure-{i}", '
+                f'{_script_json(figure["figure"]["data"])}, {_script_json(figure["figure"]["layout"])});</script>')
+    return f'<img alt="figure {i}" src="data:image/png;base64,{figure["png"]}">'
+
+
+def _page_html(report):
+    variant = "".join(f" · {html.escape(key)}: {html.escape(str(label))}" for key, label in report["variant"].items())
+    body = [f'<p><a href="../index.html">All reports</a> · {html.escape(report["page_title"])}{variant}</p>',
+            f'<h2>{html.escape(report["title"])}</h2>']
+    body += [f'<p class="note">{html.escape(note)}</p>' for note in report["notes"]]
+    body += [_figure_html(figure, i) for i, figure in enumerate(report["figures"])]
+    body += [_table_html(table) for table in report["tables"]]
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{html.escape(report["title"])}</title><script src="../plotly.min.js"></script>'
+            '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;font-size:13px}'
+            'td,th{border:1px solid #ddd;padding:2px 6px}.note{color:#555}</style></head><body>'
+            + "\n".join(body) + "</body></html>")
+
+
+def _table_html(frame):
+    """A ``to_json(orient="split")`` frame as an HTML table."""
+    head = "".join(f"<th>{html.escape(str(col))}</th>" for col in ["", *frame["columns"]])
+    rows = "".join("<tr>" + "".join(f"<td>{html.escape(str(value))}</td>" for value in [index, *row]) + "</tr>"
+                   for index, row in zip(frame["index"], frame["data"]))
+    return f"<table><tr>{head}</tr>{rows}</table>"
+
+
+def render(task, out, timeout=TIMEOUT):
+    """Run one section (with its widget presets) headlessly and write its HTML and JSON.
+
+    Returns ``(output name, error or None, seconds)``.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    import chart_reduce
+
+    page_name, section_id, labels, values, name, title, digest = task
+    page = PAGES_BY_NAME[page_name]
+    start = time.perf_counter()
+    figures = []
+    with chart_reduce.recording(figures.append):
+        app = AppTest.from_file(os.path.join(ROOT, page.script), default_timeout=timeout)
+        app.session_state[f"{page.name}_sections"] = [section_id]
+        for key, value in {**page.preset, **values}.items():
+            app.session_state[key] = value
+        app.run()
+    output = f"{page.name}/{name}"
+    if app.exception:
+        return output, "; ".join(exc.message for exc in app.exception), time.perf_counter() - start
+
+    report = {
+        "page": page.name,
+        "page_title": page.title,
+        "section": section_id,
+        "title": app.subheader[0].value if len(app.subheader) else title,
+        "variant": labels,
+        "input_hash": digest,
+        "notes": [element.value for kind in ("caption", "info", "warning", "error")
+                  for element in getattr(app, kind)]
+                 + [f"{metric.label}: {metric.value}" for metric in app.metric],
+        "figures": [_figure_json(fig) for fig in figures],
+        "tables": [json.loads(element.value.to_json(orient="split", date_format="iso", default_handler=str))
+                   for element in [*app.dataframe, *app.table]],
+    }
+    os.makedirs(os.path.join(out, page.name), exist_ok=True)
+    with open(os.path.join(out, output + ".json"), "w") as f:
+        json.dump(report, f)
+    with open(os.path.join(out, output + ".html"), "w", encoding="utf-8") as f:
+        f.write(_page_html(report))
+    return output, None, time.perf_counter() - start
+
+
+# ------------------------ Bundle ------------------------
+def load_manifest(out):
+    try:
+        with open(os.path.join(out, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out, manifest):
+    path = os.path.join(out, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def write_index(out, manifest):
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>Dashboard reports</title>'
+             '<style>body{font-family:sans-serif;margin:2em}</style></head><body><h1>Dashboard reports</h1>']
+    by_page = itertools.groupby(sorted(manifest.items(), key=lambda item: (item[1]["page_order"], item[0])),
+                                key=lambda item: item[1]["page_title"])
+    for page_title, entries in by_page:
+        parts.append(f"<h2>{html.escape(page_title)}</h2><ul>")
+        for output, entry in entries:
+            variant = "".join(f" · {html.escape(str(label))}" for label in entry["variant"].values())
+            parts.append(f'<li><a href="{html.escape(output)}.html">{html.escape(entry["title"])}</a>{variant}</li>')
+        parts.append("</ul>")
+    parts.append("</body></html>")
+    with open(os.path.join(out, "index.html"), "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+
+
+def _write_plotly_js(out):
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(out, "plotly.min.js")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+
+def export(out, pages=None, fixtures=None, workers=None, force=False, timeout=TIMEOUT):
+    """Render every section and variant of ``pages`` whose inputs changed; returns ``(rendered, skipped, failed)``."""
+    import weather_stub_server
+
+    fixtures = fixtures or weather_stub_server.FIXTURES_DIR
+    pages = [PAGES_BY_NAME[name] for name in pages] if pages else PAGES
+    os.makedirs(out, exist_ok=True)
+    _write_plotly_js(out)
+
+    # The weather page reads forecasts from a local stub (offline payloads) and
+    # keeps its history in a throwaway store; spawned workers inherit both.
+    server, url = weather_stub_server.start_in_thread(fixtures=fixtures)
+    store = tempfile.TemporaryDirectory(prefix="weather_store_")
+    os.environ["OPEN_METEO_URL"] = url
+    os.environ["WEATHER_STORE_DIR"] = store.name
+
+    manifest = load_manifest(out)
+    code = code_hash()
+    todo, current, skipped = [], {}, 0
+    for order, page in enumerate(PAGES):
+        if page not in pages:
+            current.update({output: entry for output, entry in manifest.items() if entry["page"] == page.name})
+            continue
+        for task in tasks(page, fixtures, code):
+            page_name, section_id, labels, _, name, title, digest = task
+            output = f"{page_name}/{name}"
+            current[output] = {"page": page_name, "page_title": page.title, "page_order": order,
+                               "title": title, "variant": labels, "input_hash": digest}
+            unchanged = (manifest.get(output, {}).get("input_hash") == digest
+                         and os.path.exists(os.path.join(out, output + ".html")))
+            if force or not unchanged:
+                todo.append(task)
+            else:
+                skipped += 1
+
+    rendered, failed = [], []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(render, task, out, timeout) for task in todo]
+            for task, future in zip(todo, futures):
+                try:
+                    output, error, seconds = future.result()
+                except Exception as exc:  # e.g. AppTest's RuntimeError when a run exceeds --timeout
+                    output, error = f"{task[0]}/{task[4]}", f"{type(exc).__name__}: {exc}"
+                if error:
+                    failed.append((output, error))
+                    # Keep the last good render (under its old hash, so the next run retries).
+                    if output in manifest:
+                        current[output] = manifest[output]
+                    else:
+                        current.pop(output)
+                    print(f"failed   {output}: {error}")
+                else:
+                    rendered.append(output)
+                    print(f"rendered {output} ({seconds:.1f}s)")
+                    with open(os.path.join(out, output + ".json")) as f:
+                        current[output]["title"] = json.load(f)["title"]
+    finally:
+        server.shutdown()
+        store.cleanup()
+
+    # Outputs of sections or variants that no longer exist.
+    for output in manifest.keys() - current.keys():
+        for ext in (".html", ".json"):
+            path = os.path.join(out, output + ext)
+            if os.path.exists(path):
+                os.remove(path)
+    save_manifest(out, current)
+    write_index(out, current)
+    return rendered, skipped, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="reports", help="bundle directory")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES_BY_NAME), help="pages to export (default: all)")
+    parser.add_argument("--fixtures", help="Open-Meteo payloads the weather stub serves where present, "
+                                                 "else synthetic forecasts (default: fixtures/open_meteo)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="re-render outputs whose inputs are unchanged")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds allowed per section run")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rendered, skipped, failed = export(args.out, args.pages, args.fixtures, args.workers, args.force, args.timeout)
+    print(f"{len(rendered)} rendered, {skipped} unchanged, {len(failed)} failed "
+          f"in {time.perf_counter() - start:.1f}s -> {os.path.join(args.out, 'index.html')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    # Run from the importable module: AppTest replaces ``__main__`` in the workers,
+    # so tasks must reference ``export_reports.render`` by name.
+    from export_reports import main
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Finished Plotly figure specs, reused across reruns and sessions.
+
+Every rerun rebuilds each figure (the ``px`` call, ``update_layout``,
+``update_traces``) and serializes it to JSON, although for the same data and
+widget values the spec comes out identical. ``plotly_chart(build)`` stores
+the figure spec (``fig.to_dict()``) under
+
+* the page's ``version``: the content hash of its dataset (``data_loader.version``,
+  or ``frame_version`` of a fetched frame) plus the values of its page-wide
+  widgets (filters, seasons, city), passed to ``sections.render``
+* the section id and the values of the section's own ``inputs`` widgets
+* the sidebar chart switches (``SWITCHES``) and the chart's position in the section
+
+and on a hit hands the stored spec dict to ``st.plotly_chart`` without
+calling ``build``. Charts drawn outside ``sections.render``,
+or on a page that passes no ``version``, are built every time.
+
+Specs are evicted least recently used first once they take more than
+``DASHBOARD_FIGURE_CACHE_BYTES`` (0 turns the cache off). With
+``DASHBOARD_FIGURE_CACHE_DIR`` set they are also written there and survive
+a server restart. Hits, misses and bytes served from the cache are counted
+in ``stats`` (process-wide) and in each perf run's counters::
+
+    def experience_section(df, results, rows):
+        def figure():
+            perf.phase("figure")
+            fig = px.bar(results["experience"], ...)
+            fig.update_layout(...)
+            return fig
+
+        figure_cache.plotly_chart(figure)
+
+This is why the pages (and ``chart_reduce``) import ``plotly.express`` inside
+the functions that build figures rather than at the top: a rerun served from
+the cache never calls them, and the import takes ~0.1 s. ``warm_start.py``
+imports it ahead of the first session.
+
+Compare reruns with and without it by running ``benchmarks.run_dashboards``
+with ``DASHBOARD_FIGURE_CACHE_BYTES=0``.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+import plotly.io
+import streamlit as st
+
+import chart_reduce
+import perf
+
+BUDGET_BYTES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_BYTES", 64 << 20))
+CACHE_DIR = os.environ.get("DASHBOARD_FIGURE_CACHE_DIR")
+SWITCHES = ("reduce_payloads", "approximate_top_n")  # sidebar checkboxes that change what figures show
+
+_lock = threading.Lock()
+_specs = OrderedDict()  # key digest -> (figure spec dict, size of its JSON in bytes)
+_bytes = 0
+_local = threading.local()  # [key prefix, charts drawn so far] of the section being drawn
+stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "bytes_saved": 0}
+
+
+# ------------------------ Keys ------------------------
+@contextmanager
+def scope(page, section, version, inputs=()):
+    """Key the charts drawn inside the block by ``version``, ``section`` and the ``inputs`` widget values."""
+    if version is None or BUDGET_BYTES <= 0:
+        yield
+        return
+    widgets = [st.session_state.get(key) for key in (*SWITCHES, *inputs)]
+    _local.scope = [repr((page, section, version, widgets)), 0]
+    try:
+        yield
+    finally:
+        _local.scope = None
+
+
+def _next_key():
+    current = getattr(_local, "scope", None)
+    if current is None:
+        return None
+    current[1] += 1
+    return hashlib.blake2b(f"{current[0]}#{current[1]}".encode(), digest_size=16).hexdigest()
+
+
+def frame_version(df):
+    """Content hash of ``df``: the ``version`` of a page whose data is not a ``data_loader`` dataset."""
+    return hashlib.blake2b(pd.util.hash_pandas_object(df).to_numpy().tobytes(), digest_size=16).hexdigest()
+
+
+# ------------------------ Storage ------------------------
+def _disk_path(key):
+    return os.path.join(CACHE_DIR, key + ".json")
+
+
+def _get(key):
+    """``(spec, nbytes)`` stored under ``key``, or None."""
+    with _lock:
+        entry = _specs.get(key)
+        if entry is not None:
+            _specs.move_to_end(key)
+            stats["hits"] += 1
+            return entry
+    if CACHE_DIR:
+        try:
+            with open(_disk_path(key), encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        entry = (json.loads(text), len(text))
+        _put(key, *entry)
+        with _lock:
+            stats["hits"] += 1
+            stats["disk_hits"] += 1
+        return entry
+    return None
+
+
+def _put(key, spec, nbytes, text=None):
+    """Store ``spec``; ``text``, its JSON, is also written to ``CACHE_DIR`` if set."""
+    global _bytes
+    with _lock:
+        if key not in _specs:
+            _specs[key] = (spec, nbytes)
+            _bytes += nbytes
+        while _bytes > BUDGET_BYTES and len(_specs) > 1:
+            _, (_, evicted) = _specs.popitem(last=False)
+            _bytes -= evicted
+            stats["evictions"] += 1
+    if text is not None and CACHE_DIR:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = _disk_path(key) + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, _disk_path(key))
+        _prune_disk()
+
+
+def _prune_disk():
+    """Delete the oldest spec files once the directory holds more than ``BUDGET_BYTES``."""
+    files = []
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                info = entry.stat()
+                files.append((info.st_mtime, info.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= BUDGET_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+# ------------------------ Drawing ------------------------
+def plotly_chart(build, *args):
+    """Draw ``build(*args)``, a Plotly figure, from the cached spec when this chart was drawn before.
+
+    ``build`` marks its own perf phases (usually "figure"); turning the figure
+    into its spec and ``st.plotly_chart`` are the "serialize" phase, as in
+    ``chart_reduce.plotly_chart``.
+    """
+    key = _next_key()
+    if key is None or chart_reduce.recording_figures():
+        # Not cacheable here, or a report export collecting the figures themselves.
+        chart_reduce.plotly_chart(build(*args))
+        return
+
+    entry = _get(key)
+    if entry is not None:
+        spec, nbytes = entry
+        with _lock:
+            stats["bytes_saved"] += nbytes
+        perf.count("figure_cache_hits")
+        perf.count("figure_cache_bytes_saved", nbytes)
+        chart_reduce.report_payload(nbytes)
+    else:
+        fig = build(*args)
+        perf.phase("serialize")
+        start = time.perf_counter()
+        spec = fig.to_dict()
+        text = plotly.io.to_json(spec, validate=False)
+        elapsed = time.perf_counter() - start
+        _put(key, spec, len(text), text)
+        with _lock:
+            stats["misses"] += 1
+        perf.count("figure_cache_misses")
+        chart_reduce.report_payload(len(text), elapsed)
+    perf.phase("serialize")
+    st.plotly_chart(spec, use_container_width=True)
+    perf.phase("compute")
+
+
+def cache_info():
+    with _lock:
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "hit_rate": stats["hits"] / lookups if lookups else None,
+            "specs": len(_specs),
+            "bytes": _bytes,
+            "budget_bytes": BUDGET_BYTES,
+        }
+
+
+def clear_cache():
+    global _bytes
+    with _lock:
+        _specs.clear()
+        _bytes = 0
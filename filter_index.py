@@ -0,0 +1,133 @@
+"""Precomputed row-filter index for slicing a frame interactively.
+
+Built once per loaded frame (via ``data_loader.load_artifact``):
+
+* a packed bitmap (one bit per row) for every value of each categorical
+  column; selecting several values of a column ORs their bitmaps
+* a sorted copy of each range column with the permutation back to row
+  positions, so ``lo <= x <= hi`` is two binary searches and one slice
+
+Predicates are combined on the packed bitmaps (n / 8 bytes each), and only the
+final selection is unpacked into the boolean row mask that ``AggEngine.run``
+and ``SkillIndex`` take as ``rows``.
+
+    index = FilterIndex.build(df, categories=["company_size"], ranges=["salary_usd"])
+    rows = index.select({"company_size": ["L"]}, {"salary_usd": (50_000, 150_000)})
+    engine.run(AGGREGATIONS, rows=rows)
+"""
+import numpy as np
+import pandas as pd
+
+
+def _as_sortable(values):
+    """Float or int64 view of a numeric/datetime column, NaN/NaT as missing."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        missing = np.isnat(values)
+        return values.astype("datetime64[ns]").astype(np.int64), missing
+    values = values.astype(float)
+    return values, np.isnan(values)
+
+
+def _scalar(value, dtype):
+    if np.issubdtype(dtype, np.datetime64):
+        return pd.Timestamp(value).value
+    return value
+
+
+class FilterIndex:
+    def __init__(self, n, bitmaps, ranges):
+        self.n = n
+        self.bitmaps = bitmaps  # column -> (labels, uint8 array of shape (len(labels), ceil(n / 8)))
+        self.ranges = ranges    # column -> (sorted values, row positions in that order, source dtype)
+
+    @classmethod
+    def build(cls, df, categories=(), ranges=()):
+        n = len(df)
+        bitmaps = {}
+        for col in categories:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+            else:
+                codes, labels = pd.factorize(values, sort=True)
+            # Rows grouped by code: each value's rows are one contiguous slice.
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            packed = np.empty((len(labels), (n + 7) // 8), dtype=np.uint8)
+            for i in range(len(labels)):
+                mask = np.zeros(n, dtype=bool)
+                mask[order[bounds[i]:bounds[i + 1]]] = True
+                packed[i] = np.packbits(mask)
+            bitmaps[col] = (pd.Index(labels), packed)
+
+        sorted_ranges = {}
+        for col in ranges:
+            raw = df[col].to_numpy()
+            values, missing = _as_sortable(raw)
+            positions = np.flatnonzero(~missing)
+            positions = positions[np.argsort(values[positions], kind="stable")]
+            sorted_ranges[col] = (values[positions], positions, raw.dtype)
+        return cls(n, bitmaps, sorted_ranges)
+
+    # ------------------------ Metadata ------------------------
+    def labels(self, col):
+        return list(self.bitmaps[col][0])
+
+    def bounds(self, col):
+        """``(min, max)`` of a range column, in the column's own type."""
+        values, _, dtype = self.ranges[col]
+        if not len(values):
+            return None, None
+        lo, hi = values[0], values[-1]
+        if np.issubdtype(dtype, np.datetime64):
+            return pd.Timestamp(lo), pd.Timestamp(hi)
+        return lo.item(), hi.item()
+
+    # ------------------------ Predicates ------------------------
+    def values_bitmap(self, col, values):
+        """Packed bitmap of rows whose ``col`` is any of ``values``."""
+        labels, packed = self.bitmaps[col]
+        ids = labels.get_indexer(list(values))
+        ids = ids[ids >= 0]
+        if not len(ids):
+            return np.zeros(packed.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(packed[ids], axis=0)
+
+    def range_bitmap(self, col, lo=None, hi=None):
+        """Packed bitmap of rows with ``lo <= col <= hi`` (missing values excluded)."""
+        values, positions, dtype = self.ranges[col]
+        start = 0 if lo is None else np.searchsorted(values, _scalar(lo, dtype), side="left")
+        stop = len(values) if hi is None else np.searchsorted(values, _scalar(hi, dtype), side="right")
+        mask = np.zeros(self.n, dtype=bool)
+        mask[positions[start:stop]] = True
+        return np.packbits(mask)
+
+    def select(self, values=None, ranges=None, combine="and"):
+        """Boolean row mask of the rows matching the given predicates.
+
+        ``values`` maps categorical columns to the labels to keep (an empty
+        list means no filter on that column); ``ranges`` maps range columns to
+        ``(lo, hi)``, either end None for unbounded. Predicates are ANDed, or
+        ORed with ``combine="or"``. Returns None when nothing is filtered.
+        """
+        bitmaps = [self.values_bitmap(col, keep) for col, keep in (values or {}).items() if len(keep)]
+        for col, (lo, hi) in (ranges or {}).items():
+            if self._covers(col, lo, hi):
+                continue
+            bitmaps.append(self.range_bitmap(col, lo, hi))
+        if not bitmaps:
+            return None
+        reduce = np.bitwise_and if combine == "and" else np.bitwise_or
+        return np.unpackbits(reduce.reduce(bitmaps), count=self.n).astype(bool)
+
+    def _covers(self, col, lo, hi):
+        """True if ``[lo, hi]`` spans every row, so the predicate is a no-op."""
+        values, positions, dtype = self.ranges[col]
+        if len(positions) != self.n:
+            return False  # a range still drops the missing values
+        return ((lo is None or _scalar(lo, dtype) <= values[0])
+                and (hi is None or _scalar(hi, dtype) >= values[-1]))
+
+    def nbytes(self):
+        return (sum(packed.nbytes for _, packed in self.bitmaps.values())
+                + sum(values.nbytes + positions.nbytes for values, positions, _ in self.ranges.values()))
@@ -1,88 +1,251 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
-# Page config
-st.set_page_config(page_title='Flight Data Insights', layout='wide')
-st.title("✈️ Flight Data Insights Dashboard")
+import calendar_dim
+import compute_worker
+import data_loader
+import figure_cache
+import perf
+import sections
+import sketches
+from agg_engine import Agg, AggEngine
+from data_loader import load_artifact, load_dataset
+from route_index import RouteIndex
+from sections import Section
 
-# Load dataset
-df = pd.read_csv("Flight_Price_Dataset_of_Bangladesh_Cleaned.csv")
+# Chart aggregations, answered together by the shared aggregation engine
+AGGREGATIONS = {
+    "booking_source": Agg(by=("Booking Source",), sort="desc"),
+    "class": Agg(by=("Class",), sort="desc"),
+    "airline": Agg(by=("Airline",), sort="desc"),
+}
+
+
+def aggregate(df):
+    return compute_worker.run("flight", AGGREGATIONS, AggEngine)
+
+
+# Route and airport views are served from the origin x destination index
+def build_route_index(df):
+    return RouteIndex.build(df, dims=("Airline", "Class", "Month"))
+
+
+def route_index():
+    return load_artifact("flight", "route_index", build_route_index)
 
-# Convert datetime columns
-df['Departure Date & Time'] = pd.to_datetime(df['Departure Date & Time'])
-df['Arrival Date & Time'] = pd.to_datetime(df['Arrival Date & Time'])
 
 # Dataset Preview
-st.subheader("📄 Dataset Preview")
-st.dataframe(df.head(10))
+def preview_section(df, results):
+    st.dataframe(df.head(10))
+
 
 # Booking Source
-st.subheader("🧾 Most Booked Sources")
-booking_source = df['Booking Source'].value_counts().reset_index()
-booking_source.columns = ['Source', 'Count']
-fig1 = px.bar(booking_source, x='Source', y='Count', title='Booking Sources', color='Count')
-st.plotly_chart(fig1, use_container_width=True)
+def booking_source_section(df, results):
+    booking_source = results["booking_source"].set_axis(['Source', 'Count'], axis=1)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig1 = px.bar(booking_source, x='Source', y='Count', title='Booking Sources', color='Count')
+        return fig1
+
+    figure_cache.plotly_chart(figure)
+
 
 # Class Usage
-st.subheader("💺 Most Frequently Used Travel Class")
-class_count = df['Class'].value_counts().reset_index()
-class_count.columns = ['Class', 'Count']
-fig2 = px.bar(class_count, x='Class', y='Count', title='Class Usage by Passengers', color='Count')
-st.plotly_chart(fig2, use_container_width=True)
+def class_section(df, results):
+    class_count = results["class"].set_axis(['Class', 'Count'], axis=1)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig2 = px.bar(class_count, x='Class', y='Count', title='Class Usage by Passengers', color='Count')
+        return fig2
+
+    figure_cache.plotly_chart(figure)
+
 
 # Airline Usage
-st.subheader("🛫 Flights per Airline")
-airline_count = df['Airline'].value_counts().reset_index()
-airline_count.columns = ['Airline', 'Count']
-fig3 = px.bar(airline_count, x='Airline', y='Count', title='Flights by Airline', color='Count')
-st.plotly_chart(fig3, use_container_width=True)
+def airline_section(df, results):
+    airline_count = results["airline"].set_axis(['Airline', 'Count'], axis=1)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig3 = px.bar(airline_count, x='Airline', y='Count', title='Flights by Airline', color='Count')
+        return fig3
+
+    figure_cache.plotly_chart(figure)
+
 
 # Monthly Flights
-st.subheader("📅 Flights by Month")
-df['Month'] = df['Departure Date & Time'].dt.month_name()
-monthly_flights = df['Month'].value_counts().reindex([
-    'January','February','March','April','May','June',
-    'July','August','September','October','November','December'
-])
-monthly_df = pd.DataFrame({
-    'Month': monthly_flights.index,
-    'Flights': monthly_flights.values
-})
-fig4 = px.line(monthly_df, x='Month', y='Flights', markers=True, title='Number of Flights per Month')
-st.plotly_chart(fig4, use_container_width=True)
+def monthly_section(df, results):
+    def figure():
+        import plotly.express as px
+        departures = calendar_dim.load("flight", 'Departure Date & Time')
+        monthly_df = departures.counts(("month",), empty=True, name='Flights').rename(columns={'month': 'Month'})
+        perf.phase("figure")
+        fig4 = px.line(monthly_df, x='Month', y='Flights', markers=True, title='Number of Flights per Month')
+        return fig4
+
+    figure_cache.plotly_chart(figure)
+
 
 # Heatmap: Arrival Hour vs Day
-st.subheader("⏱️ Flight Arrival Heatmap (Hour vs Day)")
-df['Arrival_Hour'] = df['Arrival Date & Time'].dt.hour
-df['Arrival_Day'] = df['Arrival Date & Time'].dt.day_name()
-heatmap_data = df.groupby(['Arrival_Day', 'Arrival_Hour']).size().reset_index(name='Flight_Count')
-fig5 = px.density_heatmap(
-    heatmap_data,
-    x='Arrival_Hour',
-    y='Arrival_Day',
-    z='Flight_Count',
-    color_continuous_scale='YlGnBu',
-    title='Flight Arrivals by Hour and Day'
-)
-st.plotly_chart(fig5, use_container_width=True)
+def arrivals_section(df, results):
+    def figure():
+        import plotly.express as px
+        arrivals = calendar_dim.load("flight", 'Arrival Date & Time')
+        heatmap_data = arrivals.counts(("weekday", "hour"), name='Flight_Count').rename(
+            columns={'weekday': 'Arrival_Day', 'hour': 'Arrival_Hour'})
+        perf.phase("figure")
+        fig5 = px.density_heatmap(
+            heatmap_data,
+            x='Arrival_Hour',
+            y='Arrival_Day',
+            z='Flight_Count',
+            color_continuous_scale='YlGnBu',
+            title='Flight Arrivals by Hour and Day'
+        )
+        return fig5
+
+    figure_cache.plotly_chart(figure)
+
+
+# Top 10 Busiest Routes and Airports from sketches (the sidebar "approximate" switch)
+def build_sketches(df):
+    routes = sketches.TopK()
+    for start in range(0, len(df), sketches.CHUNK_ROWS):
+        chunk = df.iloc[start:start + sketches.CHUNK_ROWS]
+        counts = chunk.groupby(['Source Name', 'Destination Name'], observed=True).size()
+        routes.add_counts(counts.set_axis(counts.index.map(' -> '.join)))
+    airports = sketches.build(df['Source Name'])
+    airports.merge(sketches.build(df['Destination Name']))
+    return {"routes": routes, "airports": airports}
+
+
+def approximate_top(name, label, count):
+    """Top 10 ``label``/``count`` rows from a sketch, captioned with the error bound."""
+    sketch = load_artifact("flight", "sketches", build_sketches)[name]
+    top = sketch.top(10, label).rename(columns={'count': count})
+    st.caption(sketch.bounds(top))
+    return top
+
 
 # Top 10 Busiest Routes
-st.subheader("🔁 Top 10 Busiest Routes")
-df['Most_routes'] = df['Source Name'] + ' -> ' + df['Destination Name']
-routes = df['Most_routes'].value_counts().head(10).reset_index()
-routes.columns = ['Route', 'Count']
-fig6 = px.bar(routes, x='Count', y='Route', orientation='h', title='Top 10 Most Frequent Routes', color='Count')
-st.plotly_chart(fig6, use_container_width=True)
+def routes_section(df, results):
+    if sketches.enabled():
+        routes = approximate_top("routes", 'Route', 'Count')
+    else:
+        top_routes = route_index().top_routes(10)
+        routes = pd.DataFrame({
+            'Route': top_routes['Source Name'] + ' -> ' + top_routes['Destination Name'],
+            'Count': top_routes['count']
+        })
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig6 = px.bar(routes, x='Count', y='Route', orientation='h', title='Top 10 Most Frequent Routes', color='Count')
+        return fig6
+
+    figure_cache.plotly_chart(figure)
+
 
 # Busiest Airports (Arrivals + Departures)
-st.subheader("🛬 Top 10 Busiest Airports (Arrivals + Departures)")
-all_airports = pd.concat([
-    df['Source Name'].rename('Airport'),
-    df['Destination Name'].rename('Airport')
-])
-airport_traffic = all_airports.value_counts().head(10).reset_index()
-airport_traffic.columns = ['Airport', 'Total Flights']
-fig7 = px.bar(airport_traffic, x='Total Flights', y='Airport', orientation='h',
-              title='Top 10 Busiest Airports', color='Total Flights')
-st.plotly_chart(fig7, use_container_width=True)
+def airports_section(df, results):
+    if sketches.enabled():
+        airport_traffic = approximate_top("airports", 'Airport', 'Total Flights')
+    else:
+        airport_traffic = route_index().traffic().head(10).reset_index()
+        airport_traffic.columns = ['Airport', 'Total Flights']
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig7 = px.bar(airport_traffic, x='Total Flights', y='Airport', orientation='h',
+                      title='Top 10 Busiest Airports', color='Total Flights')
+        return fig7
+
+    figure_cache.plotly_chart(figure)
+
+
+# Routes from a selected airport
+def airport_routes_section(df, results):
+    index = route_index()
+    departures = index.airports[index.counts.sum(axis=1) > 0]
+    airport = st.selectbox("Departure airport", departures, key="route_airport")
+    if airport is None:
+        st.info("No routes to show.")
+        return
+    split = st.radio("Split by", ["Class", "Airline"], horizontal=True, key="route_split")
+
+    def figure():
+        import plotly.express as px
+        destinations = index.destinations(airport, split).rename(columns={'count': 'Flights'})
+        perf.phase("figure")
+        fig8 = px.bar(destinations, x='Flights', y='Destination Name', color=split, orientation='h',
+                      title=f'Flights from {airport}')
+        fig8.update_yaxes(categoryorder='total ascending')
+        return fig8
+
+    figure_cache.plotly_chart(figure)
+
+
+# Airline share of a selected route
+def route_airlines_section(df, results):
+    index = route_index()
+    top_routes = index.top_routes(50)
+    labels = top_routes['Source Name'] + ' -> ' + top_routes['Destination Name']
+    picked = st.selectbox("Route (50 busiest)", range(len(top_routes)), format_func=lambda i: labels[i],
+                          key="share_route")
+    if picked is None:
+        st.info("No routes to show.")
+        return
+
+    def figure():
+        import plotly.express as px
+        source, destination = top_routes.loc[picked, ['Source Name', 'Destination Name']]
+        share = index.breakdown(source, destination, "Airline").rename_axis('Airline').reset_index(name='Flights')
+        perf.phase("figure")
+        fig9 = px.pie(share, names='Airline', values='Flights', title=f'Airline Share: {labels[picked]}')
+        return fig9
+
+    figure_cache.plotly_chart(figure)
+
+
+SECTIONS = [
+    Section("preview", "📄 Dataset Preview", preview_section),
+    Section("booking_source", "🧾 Most Booked Sources", booking_source_section),
+    Section("class", "💺 Most Frequently Used Travel Class", class_section),
+    Section("airline", "🛫 Flights per Airline", airline_section),
+    Section("monthly", "📅 Flights by Month", monthly_section),
+    Section("arrivals", "⏱️ Flight Arrival Heatmap (Hour vs Day)", arrivals_section),
+    Section("routes", "🔁 Top 10 Busiest Routes", routes_section),
+    Section("airports", "🛬 Top 10 Busiest Airports (Arrivals + Departures)", airports_section),
+    Section("airport_routes", "🗺️ Routes from an Airport", airport_routes_section,
+            inputs=("route_airport", "route_split")),
+    Section("route_airlines", "🏷️ Airline Share per Route", route_airlines_section, inputs=("share_route",)),
+]
+
+
+def main():
+    # Page config
+    st.set_page_config(page_title='Flight Data Insights', layout='wide')
+    st.title("✈️ Flight Data Insights Dashboard")
+
+    sketches.controls()
+    perf.start("flight")
+
+    # Load dataset (datetime columns and Month/Arrival_Hour/Arrival_Day come from the loader)
+    perf.section("load", phase="load")
+    df = load_dataset("flight")
+    perf.section("aggregations")
+    results = load_artifact("flight", "aggregations", aggregate)
+
+    sections.render("flight", SECTIONS, df, results, version=data_loader.version("flight"))
+    perf.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""Incremental append ingestion for Ai_job.csv with persisted running aggregates.
+
+New postings are appended to Ai_job.csv daily. ``update`` parses only the
+bytes appended since the last run and folds them into the aggregates kept in
+``.state/ai_job_ingest.json``, together with mergeable top-N sketches of the
+``SKETCHES`` columns (``sketches.TopK``) that the dashboard's approximate mode
+serves; ``rebuild`` recomputes them from scratch and
+``verify`` checks the incremental state against a plain-pandas recompute.
+Labels are normalized through the dataset's ``schema`` first, so they match
+the categories of the loaded frame, and groups are kept in first-appearance
+order; the dashboard serves its unfiltered charts from ``current_state``.
+
+    python ingest.py update
+    python ingest.py rebuild
+    python ingest.py verify
+"""
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+
+import pandas as pd
+
+import data_loader
+import schema
+from sketches import TopK
+from skill_index import SkillIndex
+
+STATE_VERSION = 3
+CHUNK_ROWS = 200_000
+HEAD_BYTES = 64 * 1024
+KEY_SEP = "\x1f"
+
+# Running aggregates: name -> (group keys, value column or None for counts)
+AGGREGATES = {
+    "title_experience": (["job_title", "experience_level"], None),
+    "company_location": (["company_location"], None),
+    "company_size": (["company_size"], None),
+    "posting_month": (["posting_month_key"], None),
+    "remote_ratio": (["company_name"], "remote_ratio"),
+    "diff_days": (["company_name"], "diff_days"),
+}
+
+# Top-N sketches: name -> column. A name shared with a count aggregate is checked against it by ``verify``.
+SKETCHES = {
+    "company_location": "company_location",
+}
+
+
+def state_path():
+    return os.path.join(data_loader.DATA_DIR, ".state", "ai_job_ingest.json")
+
+
+def _head_hash(path, length):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(min(length, HEAD_BYTES)), digest_size=16).hexdigest()
+
+
+def _complete_length(path):
+    """Byte length of the file up to and including its last newline.
+
+    A trailing line without a newline may still be being written, so it is
+    left for the next run.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            step = min(pos, 64 * 1024)
+            f.seek(pos - step)
+            block = f.read(step)
+            nl = block.rfind(b"\n")
+            if nl >= 0:
+                return pos - step + nl + 1
+            pos -= step
+    return 0
+
+
+def _read_header(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    with open(path, "rb") as f:
+        header_bytes = len(f.readline())
+    return header, header_bytes
+
+
+class _RangeReader(io.RawIOBase):
+    """Read-only view of ``path`` limited to the byte range [start, end)."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._remaining)
+        data = self._file.read(n)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _chunks(path, start, end, header):
+    if end <= start:
+        return
+    with io.BufferedReader(_RangeReader(path, start, end)) as raw:
+        yield from pd.read_csv(raw, header=None, names=header, chunksize=CHUNK_ROWS)
+
+
+# ------------------------ Aggregation ------------------------
+def empty_aggregates():
+    return {name: {} for name in [*AGGREGATES, "skills"]}
+
+
+def empty_sketches():
+    return {name: TopK() for name in SKETCHES}
+
+
+def _prepare(chunk):
+    schema.apply(chunk, data_loader.DATASETS["ai_job"]["schema"])
+    posted = pd.to_datetime(chunk['posting_date'], errors='coerce')
+    deadline = pd.to_datetime(chunk['application_deadline'], errors='coerce')
+    return chunk.assign(
+        posting_month_key=posted.dt.strftime("%Y-%m"),
+        diff_days=(deadline - posted).dt.days,
+    )
+
+
+def _key(key):
+    return KEY_SEP.join(map(str, key if isinstance(key, tuple) else (key,)))
+
+
+def _fold(aggregates, sketches, chunk):
+    chunk = _prepare(chunk)
+    for name, col in SKETCHES.items():
+        sketches[name].add(chunk[col])
+    for name, (keys, value) in AGGREGATES.items():
+        target = aggregates[name]
+        if value is None:
+            grouped = chunk.groupby(keys, sort=False, observed=True).size()
+            for key, count in grouped.items():
+                key = _key(key)
+                target[key] = target.get(key, 0) + int(count)
+        else:
+            grouped = chunk.groupby(keys, sort=False, observed=True)[value].agg(["sum", "count"])
+            for key, (total, count) in grouped.iterrows():
+                key = _key(key)
+                total_so_far, count_so_far = target.get(key, (0.0, 0))
+                target[key] = (total_so_far + float(total), count_so_far + int(count))
+
+    skills = SkillIndex.build(chunk['required_skills'])
+    for skill, count in zip(skills.vocab, skills.counts()):
+        aggregates["skills"][skill] = aggregates["skills"].get(skill, 0) + int(count)
+
+
+def _job_id_key(job_id):
+    # "AI00009" < "AI00010" < "AI100000": compare by length first
+    return (len(job_id), job_id)
+
+
+def _after(ids, high_water):
+    """Mask of job ids ordered after ``high_water``."""
+    lengths = ids.str.len()
+    return (lengths > len(high_water)) | ((lengths == len(high_water)) & (ids > high_water))
+
+
+def _max_job_id(ids):
+    lengths = ids.str.len()
+    return ids[lengths == lengths.max()].max()
+
+
+def _fold_range(aggregates, sketches, path, start, end, header, skip_through=None):
+    """Fold rows in [start, end); returns the rows folded and the highest job id seen.
+
+    Rows whose job id is at or below ``skip_through`` (the high-water mark of
+    earlier runs, the same for every chunk) are skipped; a full rebuild
+    passes None and folds every row, in whatever order the file has them.
+    """
+    rows, high_water = 0, skip_through
+    for chunk in _chunks(path, start, end, header):
+        ids = chunk['job_id'].astype(str)
+        if skip_through is not None:
+            keep = _after(ids, skip_through).to_numpy()
+            chunk, ids = chunk[keep].copy(), ids[keep]  # _prepare types its columns in place
+        if len(chunk):
+            _fold(aggregates, sketches, chunk)
+            chunk_max = _max_job_id(ids)
+            if high_water is None or _job_id_key(chunk_max) > _job_id_key(high_water):
+                high_water = chunk_max
+        rows += len(chunk)
+    return rows, high_water
+
+
+# ------------------------ State ------------------------
+def load_state():
+    try:
+        with open(state_path()) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(state):
+    path = state_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def rebuild(path=None, end=None):
+    """Recompute the aggregates over the whole file (or its first ``end`` bytes)."""
+    path = path or data_loader.dataset_path("ai_job")
+    header, header_bytes = _read_header(path)
+    end = _complete_length(path) if end is None else end
+    aggregates, sketches = empty_aggregates(), empty_sketches()
+    rows, high_water = _fold_range(aggregates, sketches, path, header_bytes, end, header)
+    return {
+        "version": STATE_VERSION,
+        "header": header,
+        "offset": end,
+        "head_hash": _head_hash(path, end),
+        "rows": rows,
+        "high_water_job_id": high_water,
+        "aggregates": aggregates,
+        "sketches": {name: sketch.to_dict() for name, sketch in sketches.items()},
+    }
+
+
+def update(path=None):
+    """Fold rows appended since the last run into the saved state.
+
+    Falls back to a full rebuild when there is no state, or when the file was
+    truncated or rewritten rather than appended to.
+    """
+    path = path or data_loader.dataset_path("ai_job")
+    state = load_state()
+    header, _ = _read_header(path)
+    size = os.path.getsize(path)
+    if (state is None or state["header"] != header or size < state["offset"]
+            or _head_hash(path, state["offset"]) != state["head_hash"]):
+        state = rebuild(path)
+        save_state(state)
+        return state, "rebuilt"
+
+    end = _complete_length(path)
+    sketches = {name: TopK.from_dict(data) for name, data in state["sketches"].items()}
+    rows, high_water = _fold_range(
+        state["aggregates"], sketches, path, state["offset"], end, header, state["high_water_job_id"])
+    state["sketches"] = {name: sketch.to_dict() for name, sketch in sketches.items()}
+    state["rows"] += rows
+    state["high_water_job_id"] = high_water
+    if end != state["offset"]:
+        state["offset"] = end
+        state["head_hash"] = _head_hash(path, end)
+    save_state(state)
+    return state, f"appended {rows} rows"
+
+
+def _close(a, b):
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def recompute(path=None, end=None):
+    """The exact aggregates of the file's first ``end`` bytes, with plain pandas.
+
+    Independent of the chunked fold: one ``read_csv``, one groupby per
+    aggregate and a split/explode of the skills. Returns ``(rows, aggregates)``.
+    """
+    path = path or data_loader.dataset_path("ai_job")
+    end = _complete_length(path) if end is None else end
+    with io.BufferedReader(_RangeReader(path, 0, end)) as raw:
+        df = pd.read_csv(raw)
+    schema.apply(df, data_loader.DATASETS["ai_job"]["schema"])
+    posted = pd.to_datetime(df['posting_date'], errors='coerce')
+    df['posting_month_key'] = posted.dt.strftime("%Y-%m")
+    df['diff_days'] = (pd.to_datetime(df['application_deadline'], errors='coerce') - posted).dt.days
+    aggregates = {}
+    for name, (keys, value) in AGGREGATES.items():
+        grouped = df.groupby(keys, observed=True)
+        if value is None:
+            aggregates[name] = {_key(key): int(count) for key, count in grouped.size().items()}
+        else:
+            totals = grouped[value].agg(["sum", "count"])
+            aggregates[name] = {_key(key): (float(total), int(count)) for key, (total, count) in totals.iterrows()}
+    skills = df['required_skills'].dropna().astype(str).str.split(",").explode().str.strip()
+    aggregates["skills"] = {skill: int(count) for skill, count in skills[skills != ""].value_counts().items()}
+    return len(df), aggregates
+
+
+def verify(path=None):
+    """Compare the saved incremental state with ``recompute``.
+
+    Returns a list of ``(aggregate, key)`` pairs that differ. Sketches are
+    approximate (and depend on how the feed was chunked), so instead of being
+    compared they are checked against the exact counts: every reported count
+    must bound the true one, ``count - error <= true <= count``.
+    """
+    state = load_state()
+    if state is None:
+        raise SystemExit("no ingest state; run `python ingest.py update` first")
+    # Recompute over exactly the bytes the state has consumed so far.
+    rows, exact_aggregates = recompute(path, end=state["offset"])
+    mismatches = []
+    if rows != state["rows"]:
+        mismatches.append(("rows", None))
+    for name, expected in exact_aggregates.items():
+        actual = state["aggregates"].get(name, {})
+        for key in expected.keys() | actual.keys():
+            if key not in expected or key not in actual or not _close(expected[key], actual[key]):
+                mismatches.append((name, key))
+    for name, data in state["sketches"].items():
+        exact = exact_aggregates.get(name)
+        if exact is None:
+            continue
+        sketch = TopK.from_dict(data)
+        if sketch.total != sum(exact.values()):
+            mismatches.append((f"sketch:{name}", None))
+        for label, count, error in sketch.top(sketch.space_saving.capacity).itertuples(index=False):
+            if not count - error <= exact.get(label, 0) <= count:
+                mismatches.append((f"sketch:{name}", label))
+    return mismatches
+
+
+def current_state(path=None):
+    """The saved state if it covers every complete row of the file, else None."""
+    path = path or data_loader.dataset_path("ai_job")
+    state = load_state()
+    if (state is None or not os.path.exists(path) or state["offset"] != _complete_length(path)
+            or _head_hash(path, state["offset"]) != state["head_hash"]):
+        return None
+    return state
+
+
+def current_sketches(path=None):
+    """The saved sketches as ``{name: TopK}`` if the state covers the file, else None."""
+    state = current_state(path)
+    if state is None:
+        return None
+    return {name: TopK.from_dict(data) for name, data in state["sketches"].items()}
+
+
+def as_frame(state, name):
+    """One aggregate of ``state`` as a DataFrame (means for sum/count pairs), groups in first-appearance order."""
+    keys, value = AGGREGATES.get(name, (["skill"], None))
+    items = state["aggregates"][name]
+    rows = [key.split(KEY_SEP) for key in items]
+    frame = pd.DataFrame(rows, columns=keys)
+    if value is None:
+        frame["count"] = list(items.values())
+    else:
+        frame[value] = [total / count if count else float("nan") for total, count in items.values()]
+    return frame
+
+
+def main(argv):
+    command = argv[0] if argv else "update"
+    if command == "update":
+        state, action = update()
+        print(f"{action}; {state['rows']} rows, offset {state['offset']}")
+    elif command == "rebuild":
+        state = rebuild()
+        save_state(state)
+        print(f"rebuilt; {state['rows']} rows, offset {state['offset']}")
+    elif command == "verify":
+        mismatches = verify()
+        if mismatches:
+            print(f"{len(mismatches)} mismatches, e.g. {mismatches[:5]}")
+            return 1
+        print("incremental state matches a plain-pandas recompute")
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,334 @@
+"""Cricket matches partitioned by league and season, with per-team summaries.
+
+Sources are the dashboard's ``Cricket_data_set.csv`` plus every CSV under
+``<DASHBOARD_DATA_DIR>/matches/`` (other seasons and leagues, same columns).
+A row's league is its ``league`` column (``DEFAULT_LEAGUE`` without one) and
+its season its ``season`` column (else the year of its ``date``). ``sync``
+splits each new or changed source into partitions::
+
+    .match_store/manifest.json
+    .match_store/<source>/<league>/<season>.csv
+
+The manifest lists every partition in load order with its row range in the
+combined frame, its first and last match date, and one summary per team
+that played in it (matches, wins from ``match_winner``, toss wins, toss and
+match wins, and first/second innings score sums and counts). Rows with no
+league or no parseable season belong to no partition; each source's count of
+them, and their total (``skipped``), are kept in the manifest. So:
+
+* league/season selections are unions of contiguous row ranges
+* date and team filters skip partitions whose date range or team set
+  cannot match, and take partitions that match entirely without a scan
+* team tables are summaries added up across the selected partitions
+
+``sync`` only stats the source files while nothing changed. The combined
+frame is the loader's ``"matches"`` dataset (``read_partitions``).
+
+    python match_store.py            # sync and list the partitions
+    python match_store.py rebuild    # re-split every source
+
+    manifest = match_store.sync()
+    parts = match_store.partitions(manifest, leagues=["IPL"], seasons=[2024, 2025])
+    rows = match_store.select_rows(load_dataset("matches"), parts, teams=["CSK"])
+    match_store.team_stats(parts)    # Team, Matches Played, Matches Won, Win %, ...
+"""
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+STORE_VERSION = 2  # 2: skipped row counts
+DEFAULT_LEAGUE = "IPL"
+TEAM_COLUMNS = ["team1", "team2"]
+SUMMARY = ["matches", "wins", "toss_wins", "toss_match_wins",
+           "first_innings_runs", "first_innings_count", "second_innings_runs", "second_innings_count"]
+
+_lock = threading.Lock()
+_manifest = (None, None)  # ((mtime_ns, size) of manifest.json, parsed manifest)
+
+
+def store_dir():
+    return os.path.join(data_loader.DATA_DIR, ".match_store")
+
+
+def manifest_path():
+    return os.path.join(store_dir(), "manifest.json")
+
+
+def sources():
+    """Source CSVs that exist, the dashboard's own file first."""
+    paths = [data_loader.dataset_path("cricket")]
+    paths += sorted(glob.glob(os.path.join(data_loader.DATA_DIR, "matches", "*.csv")))
+    return [path for path in paths if os.path.exists(path)]
+
+
+def _stat(path):
+    st_ = os.stat(path)
+    return st_.st_mtime_ns, st_.st_size
+
+
+def _source_key(path):
+    relative = os.path.relpath(path, data_loader.DATA_DIR)
+    return re.sub(r"[^A-Za-z0-9]+", "_", os.path.splitext(relative)[0]).strip("_")
+
+
+# ------------------------ Team Summaries ------------------------
+def _count(values):
+    return pd.Series(values).dropna().astype(str).value_counts()
+
+
+def team_summary(df):
+    """``SUMMARY`` counts per team (index) over the matches in ``df``."""
+    teams = {col: df[col].astype(object).where(df[col].notna()) for col in TEAM_COLUMNS}
+    toss = df['toss_winner'].astype(object) if 'toss_winner' in df.columns else pd.Series(np.nan, index=df.index)
+    winner = df['match_winner'].astype(object) if 'match_winner' in df.columns else pd.Series(np.nan, index=df.index)
+    parts = {
+        "matches": _count(pd.concat(teams.values())),
+        "wins": _count(winner),
+        "toss_wins": _count(toss),
+        "toss_match_wins": _count(toss[toss == winner]),
+    }
+    if 'toss_decision' in df.columns:
+        # The toss winner bats first when it chose to bat; otherwise the other side does.
+        bats = df['toss_decision'].astype(str).str.lower().eq("bat").to_numpy()
+        other = teams["team2"].where(toss == teams["team1"], teams["team1"])
+        first = pd.Series(np.where(bats, toss, other), index=df.index)
+        second = pd.Series(np.where(bats, other, toss), index=df.index)
+        for innings, batting in (("first", first), ("second", second)):
+            col = f"{innings}_innings_score"
+            if col not in df.columns:
+                continue
+            scores = pd.to_numeric(df[col], errors="coerce")
+            scored = scores.notna() & batting.notna() & toss.notna()
+            grouped = scores[scored].groupby(batting[scored].astype(str))
+            parts[f"{innings}_innings_runs"] = grouped.sum()
+            parts[f"{innings}_innings_count"] = grouped.size()
+    summary = pd.DataFrame(parts).reindex(columns=SUMMARY).fillna(0)
+    return summary.loc[summary["matches"] > 0]
+
+
+# ------------------------ Partitions ------------------------
+def _split(path):
+    """``((league, season), rows)`` groups of one source CSV, in file order, and the rows left out.
+
+    Rows are left out when they have no league or their season (or, without a
+    ``season`` column, their date) does not parse.
+    """
+    df = pd.read_csv(path)
+    if "league" not in df.columns:
+        df.insert(len(df.columns), "league", DEFAULT_LEAGUE)
+    if "season" not in df.columns:
+        df.insert(len(df.columns), "season", pd.to_datetime(df['date'], errors='coerce').dt.year.astype("Int64"))
+    else:
+        season = pd.to_numeric(df["season"], errors="coerce")
+        df["season"] = season.where(season % 1 == 0).astype("Int64")
+    kept = df.dropna(subset=["league", "season"])
+    return kept.groupby(["league", "season"], sort=True), len(df) - len(kept)
+
+
+def _write_source(path):
+    """Write the partitions of one source; returns their manifest entries and its skipped row count."""
+    key = _source_key(path)
+    out = os.path.join(store_dir(), key)
+    tmp = out + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    entries = []
+    groups, skipped = _split(path)
+    for (league, season), rows in groups:
+        relative = os.path.join(key, str(league), f"{int(season)}.csv")
+        target = os.path.join(tmp, str(league), f"{int(season)}.csv")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        rows.to_csv(target, index=False)
+        dates = pd.to_datetime(rows['date'], errors='coerce')
+        summary = team_summary(rows)
+        entries.append({
+            "id": f"{league}/{int(season)}/{key}",
+            "source": key,
+            "league": str(league),
+            "season": int(season),
+            "path": relative,
+            "rows": len(rows),
+            "min_date": None if dates.isna().all() else dates.min().strftime("%Y-%m-%d"),
+            "max_date": None if dates.isna().all() else dates.max().strftime("%Y-%m-%d"),
+            "teams": {team: [float(v) for v in values] for team, values in summary.iterrows()},
+        })
+    shutil.rmtree(out, ignore_errors=True)
+    if os.path.isdir(tmp):
+        os.replace(tmp, out)
+    return entries, skipped
+
+
+def load_manifest():
+    """The saved manifest (parsed again only when the file changed), or None."""
+    global _manifest
+    try:
+        st_ = os.stat(manifest_path())
+        if _manifest[0] == (st_.st_mtime_ns, st_.st_size):
+            return _manifest[1]
+        with open(manifest_path()) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != STORE_VERSION:
+        return None
+    _manifest = ((st_.st_mtime_ns, st_.st_size), manifest)
+    return manifest
+
+
+def _save_manifest(manifest):
+    offset = 0
+    manifest["partitions"].sort(key=lambda p: (p["league"], p["season"], p["source"]))
+    for part in manifest["partitions"]:
+        part["offset"] = offset
+        offset += part["rows"]
+    manifest["rows"] = offset
+    manifest["skipped"] = sum(source["skipped"] for source in manifest["sources"].values())
+    os.makedirs(store_dir(), exist_ok=True)
+    tmp = manifest_path() + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, manifest_path())
+
+
+def sync(rebuild=False):
+    """Bring the store up to date with its sources; returns the manifest.
+
+    Sources are compared by (mtime, size), then by content hash, as the
+    loader does; only new or changed sources are re-split. The manifest is
+    rewritten only when something changed.
+    """
+    with _lock:
+        current = {_source_key(path): path for path in sources()}
+        saved = None if rebuild else load_manifest()
+        if saved is not None and saved["sources"].keys() == current.keys() and all(
+                (saved["sources"][key]["mtime_ns"], saved["sources"][key]["size"]) == _stat(path)
+                for key, path in current.items()):
+            return saved
+        # The saved manifest is shared by every session; edit a copy.
+        manifest = json.loads(json.dumps(saved)) if saved is not None else {
+            "version": STORE_VERSION, "sources": {}, "partitions": []}
+        changed = False
+        for key in list(manifest["sources"]):
+            if key not in current:
+                del manifest["sources"][key]
+                manifest["partitions"] = [p for p in manifest["partitions"] if p["source"] != key]
+                shutil.rmtree(os.path.join(store_dir(), key), ignore_errors=True)
+                changed = True
+        for key, path in current.items():
+            mtime_ns, size = _stat(path)
+            known = manifest["sources"].get(key)
+            if known is not None and (known["mtime_ns"], known["size"]) == (mtime_ns, size):
+                continue
+            content = data_loader.content_hash(path)
+            if known is None or known["content"] != content:
+                manifest["partitions"] = [p for p in manifest["partitions"] if p["source"] != key]
+                entries, skipped = _write_source(path)
+                manifest["partitions"] += entries
+            else:
+                skipped = known["skipped"]
+            manifest["sources"][key] = {"mtime_ns": mtime_ns, "size": size, "content": content, "skipped": skipped}
+            changed = True
+        if changed or not os.path.exists(manifest_path()):
+            _save_manifest(manifest)
+        return manifest
+
+
+def read_partitions(manifest=None):
+    """Every partition's rows, concatenated in manifest order (unparsed: the loader types them)."""
+    manifest = manifest or load_manifest()
+    if manifest is None:
+        raise FileNotFoundError(manifest_path())
+    frames = [pd.read_csv(os.path.join(store_dir(), part["path"])) for part in manifest["partitions"]]
+    if not frames:
+        return pd.DataFrame(columns=["date", "league", "season", *TEAM_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+
+# ------------------------ Selection ------------------------
+def partitions(manifest, leagues=None, seasons=None):
+    """Partitions of the given leagues and seasons (None: all), in load order."""
+    return [part for part in manifest["partitions"]
+            if (leagues is None or part["league"] in leagues) and (seasons is None or part["season"] in seasons)]
+
+
+def select_rows(df, parts, start=None, end=None, teams=None):
+    """Boolean mask of the matches in ``parts`` on dates ``[start, end]`` involving one of ``teams``.
+
+    Returns None when that is every row of ``df``. Partitions outside the
+    date range or without any of the teams are skipped, partitions entirely
+    inside both are taken whole, and only the rest are checked row by row.
+    """
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+    teams = None if teams is None else {str(team) for team in teams}
+    mask = np.zeros(len(df), dtype=bool)
+    for part in parts:
+        lo, hi = part["offset"], part["offset"] + part["rows"]
+        first = None if part["min_date"] is None else pd.Timestamp(part["min_date"])
+        last = None if part["max_date"] is None else pd.Timestamp(part["max_date"])
+        if (start is not None and (last is None or last < start)) or (end is not None and (first is None or first > end)):
+            continue
+        if teams is not None and not teams & part["teams"].keys():
+            continue
+        keep = slice(lo, hi)
+        whole_dates = (start is None or first >= start) and (end is None or last <= end)
+        whole_teams = teams is None or part["teams"].keys() <= teams
+        if whole_dates and whole_teams:
+            mask[keep] = True
+            continue
+        rows = np.ones(hi - lo, dtype=bool)
+        if not whole_dates:
+            dates = df['date'].iloc[keep]
+            if start is not None:
+                rows &= (dates >= start).to_numpy()
+            if end is not None:
+                rows &= (dates <= end).to_numpy()
+        if not whole_teams:
+            rows &= np.logical_or.reduce([df[col].iloc[keep].astype(object).isin(teams).to_numpy()
+                                          for col in TEAM_COLUMNS])
+        mask[keep] = rows
+    return None if mask.all() else mask
+
+
+def team_stats(parts):
+    """Per-team totals over ``parts``: played, won (``match_winner``), toss results, innings averages, Win %.
+
+    Teams are ordered by matches played, then by Win % (highest first).
+    """
+    rows = [(team, *values) for part in parts for team, values in part["teams"].items()]
+    summary = pd.DataFrame(rows, columns=["Team", *SUMMARY]).groupby("Team", sort=False).sum()
+    summary = summary.sort_values("matches", ascending=False, kind="stable")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats = pd.DataFrame({
+            "Team": summary.index,
+            "Matches Played": summary["matches"].astype(np.int64).to_numpy(),
+            "Matches Won": summary["wins"].astype(np.int64).to_numpy(),
+            "Toss Wins": summary["toss_wins"].astype(np.int64).to_numpy(),
+            "Won Toss and Match": summary["toss_match_wins"].astype(np.int64).to_numpy(),
+            "Avg First Innings": (summary["first_innings_runs"] / summary["first_innings_count"]).to_numpy(),
+            "Avg Second Innings": (summary["second_innings_runs"] / summary["second_innings_count"]).to_numpy(),
+        })
+    stats["Win %"] = stats["Matches Won"] / stats["Matches Played"] * 100
+    return stats.sort_values("Win %", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main(argv):
+    manifest = sync(rebuild=bool(argv) and argv[0] == "rebuild")
+    for part in manifest["partitions"]:
+        print(f"{part['id']:<40} {part['rows']:>7,} matches  {part['min_date']} .. {part['max_date']}  "
+              f"{len(part['teams'])} teams")
+    print(f"{len(manifest['partitions'])} partitions, {manifest['rows']:,} matches -> {store_dir()}")
+    if manifest["skipped"]:
+        print(f"{manifest['skipped']:,} matches without a league or season left out")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
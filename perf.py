@@ -0,0 +1,168 @@
+"""Per-section timing for the dashboards.
+
+Dashboards mark where each numbered section starts and which phase of it is
+running; everything between two markers is attributed to the earlier one::
+
+    perf.start("ai_job")
+    perf.section("load", phase="load")
+    df = load_dataset("ai_job")
+    perf.section("experience")          # phase "compute"
+    grouped = ...
+    perf.phase("figure")
+    fig = px.bar(...)
+    chart_reduce.plotly_chart(fig)      # phase "serialize", with payload size
+    perf.finish()
+
+Caches count their per-run hits and misses with ``perf.count(name, n)``.
+
+Each phase records wall time and, when ``DASHBOARD_PERF_TRACEMALLOC`` is set,
+the bytes it allocated (tracemalloc is process-wide and slows Python down, so
+it is opt-in and its numbers mix concurrent sessions). Recording is on for a
+run when ``DASHBOARD_PERF`` is set or the sidebar "perf panel" box is ticked.
+Finished runs are logged as one JSON line on the ``dashboard.perf`` logger,
+appended to ``DASHBOARD_PERF_LOG`` if set, and shown in the sidebar panel.
+
+When recording is off every marker is a single attribute check.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import streamlit as st
+
+ENABLED = bool(os.environ.get("DASHBOARD_PERF"))
+TRACE_ALLOCATIONS = bool(os.environ.get("DASHBOARD_PERF_TRACEMALLOC"))
+LOG_PATH = os.environ.get("DASHBOARD_PERF_LOG")
+
+logger = logging.getLogger("dashboard.perf")
+
+_local = threading.local()  # each session's script runs on its own thread
+_log_lock = threading.Lock()
+history = deque(maxlen=100)  # most recent finished runs, oldest first
+
+
+class _Run:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.records = []
+        self.counters = {}
+        self.current = None  # [section, phase, start, allocated at start]
+
+    def mark(self, section, phase):
+        now = time.perf_counter()
+        allocated = tracemalloc.get_traced_memory()[0] if TRACE_ALLOCATIONS else 0
+        if self.current is not None:
+            prev_section, prev_phase, start, start_allocated = self.current
+            self.records.append({
+                "section": prev_section,
+                "phase": prev_phase,
+                "seconds": now - start,
+                "alloc_bytes": allocated - start_allocated if TRACE_ALLOCATIONS else None,
+                "payload_bytes": None,
+            })
+        self.current = None if section is None else [section, phase, now, allocated]
+
+
+def _run():
+    return getattr(_local, "run", None)
+
+
+# ------------------------ Markers ------------------------
+def start(page):
+    """Begin recording a run of ``page`` if recording is on for this session."""
+    st.sidebar.checkbox("Show perf panel", value=ENABLED, key="show_perf_panel")
+    if not (ENABLED or st.session_state.get("show_perf_panel")):
+        _local.run = None
+        return
+    if TRACE_ALLOCATIONS and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.run = _Run(page)
+
+
+def section(name, phase="compute"):
+    run = _run()
+    if run is not None:
+        run.mark(name, phase)
+
+
+def phase(name):
+    run = _run()
+    if run is not None and run.current is not None:
+        run.mark(run.current[0], name)
+
+
+def payload(nbytes):
+    """Attribute a chart payload of ``nbytes`` to the current section."""
+    run = _run()
+    if run is not None and run.current is not None:
+        run.records.append({"section": run.current[0], "phase": "payload", "seconds": 0.0,
+                            "alloc_bytes": None, "payload_bytes": nbytes})
+
+
+def count(name, n=1):
+    """Add ``n`` to the run's counter ``name`` (e.g. cache hits, bytes saved)."""
+    run = _run()
+    if run is not None:
+        run.counters[name] = run.counters.get(name, 0) + n
+
+
+def recording():
+    return _run() is not None
+
+
+# ------------------------ Reporting ------------------------
+def finish():
+    """Close the run, emit it and render the sidebar panel."""
+    run = _run()
+    if run is None:
+        return None
+    run.mark(None, None)
+    _local.run = None
+    report = {
+        "event": "dashboard_perf",
+        "page": run.page,
+        "time": time.time(),
+        "run_seconds": time.perf_counter() - run.started,
+        "records": run.records,
+        "counters": run.counters,
+    }
+    history.append(report)
+    line = json.dumps(report)
+    logger.info(line)
+    if LOG_PATH:
+        with _log_lock, open(LOG_PATH, "a") as f:
+            f.write(line + "\n")
+    if st.session_state.get("show_perf_panel"):
+        _panel(report)
+    return report
+
+
+def summary(report):
+    """Per-section table of a finished run: ms per phase, allocations, payload."""
+    import pandas as pd
+
+    records = pd.DataFrame(report["records"])
+    if records.empty:
+        return records
+    timed = records[records["phase"] != "payload"]
+    table = timed.pivot_table(index="section", columns="phase", values="seconds", aggfunc="sum", sort=False) * 1000
+    table["total"] = table.sum(axis=1)
+    if TRACE_ALLOCATIONS:
+        table["alloc MB"] = timed.groupby("section", sort=False)["alloc_bytes"].sum() / 1e6
+    table["payload KB"] = records.groupby("section", sort=False)["payload_bytes"].sum() / 1024
+    return table.round(1)
+
+
+def _panel(report):
+    st.sidebar.header("⏱️ Perf")
+    st.sidebar.caption(f"Run took {report['run_seconds'] * 1000:,.0f} ms; phase columns are in ms.")
+    if report["counters"]:
+        st.sidebar.caption(" · ".join(f"{name.replace('_', ' ')}: {value:,}" for name, value in report["counters"].items()))
+    table = summary(report)
+    if not table.empty:
+        st.sidebar.dataframe(table, use_container_width=True)
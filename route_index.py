@@ -0,0 +1,163 @@
+"""Origin x destination flight counts, indexed by integer airport ids.
+
+Built once per loaded frame (via ``data_loader.load_artifact``):
+
+* every airport gets an integer id; source and destination share one
+  dictionary (the loader already gives them common categories)
+* ``counts[i, j]`` is the number of flights from airport ``i`` to ``j``
+* each split column (Airline, Class, Month, ...) gets a cube of shape
+  ``(len(labels), airports, airports)`` with the same counts per label
+
+Top routes are an ``argpartition`` over the matrix, airport traffic is its
+row + column sums, and per-airport or per-route breakdowns are slices of a
+cube, so no query touches the rows again.
+
+    index = RouteIndex.build(df, dims=("Airline", "Class"))
+    index.top_routes(10)                                  # Source Name, Destination Name, count
+    index.traffic().head(10)                              # departures + arrivals per airport
+    index.top_routes(10, index.matrix("Class", ["Business"]))
+    index.breakdown("Dhaka", "Chittagong", "Airline")     # flights per airline on one route
+
+Ties are ordered by the first row each route (or airport) appears in, as
+``value_counts()`` orders them.
+"""
+import numpy as np
+import pandas as pd
+
+from agg_engine import _descending
+
+CHUNK_ROWS = 1_000_000
+
+
+def _codes(values, labels):
+    """Integer ids of ``values`` in ``labels`` (-1 for missing or unknown)."""
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.equals(labels):
+        return values.cat.codes.to_numpy().astype(np.int64)
+    return labels.get_indexer(values)
+
+
+def _dim_labels(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.Index(values.cat.categories)
+    return pd.Index(pd.unique(values.dropna())).sort_values()
+
+
+class RouteIndex:
+    def __init__(self, rows, airports, counts, first_seen, dims, source="Source Name", destination="Destination Name"):
+        self.rows = rows
+        self.airports = airports      # pd.Index, airport id -> name
+        self.counts = counts          # int64 (airports, airports): flights from row airport to column airport
+        self.first_seen = first_seen  # int64 (airports, airports): first row of each route (``rows`` if never flown)
+        self.dims = dims              # column -> (labels, int64 cube of shape (labels, airports, airports))
+        self.source = source
+        self.destination = destination
+
+    @classmethod
+    def build(cls, df, source="Source Name", destination="Destination Name", dims=(), chunk_rows=CHUNK_ROWS):
+        src, dst = df[source], df[destination]
+        if (isinstance(src.dtype, pd.CategoricalDtype) and isinstance(dst.dtype, pd.CategoricalDtype)
+                and src.cat.categories.equals(dst.cat.categories)):
+            airports = pd.Index(src.cat.categories)
+        else:
+            airports = pd.Index(pd.unique(pd.concat([src, dst]).dropna())).sort_values()
+        a = len(airports)
+        dims = [col for col in dims if col in df.columns]
+        dim_labels = {col: _dim_labels(df[col]) for col in dims}
+
+        n = len(df)
+        counts = np.zeros(a * a, dtype=np.int64)
+        first_seen = np.full(a * a, n, dtype=np.int64)
+        cubes = {col: np.zeros(len(labels) * a * a, dtype=np.int64) for col, labels in dim_labels.items()}
+        for start in range(0, n, chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            s, d = _codes(chunk[source], airports), _codes(chunk[destination], airports)
+            valid = (s >= 0) & (d >= 0)
+            route = s * a + d
+            rows = np.flatnonzero(valid)
+            counts += np.bincount(route[rows], minlength=a * a)
+            np.minimum.at(first_seen, route[rows], start + rows)
+            for col, labels in dim_labels.items():
+                k = _codes(chunk[col], labels)
+                keep = valid & (k >= 0)
+                cubes[col] += np.bincount(k[keep] * (a * a) + route[keep], minlength=len(labels) * a * a)
+
+        dims = {col: (dim_labels[col], cube.reshape(len(dim_labels[col]), a, a)) for col, cube in cubes.items()}
+        return cls(n, airports, counts.reshape(a, a), first_seen.reshape(a, a), dims, source, destination)
+
+    # ------------------------ Lookups ------------------------
+    def airport_id(self, name):
+        return self.airports.get_loc(name)
+
+    def labels(self, dim):
+        return list(self.dims[dim][0])
+
+    def matrix(self, dim=None, values=None):
+        """Route counts, restricted to the rows whose ``dim`` is one of ``values``."""
+        if dim is None:
+            return self.counts
+        labels, cube = self.dims[dim]
+        ids = labels.get_indexer(list(values))
+        return cube[ids[ids >= 0]].sum(axis=0)
+
+    # ------------------------ Queries ------------------------
+    def top_routes(self, n, matrix=None):
+        """The ``n`` busiest routes: source, destination and ``count``, busiest first."""
+        matrix = self.counts if matrix is None else matrix
+        flat = matrix.ravel()
+        flown = np.flatnonzero(flat)
+        if len(flown) > n:
+            # Everything tied with the n-th busiest stays a candidate, so ties resolve as in value_counts().
+            nth = flat[flown[np.argpartition(flat[flown], len(flown) - n)[len(flown) - n]]]
+            flown = flown[flat[flown] >= nth]
+        flown = flown[np.argsort(self.first_seen.ravel()[flown], kind="stable")]
+        routes = flown[_descending(flat[flown])][:n]
+        s, d = np.divmod(routes, len(self.airports))
+        return pd.DataFrame({
+            self.source: np.asarray(self.airports.take(s)),
+            self.destination: np.asarray(self.airports.take(d)),
+            "count": flat[routes],
+        })
+
+    def traffic(self, matrix=None):
+        """Departures + arrivals per airport, busiest first (airports with no flights left out)."""
+        matrix = self.counts if matrix is None else matrix
+        total = matrix.sum(axis=1) + matrix.sum(axis=0)
+        # An airport is first seen at its first departure, else (after every departure) at its first arrival.
+        departs = self.first_seen.min(axis=1, initial=self.rows)
+        arrives = self.first_seen.min(axis=0, initial=self.rows)
+        first = np.where(departs < self.rows, departs, self.rows + arrives)
+        used = np.flatnonzero(total)
+        used = used[np.argsort(first[used], kind="stable")]
+        used = used[_descending(total[used])]
+        return pd.Series(total[used], index=self.airports.take(used), name="count")
+
+    def destinations(self, airport, dim=None):
+        """Flights from ``airport`` per destination, busiest first; per ``dim`` label too if given.
+
+        With ``dim`` the frame is long-form: destination, ``dim``, count
+        (non-zero cells only), ordered by the destination's total.
+        """
+        i = self.airport_id(airport)
+        total = self.counts[i]
+        order = np.flatnonzero(total)
+        order = order[np.argsort(-total[order], kind="stable")]
+        if dim is None:
+            return pd.DataFrame({self.destination: np.asarray(self.airports.take(order)), "count": total[order]})
+        labels, cube = self.dims[dim]
+        cells = cube[:, i, order]  # labels x destinations
+        k, j = np.nonzero(cells.T)
+        return pd.DataFrame({
+            self.destination: np.asarray(self.airports.take(order[k])),
+            dim: np.asarray(labels.take(j)),
+            "count": cells[j, k],
+        })
+
+    def breakdown(self, source, destination, dim):
+        """Flights per ``dim`` label on one route (labels with no flights left out)."""
+        labels, cube = self.dims[dim]
+        counts = cube[:, self.airport_id(source), self.airport_id(destination)]
+        flown = np.flatnonzero(counts)
+        return pd.Series(counts[flown], index=labels.take(flown), name="count")
+
+    def nbytes(self):
+        return self.counts.nbytes + self.first_seen.nbytes + sum(cube.nbytes for _, cube in self.dims.values())
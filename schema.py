@@ -0,0 +1,131 @@
+"""Typed column schema applied to every dataset the loader reads.
+
+Each dataset spec in ``data_loader.DATASETS`` may declare:
+
+* ``categories``: string columns parsed straight into categoricals, with
+  labels normalized (surrounding whitespace stripped, so "Senior-Level " and
+  "Senior-Level" are one category)
+* ``shared``: groups of categorical columns that get one common dictionary,
+  so their codes are interchangeable and the columns compare with ``==``
+  (e.g. team1 / team2 / toss_winner / match_winner)
+* ``numeric``: target dtypes for numeric columns, applied only when every
+  value fits (integers with missing values fall back to float32)
+
+``memory_report`` compares a typed frame with the object-string / 64-bit
+layout ``read_csv`` would have produced without a schema.
+
+    python schema.py                 # memory before/after for every dataset
+    python schema.py ai_job cricket
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+def read_dtypes(schema):
+    """The ``dtype=`` mapping for ``read_csv``: categoricals only.
+
+    Numeric columns are parsed at full width and narrowed afterwards, so an
+    unexpected value never makes the parse fail.
+    """
+    return {col: "category" for col in schema.get("categories", ())}
+
+
+def _normalized(cat):
+    """``cat`` with stripped labels; labels that collide are merged."""
+    categories = cat.categories
+    if categories.dtype != object:
+        return cat
+    labels = categories.map(lambda c: c.strip() if isinstance(c, str) else c)
+    if labels.equals(categories):
+        return cat
+    uniques = pd.unique(labels)
+    recode = np.append(pd.Index(uniques).get_indexer(labels), -1)  # -1 keeps missing values missing
+    return pd.Categorical.from_codes(recode[cat.codes], categories=uniques)
+
+
+def _share(df, columns):
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return
+    union = pd.Index(sorted(set().union(*(df[col].cat.categories for col in columns))))
+    for col in columns:
+        df[col] = df[col].cat.set_categories(union)
+
+
+def _narrow(s, dtype):
+    dtype = np.dtype(dtype)
+    if not pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+        return s
+    if dtype.kind in "iu":
+        if s.isna().any():
+            return s.astype(np.float32)
+        info = np.iinfo(dtype)
+        if len(s) and (s.min() < info.min or s.max() > info.max):
+            return s
+    return s.astype(dtype)
+
+
+def apply(df, schema):
+    """Normalize, share and narrow ``df``'s columns in place per ``schema``."""
+    for col in schema.get("categories", ()):
+        if col in df.columns:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+            df[col] = _normalized(df[col].array)
+    for group in schema.get("shared", ()):
+        _share(df, group)
+    for col, dtype in schema.get("numeric", {}).items():
+        if col in df.columns:
+            df[col] = _narrow(df[col], dtype)
+    return df
+
+
+# ------------------------ Memory Report ------------------------
+def _plain_bytes(s):
+    """Bytes ``s`` would take as object strings / 64-bit numbers."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(s.cat.categories))
+        sizes = np.fromiter((sys.getsizeof(c) for c in s.cat.categories), dtype=np.int64,
+                            count=len(s.cat.categories))
+        # one pointer per row plus one string object per row, as pandas counts it
+        return 8 * len(s) + int(counts @ sizes) + 24 * int((codes < 0).sum())
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return 8 * len(s)
+    return int(s.memory_usage(index=False, deep=True))
+
+
+def memory_report(df):
+    """``{"before", "after", "columns": {col: (before, after)}}`` in bytes."""
+    columns = {
+        col: (_plain_bytes(df[col]), int(df[col].memory_usage(index=False, deep=True)))
+        for col in df.columns
+    }
+    return {
+        "before": sum(b for b, _ in columns.values()),
+        "after": sum(a for _, a in columns.values()),
+        "columns": columns,
+    }
+
+
+def main(argv):
+    import data_loader
+
+    names = argv or list(data_loader.DATASETS)
+    for name in names:
+        try:
+            df = data_loader.read_source(name)
+        except FileNotFoundError:
+            print(f"skip {name}: {data_loader.dataset_path(name)} not found")
+            continue
+        report = memory_report(df)
+        print(f"{name}: {len(df):,} rows, {report['before'] / 1e6:,.1f} MB -> {report['after'] / 1e6:,.1f} MB")
+        for col, (before, after) in sorted(report["columns"].items(), key=lambda kv: kv[1][1] - kv[1][0]):
+            if before != after:
+                print(f"  {col:<36} {before / 1e6:10,.2f} MB -> {after / 1e6:8,.2f} MB  ({df[col].dtype})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,180 @@
+"""Column classification from a bounded sample of a CSV.
+
+Every column of the sample is given one kind:
+
+* ``numeric``: parsed numbers, or strings that all parse as numbers
+* ``datetime``: strings that all parse with one format, which is returned
+  so the full column can be parsed with ``pd.to_datetime(format=...)``
+* ``categorical``: fewer than ``max_categories`` distinct values
+* ``id``: (almost) every value distinct, with no whitespace, or an integer
+  column named like an id ("match_id", the "Unnamed: 0" index)
+* ``text``: anything else (names, free-form feedback, skill lists)
+* ``empty``: no values in the sample
+
+Checks are ordered cheapest-first and stop at the first failure: a probe of
+the first ``PROBE_ROWS`` values must parse before the whole sample is tried,
+date formats are guessed from the first value and only a handful of
+candidates are ever parsed, and distinct values are counted with a
+k-minimum-values sketch, block by block, until the column can no longer be
+categorical or an id.
+
+    sample = pd.read_csv(path, nrows=10_000)
+    types = infer(sample)
+    types["posting_date"]          # ColumnType(kind='datetime', format='%Y-%m-%d', distinct=...)
+
+    python schema_infer.py Ai_job.csv      # classify a file (reservoir sample of every row)
+"""
+import re
+import sys
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+NUMERIC = "numeric"
+DATETIME = "datetime"
+CATEGORICAL = "categorical"
+ID = "id"
+TEXT = "text"
+EMPTY = "empty"
+
+MAX_CATEGORIES = 20
+PROBE_ROWS = 32
+BLOCK_ROWS = 1024
+SKETCH_K = 1024
+ID_RATIO = 0.9  # distinct / non-missing values above which a column looks like an id
+
+# Tried after the formats guessed from the first value.
+DATE_FORMATS = [
+    "ISO8601",
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y/%m/%d",
+    "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d/%m/%Y %H:%M", "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p", "%d.%m.%Y",
+]
+_ID_NAME = re.compile(r"^Unnamed: \d+$|(^|[_\s])id$", re.IGNORECASE)
+_DATE_SHAPE = re.compile(r"^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}")
+_WHITESPACE = re.compile(r"\s")
+
+
+@dataclass(frozen=True)
+class ColumnType:
+    kind: str
+    format: str = None  # datetime format for pd.to_datetime
+    distinct: int = 0   # distinct values seen (estimated above SKETCH_K; a lower bound for text)
+
+
+class DistinctSketch:
+    """K-minimum-values estimate of the number of distinct values; exact below ``k``."""
+
+    def __init__(self, k=SKETCH_K):
+        self.k = k
+        self.mins = np.empty(0, dtype=np.uint64)
+
+    def add(self, values):
+        hashes = pd.util.hash_array(np.asarray(values), categorize=False)
+        self.mins = np.unique(np.concatenate([self.mins, hashes]))[:self.k]
+
+    def estimate(self):
+        if len(self.mins) < self.k:
+            return len(self.mins)
+        return int((self.k - 1) / (float(self.mins[-1]) / 2.0 ** 64))
+
+
+# ------------------------ Checks ------------------------
+def _all_parse(text, parse):
+    """True if ``parse`` accepts every value: the probe first, then the rest."""
+    if parse(text.iloc[:PROBE_ROWS]).isna().any():
+        return False
+    return len(text) <= PROBE_ROWS or not parse(text.iloc[PROBE_ROWS:]).isna().any()
+
+
+def _candidate_formats(first):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        guessed = [f for f in (guess_datetime_format(first), guess_datetime_format(first, dayfirst=True)) if f]
+    if not guessed and not _DATE_SHAPE.match(first):
+        return []  # not shaped like a date: no format is worth parsing
+    return list(dict.fromkeys(guessed + DATE_FORMATS))
+
+
+def date_format(text):
+    """The first format every value of ``text`` (non-missing strings) parses with, or None."""
+    first = text.iloc[0]
+    if not any(c.isdigit() for c in first) or len(first) > 64:
+        return None
+    for fmt in _candidate_formats(first):
+        parse = lambda values, fmt=fmt: pd.to_datetime(values, format=fmt, errors="coerce")  # noqa: E731
+        if _all_parse(text, parse):
+            return fmt
+    return None
+
+
+def _cardinality(values, max_categories):
+    """Kind and distinct count of a column that is neither numeric nor a date."""
+    # Values with whitespace are never ids, so the column is settled once it has too many values to be categorical.
+    could_be_id = not _WHITESPACE.search("".join(values[:PROBE_ROWS]))
+    sketch = DistinctSketch()
+    seen, block = 0, BLOCK_ROWS
+    while seen < len(values):
+        sketch.add(values[seen:seen + block])
+        seen, block = min(seen + block, len(values)), block * 2  # blocks double: early exits stay cheap
+        distinct = sketch.estimate()
+        # Too many values for a category and too many repeats for an id: free text.
+        if distinct >= max_categories and (not could_be_id or distinct < ID_RATIO * seen):
+            return TEXT, distinct
+    if distinct < max_categories:
+        return CATEGORICAL, distinct
+    return (ID if not _WHITESPACE.search("".join(values)) else TEXT), distinct
+
+
+def classify(name, values, max_categories=MAX_CATEGORIES):
+    """The ColumnType of one sampled column."""
+    values = values.dropna()
+    if not len(values):
+        return ColumnType(EMPTY)
+    if pd.api.types.is_bool_dtype(values):
+        return ColumnType(CATEGORICAL, distinct=values.nunique())
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return ColumnType(DATETIME)
+    if pd.api.types.is_numeric_dtype(values):
+        if (_ID_NAME.search(str(name)) and (values % 1 == 0).all()
+                and values.is_unique):
+            return ColumnType(ID, distinct=len(values))
+        return ColumnType(NUMERIC)
+
+    text = values if values.dtype == object and isinstance(values.iloc[0], str) else values.astype(str)
+    if _all_parse(text, lambda v: pd.to_numeric(v, errors="coerce")):
+        return ColumnType(NUMERIC)
+    fmt = date_format(text)
+    if fmt is not None:
+        return ColumnType(DATETIME, format=fmt)
+    kind, distinct = _cardinality(text.to_numpy(dtype=object), max_categories)
+    return ColumnType(kind, distinct=distinct)
+
+
+def infer(sample, max_categories=MAX_CATEGORIES):
+    """``{column: ColumnType}`` for every column of ``sample``, in column order."""
+    return {col: classify(col, sample[col], max_categories) for col in sample.columns}
+
+
+def columns_of(types, kind):
+    return [col for col, t in types.items() if t.kind == kind]
+
+
+def main(argv):
+    from streaming_stats import Reservoir
+
+    for path in argv:
+        sample = Reservoir()
+        for chunk in pd.read_csv(path, chunksize=100_000):
+            sample.add(chunk)
+        print(f"{path} ({sample.seen:,} rows)")
+        for col, t in infer(sample.sample()).items():
+            detail = t.format or (f"~{t.distinct:,} distinct" if t.distinct else "")
+            print(f"  {col:<40} {t.kind:<12} {detail}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+"""Section registry shared by the dashboards.
+
+A page declares its sections once, in display order, and hands them to
+``render`` together with the arguments every section's render function
+takes::
+
+    SECTIONS = [
+        Section("preview", "🔍 Data Preview", preview_section),
+        Section("skills", "🔟 Which skills ...?", skills_section, inputs=("skill_title",)),
+    ]
+    sections.render("ai_job", SECTIONS, df, results)
+
+* Only the sections picked in the sidebar "Sections" selector are computed
+  and drawn (all of them by default); hidden sections cost nothing.
+* ``inputs`` lists the keys of the widgets a section owns. Such a section
+  runs as an ``st.fragment``: changing one of its widgets reruns that
+  section alone while every other section keeps what it already drew.
+* Sections without inputs depend only on the loaded frame and the sidebar
+  controls. Their results should come from ``data_loader.load_artifact`` so
+  a full rerun reuses them instead of recomputing.
+
+With ``version`` (the content hash of the page's data plus the values of
+its page-wide widgets) passed to ``render``, charts drawn through
+``figure_cache.plotly_chart`` are keyed by it, the section id and the
+section's ``inputs`` values, and reused instead of rebuilt::
+
+    sections.render("ai_job", SECTIONS, df, results, rows,
+                    version=(data_loader.version("ai_job"), repr(selection)))
+
+Titles may contain ``str.format`` fields (e.g. ``"Hourly Temperature in
+{city}"``), filled from the keyword arguments of ``render``.
+"""
+from dataclasses import dataclass
+
+import streamlit as st
+
+import figure_cache
+import perf
+
+
+@dataclass(frozen=True)
+class Section:
+    id: str
+    title: str
+    render: object      # render(*page_args) draws everything under the title
+    inputs: tuple = ()  # keys of the widgets the section owns
+
+
+def visible(page, sections, **fields):
+    """The sections picked in the sidebar selector, in registry order."""
+    titles = {s.id: s.title.format(**fields) for s in sections}
+    st.sidebar.header("📑 Sections")
+    picked = st.sidebar.multiselect("Show sections", list(titles), default=list(titles),
+                                    format_func=titles.get, key=f"{page}_sections")
+    return [s for s in sections if s.id in picked]
+
+
+def _scoped(page, section, version):
+    def draw(*args):
+        with figure_cache.scope(page, section.id, version, section.inputs):
+            section.render(*args)
+    return draw
+
+
+def render(page, sections, *args, version=None, **fields):
+    """Draw the visible ``sections`` of ``page``, each timed as its own perf section."""
+    for section in visible(page, sections, **fields):
+        perf.section(section.id)
+        st.subheader(section.title.format(**fields))
+        draw = _scoped(page, section, version)
+        if section.inputs:
+            st.fragment(draw)(*args)
+        else:
+            draw(*args)
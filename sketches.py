@@ -0,0 +1,254 @@
+"""Mergeable, constant-memory sketches for top-N and distinct-count charts.
+
+* ``SpaceSaving``: the heavy hitters of a stream in ``capacity`` counters;
+  every reported count is an upper bound at most ``error`` above the truth,
+  and the error never exceeds ``total / capacity``
+* ``CountMin``: a ``depth x width`` counter table; point estimates are upper
+  bounds, at most ``e / width * total`` too high with probability
+  ``1 - exp(-depth)``
+* ``HyperLogLog``: distinct counts from ``2 ** precision`` registers, with a
+  relative standard error of ``1.04 / sqrt(2 ** precision)``
+* ``TopK``: the three together for one key. Space-Saving picks the
+  candidates, Count-Min tightens their counts, HyperLogLog counts distinct
+  keys.
+
+Sketches are updated one chunk at a time (``add`` / ``add_counts``), merged
+across partitions with ``merge`` and serialized with ``to_dict`` /
+``from_dict`` (plain JSON types). Labels are kept as strings.
+
+    sketch = TopK()
+    for chunk in pd.read_csv(path, chunksize=100_000):
+        sketch.add(chunk["company_location"])
+    top = sketch.top(10, "company_location")   # company_location, count, error
+    sketch.bounds(top)                         # the error statement for a caption
+
+``controls()`` adds the sidebar switch that serves the dashboards' top-N
+charts from sketches.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+CHUNK_ROWS = 100_000
+
+_POW2 = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+_HLL_KEY = "hyperloglog-hash"
+
+
+def _labels(index):
+    return np.asarray(pd.Index(index).astype(str), dtype=object)
+
+
+def _hash(labels, key="0123456789123456"):
+    return pd.util.hash_array(labels, hash_key=key, categorize=False)
+
+
+# ------------------------ Space-Saving ------------------------
+class SpaceSaving:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.errors = pd.Series(dtype=np.int64)
+        self.dropped = False  # once labels were evicted, unseen labels may have up to floor() occurrences
+
+    def floor(self):
+        return int(self.counts.min()) if self.dropped and len(self.counts) else 0
+
+    def merge_counts(self, counts, errors=None, floor=0, dropped=False):
+        """Merge another summary (or exact counts, with no errors) into this one."""
+        if errors is None:
+            errors = pd.Series(0, index=counts.index, dtype=np.int64)
+        own_floor = self.floor()
+        labels = self.counts.index.union(counts.index)
+        merged = self.counts.reindex(labels, fill_value=own_floor) + counts.reindex(labels, fill_value=floor)
+        merged_errors = self.errors.reindex(labels, fill_value=own_floor) + errors.reindex(labels, fill_value=floor)
+        keep = merged.sort_values(ascending=False, kind="stable").index[:self.capacity]
+        self.dropped = self.dropped or dropped or len(labels) > self.capacity
+        self.counts = merged[keep].astype(np.int64)
+        self.errors = merged_errors[keep].astype(np.int64)
+
+    def merge(self, other):
+        self.merge_counts(other.counts, other.errors, other.floor(), other.dropped)
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "dropped": self.dropped, "labels": list(self.counts.index),
+                "counts": self.counts.tolist(), "errors": self.errors.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data["capacity"])
+        summary.dropped = data["dropped"]
+        summary.counts = pd.Series(data["counts"], index=pd.Index(data["labels"], dtype=object), dtype=np.int64)
+        summary.errors = pd.Series(data["errors"], index=summary.counts.index, dtype=np.int64)
+        return summary
+
+
+# ------------------------ Count-Min ------------------------
+class CountMin:
+    def __init__(self, width=2048, depth=5):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _cells(self, labels):
+        return np.stack([_hash(labels, f"countmin-row-{row:03d}") % np.uint64(self.width)
+                         for row in range(self.depth)]).astype(np.int64)
+
+    def add(self, labels, counts):
+        for row, cells in enumerate(self._cells(labels)):
+            self.table[row] += np.bincount(cells, weights=counts, minlength=self.width).astype(np.int64)
+
+    def estimate(self, labels):
+        if not len(labels):
+            return np.zeros(0, dtype=np.int64)
+        return self.table[np.arange(self.depth)[:, None], self._cells(labels)].min(axis=0)
+
+    def epsilon(self):
+        return math.e / self.width
+
+    def merge(self, other):
+        self.table += other.table
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "table": self.table.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["width"], data["depth"])
+        sketch.table = np.asarray(data["table"], dtype=np.int64).reshape(sketch.depth, sketch.width)
+        return sketch
+
+
+# ------------------------ HyperLogLog ------------------------
+class HyperLogLog:
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, labels):
+        hashes = _hash(labels, _HLL_KEY)
+        p = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        rest = hashes << p
+        # Position of the first 1 bit in the remaining 64 - p bits.
+        rank = 64 - np.searchsorted(_POW2, rest, side="right") + 1
+        np.maximum.at(self.registers, buckets, np.minimum(rank, 64 - self.precision + 1).astype(np.uint8))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))  # linear counting for small cardinalities
+        return int(round(raw))
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def to_dict(self):
+        return {"precision": self.precision, "registers": self.registers.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["precision"])
+        sketch.registers = np.asarray(data["registers"], dtype=np.uint8)
+        return sketch
+
+
+# ------------------------ Top-K ------------------------
+class TopK:
+    def __init__(self, capacity=64, width=2048, depth=5, precision=12):
+        self.total = 0
+        self.space_saving = SpaceSaving(capacity)
+        self.count_min = CountMin(width, depth)
+        self.distinct_sketch = HyperLogLog(precision)
+
+    def add(self, values):
+        """Count one chunk of labels (missing values are skipped)."""
+        self.add_counts(pd.Series(values).value_counts())
+
+    def add_counts(self, counts):
+        """Add a Series of ``label -> occurrences`` (e.g. a chunk's groupby size)."""
+        counts = counts[counts > 0]
+        counts = pd.Series(counts.to_numpy(dtype=np.int64), index=_labels(counts.index))
+        if not counts.index.is_unique:
+            counts = counts.groupby(level=0).sum()
+        if not len(counts):
+            return
+        labels = counts.index.to_numpy(dtype=object)
+        self.total += int(counts.sum())
+        self.space_saving.merge_counts(counts)
+        self.count_min.add(labels, counts.to_numpy())
+        self.distinct_sketch.add(labels)
+
+    def merge(self, other):
+        self.total += other.total
+        self.space_saving.merge(other.space_saving)
+        self.count_min.merge(other.count_min)
+        self.distinct_sketch.merge(other.distinct_sketch)
+
+    def top(self, n, name="label"):
+        """The ``n`` most frequent labels: ``name``, ``count`` (an upper bound) and ``error``.
+
+        The true count of each label lies in ``[count - error, count]``.
+        """
+        summary = self.space_saving
+        labels = summary.counts.index.to_numpy(dtype=object)
+        counts = np.minimum(summary.counts.to_numpy(), self.count_min.estimate(labels))
+        lower = summary.counts.to_numpy() - summary.errors.to_numpy()
+        frame = pd.DataFrame({name: labels, "count": counts, "error": np.maximum(counts - lower, 0)})
+        return frame.sort_values("count", ascending=False, kind="stable").head(n).reset_index(drop=True)
+
+    def distinct(self):
+        return self.distinct_sketch.estimate()
+
+    def max_error(self):
+        """Worst-case overcount of any label (Space-Saving's ``total / capacity``)."""
+        return self.total // self.space_saving.capacity
+
+    def bounds(self, top=None):
+        """Caption stating the error of ``top`` (a ``top()`` frame), or the worst case without one."""
+        if top is None:
+            error = self.max_error()
+        else:
+            error = int(top["error"].max()) if len(top) else 0
+        return (f"≈ Approximate counts from a {self.space_saving.capacity}-counter Space-Saving summary of "
+                f"{self.total:,} values: each bar is at most {error:,} above its true count "
+                f"(never more than {self.max_error():,}). "
+                f"About {self.distinct():,} distinct values (±{self.distinct_sketch.relative_error():.1%}).")
+
+    def to_dict(self):
+        return {"total": self.total, "space_saving": self.space_saving.to_dict(),
+                "count_min": self.count_min.to_dict(), "hyperloglog": self.distinct_sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        sketch.total = data["total"]
+        sketch.space_saving = SpaceSaving.from_dict(data["space_saving"])
+        sketch.count_min = CountMin.from_dict(data["count_min"])
+        sketch.distinct_sketch = HyperLogLog.from_dict(data["hyperloglog"])
+        return sketch
+
+
+def build(values, chunk_rows=CHUNK_ROWS):
+    """A TopK of a Series, added ``chunk_rows`` values at a time."""
+    sketch = TopK()
+    for start in range(0, len(values), chunk_rows):
+        sketch.add(values.iloc[start:start + chunk_rows])
+    return sketch
+
+
+# ------------------------ Controls ------------------------
+def controls():
+    st.sidebar.checkbox("Approximate top-N charts (sketches)", value=False, key="approximate_top_n")
+
+
+def enabled():
+    return st.session_state.get("approximate_top_n", False)
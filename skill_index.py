@@ -0,0 +1,136 @@
+"""Skill vocabulary and row -> skill incidence index for ``required_skills``.
+
+The comma-separated skill strings are tokenized once at load time into a CSR
+layout: ``indices[indptr[i]:indptr[i + 1]]`` are the skill ids of row ``i``.
+Top-N, filtered top-N and co-occurrence queries are then bincounts over
+integer arrays instead of a per-row ``split`` + ``explode``.
+"""
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 200_000
+
+# Pair counts use a dense V*V bincount up to this vocabulary size and
+# np.unique above it.
+DENSE_PAIR_VOCAB = 4096
+
+
+class SkillIndex:
+    def __init__(self, vocab, indptr, indices):
+        self.vocab = vocab        # object array, skill id -> label
+        self.indptr = indptr      # int64, len(rows) + 1
+        self.indices = indices    # int32 skill ids, row-major
+        self.lengths = np.diff(indptr)
+
+    @classmethod
+    def build(cls, skills, chunk_rows=CHUNK_ROWS):
+        """Tokenize a Series of comma-separated skills, ``chunk_rows`` at a time.
+
+        Labels are stripped, so " PyTorch" and "PyTorch" are the same skill;
+        empty tokens and missing values contribute nothing.
+        """
+        vocab = {}
+        lengths, indices = [], []
+        for start in range(0, len(skills), chunk_rows):
+            chunk = skills.iloc[start:start + chunk_rows]
+            text = chunk[chunk.notna()].astype(str)
+            row_lengths = np.zeros(len(chunk), dtype=np.int64)
+            if len(text):
+                rows = np.flatnonzero(chunk.notna().to_numpy())
+                per_row = text.str.count(",").to_numpy() + 1
+                tokens = pd.Series(",".join(text.tolist()).split(","), dtype=object).str.strip()
+                keep = (tokens != "").to_numpy()
+                token_rows = np.repeat(rows, per_row)[keep]
+                codes, uniques = pd.factorize(tokens[keep])
+                ids = np.array([vocab.setdefault(label, len(vocab)) for label in uniques], dtype=np.int32)
+                row_lengths = np.bincount(token_rows, minlength=len(chunk))
+                indices.append(ids[codes])
+            lengths.append(row_lengths)
+
+        lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+        indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32)
+        return cls(np.array(list(vocab), dtype=object), indptr, indices)
+
+    def _selected(self, rows):
+        """Skill ids of the selected rows (all rows when ``rows`` is None)."""
+        if rows is None:
+            return self.indices
+        return self.indices[np.repeat(np.asarray(rows, dtype=bool), self.lengths)]
+
+    def counts(self, rows=None):
+        return np.bincount(self._selected(rows), minlength=len(self.vocab))
+
+    def top(self, n=10, rows=None):
+        """Top ``n`` skills as a ``Skill``/``Count`` frame."""
+        counts = self.counts(rows)
+        order = np.argsort(-counts, kind="stable")[:n]
+        order = order[counts[order] > 0]
+        return pd.DataFrame({"Skill": self.vocab[order], "Count": counts[order]})
+
+    def rows_with(self, skill):
+        """Boolean row mask of postings that require ``skill``."""
+        ids = np.flatnonzero(self.vocab == skill)
+        if not len(ids):
+            return np.zeros(len(self.lengths), dtype=bool)
+        row_of = np.repeat(np.arange(len(self.lengths)), self.lengths)
+        mask = np.zeros(len(self.lengths), dtype=bool)
+        mask[row_of[self.indices == ids[0]]] = True
+        return mask
+
+    def _pair_codes(self, start, stop, lengths):
+        """Pair codes (``first * V + second``) of every skill pair of rows [start, stop)."""
+        V = len(self.vocab)
+        lengths = lengths[start:stop]
+        starts = self.indptr[start:start + len(lengths)]
+        pair_codes = []
+        # Rows with the same number of skills form a dense (m, k) block.
+        for k in np.unique(lengths[lengths > 1]):
+            block = self.indices[starts[lengths == k][:, None] + np.arange(k)]
+            block.sort(axis=1)
+            left, right = np.triu_indices(k, 1)
+            pair_codes.append((block[:, left].astype(np.int64) * V + block[:, right]).ravel())
+        return np.concatenate(pair_codes) if pair_codes else np.zeros(0, dtype=np.int64)
+
+    def cooccurrence(self, n=10, rows=None, chunk_rows=CHUNK_ROWS):
+        """Top ``n`` skill pairs required together in the same posting.
+
+        Pairs are counted ``chunk_rows`` rows at a time, so only one chunk's
+        pair codes are held at once.
+        """
+        lengths = self.lengths
+        if rows is not None:
+            lengths = np.where(np.asarray(rows, dtype=bool), lengths, 0)
+        V = len(self.vocab)
+        dense = V <= DENSE_PAIR_VOCAB
+        counts = np.zeros(V * V if dense else 0, dtype=np.int64)
+        codes = np.zeros(0, dtype=np.int64)
+        for start in range(0, len(lengths), chunk_rows):
+            pair_codes = self._pair_codes(start, start + chunk_rows, lengths)
+            if not len(pair_codes):
+                continue
+            if dense:
+                counts += np.bincount(pair_codes, minlength=V * V)
+            else:
+                chunk_codes, chunk_counts = np.unique(pair_codes, return_counts=True)
+                codes, merged = np.unique(np.concatenate([codes, chunk_codes]), return_inverse=True)
+                counts = np.bincount(merged, weights=np.concatenate([counts, chunk_counts]),
+                                     minlength=len(codes)).astype(np.int64)
+        if dense:
+            codes = np.flatnonzero(counts)
+            counts = counts[codes]
+        if not len(codes):
+            return pd.DataFrame({"Skill A": [], "Skill B": [], "Count": []})
+        order = np.argsort(-counts, kind="stable")[:n]
+        first, second = np.divmod(codes[order], V)
+        a, b = self.vocab[first], self.vocab[second]
+        swap = a > b
+        return pd.DataFrame({
+            "Skill A": np.where(swap, b, a),
+            "Skill B": np.where(swap, a, b),
+            "Count": counts[order],
+        })
+
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes
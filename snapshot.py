@@ -0,0 +1,168 @@
+"""Typed columnar snapshots of the dashboard datasets.
+
+A snapshot is a directory with one ``.npy`` file per column plus a
+``manifest.json``. Numeric and datetime columns are stored as-is; string
+columns are dictionary-encoded (integer codes + a category list). Readers
+memory-map only the columns they ask for, so a chart that needs two columns
+never touches the other twenty.
+
+The manifest records the source file (size, mtime, content hash) and a hash
+of the code that shaped the frame (the dataset spec, its derived columns and
+``schema.py``); a snapshot is stale once either changes.
+
+    python snapshot.py                 # snapshot every dataset that exists
+    python snapshot.py ai_job cricket  # snapshot selected datasets
+"""
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import schema
+
+FORMAT_VERSION = 2  # 2: typed schema (categoricals, narrowed numerics)
+
+
+def snapshot_dir(name):
+    return os.path.join(data_loader.DATA_DIR, ".snapshots", name)
+
+
+def code_hash(name):
+    """Hash of what turns dataset ``name``'s CSV into its frame: the spec, the parsing and ``schema``."""
+    spec = data_loader.DATASETS[name]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps({k: v for k, v in spec.items() if k != "derived"}, sort_keys=True).encode())
+    if spec["derived"] is not None:
+        digest.update(inspect.getsource(spec["derived"]).encode())
+    digest.update(inspect.getsource(data_loader.read_source).encode())
+    digest.update(inspect.getsource(schema).encode())
+    return digest.hexdigest()
+
+
+def _column_file(col_index):
+    return f"col_{col_index:03d}.npy"
+
+
+def build_snapshot(name):
+    """Parse the source CSV once and write its typed columnar snapshot."""
+    source = data_loader.dataset_path(name)
+    mtime_ns, size = data_loader.fingerprint(name)
+    content = data_loader.content_hash(source)
+    df = data_loader.read_source(name)
+
+    out = snapshot_dir(name)
+    tmp = out + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        entry = {"name": col, "file": _column_file(i)}
+        if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_dtype(s):
+            entry["kind"] = "array"
+            values = s.to_numpy()
+        else:
+            cat = pd.Categorical(s)
+            entry["kind"] = "dict"
+            entry["categories"] = [str(c) for c in cat.categories]
+            values = cat.codes
+        np.save(os.path.join(tmp, entry["file"]), values, allow_pickle=False)
+        columns.append(entry)
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "dataset": name,
+        "rows": len(df),
+        "source": {"mtime_ns": mtime_ns, "size": size, "content": content},
+        "code": code_hash(name),
+        "columns": columns,
+    }
+    with open(os.path.join(tmp, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out)
+    return manifest
+
+
+def read_manifest(name):
+    path = os.path.join(snapshot_dir(name), "manifest.json")
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def is_fresh(name, manifest=None):
+    """True if the snapshot still matches its source CSV and the code that parsed it."""
+    manifest = manifest or read_manifest(name)
+    if manifest is None or manifest.get("code") != code_hash(name):
+        return False
+    mtime_ns, size = data_loader.fingerprint(name)
+    source = manifest["source"]
+    if size != source["size"]:
+        return False
+    if mtime_ns == source["mtime_ns"]:
+        return True
+    return data_loader.content_hash(data_loader.dataset_path(name)) == source["content"]
+
+
+def _read_column(directory, entry, materialize_strings):
+    values = np.load(os.path.join(directory, entry["file"]), mmap_mode="r", allow_pickle=False)
+    if entry["kind"] == "array":
+        return pd.Series(values, name=entry["name"], copy=False)
+    categories = pd.Index(entry["categories"], dtype=object)
+    if materialize_strings:
+        codes = np.asarray(values)
+        strings = categories.to_numpy().take(codes)
+        strings[codes < 0] = np.nan
+        return pd.Series(strings, name=entry["name"], dtype=object)
+    return pd.Series(pd.Categorical.from_codes(values, categories), name=entry["name"])
+
+
+def read_snapshot(name, columns=None, materialize_strings=False):
+    """Return a frame with ``columns`` of dataset ``name``.
+
+    Columns are memory-mapped from the snapshot when it is fresh. String
+    columns come back as categoricals unless ``materialize_strings`` is set.
+    A missing or stale snapshot falls back to parsing the CSV.
+    """
+    manifest = read_manifest(name)
+    if not is_fresh(name, manifest):
+        df = data_loader.read_source(name)
+        return df if columns is None else df[list(columns)]
+
+    by_name = {entry["name"]: entry for entry in manifest["columns"]}
+    wanted = [entry["name"] for entry in manifest["columns"]] if columns is None else list(columns)
+    missing = [col for col in wanted if col not in by_name]
+    if missing:
+        raise KeyError(f"{name} snapshot has no column(s) {missing}")
+    directory = snapshot_dir(name)
+    return pd.DataFrame({
+        col: _read_column(directory, by_name[col], materialize_strings) for col in wanted
+    }, copy=False)
+
+
+def main(argv):
+    names = argv or list(data_loader.DATASETS)
+    for name in names:
+        if not os.path.exists(data_loader.dataset_path(name)):
+            print(f"skip {name}: {data_loader.dataset_path(name)} not found")
+            continue
+        manifest = build_snapshot(name)
+        print(f"{name}: {manifest['rows']} rows, {len(manifest['columns'])} columns -> {snapshot_dir(name)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,44 +1,157 @@
+import itertools
+import time
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-st.title("📈 Auto Chart Generator from CSV")
+import schema_infer
+from streaming_stats import Covariance, GroupMeans, LineDownsampler
+
+CHUNK_ROWS = 100_000
+SAMPLE_ROWS = 10_000
+MAX_CATEGORIES = 20
+REFRESH_SECONDS = 1.0
+
+
+# ------------------------ Column Detection ------------------------
+def infer_types(sample):
+    """Heatmap columns, the line chart's date column and its format, and the bar chart candidates."""
+    types = schema_infer.infer(sample, MAX_CATEGORIES)
+    date_col = next(iter(schema_infer.columns_of(types, schema_infer.DATETIME)), None)
+    date_format = types[date_col].format if date_col is not None else None
+    return (schema_infer.columns_of(types, schema_infer.NUMERIC), date_col, date_format,
+            schema_infer.columns_of(types, schema_infer.CATEGORICAL))
+
+
+def correlation_heatmap(corr):
+    """Annotated heatmap of ``corr`` (matplotlib and seaborn are imported on first use: they take seconds)."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots()
+    sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
+    st.pyplot(fig)
+    plt.close(fig)
+
+
+# ------------------------ Streaming Mode ------------------------
+class ChartStats:
+    """What the charts need, accumulated one chunk at a time."""
+
+    def __init__(self, sample):
+        self.numeric_cols, self.date_col, self.date_format, cat_cols = infer_types(sample)
+        numeric_cols = self.numeric_cols
+        self.cov = Covariance(numeric_cols) if len(numeric_cols) >= 2 else None
+        self.line = LineDownsampler() if numeric_cols and self.date_col is not None else None
+        self.bars = {col: GroupMeans() for col in cat_cols} if numeric_cols else {}
+        self.rows = 0
+        self.coerced = 0
+
+    def add(self, chunk):
+        self.rows += len(chunk)
+        # A chunk can parse a numeric column as text; values that are not numbers count as missing.
+        numeric = chunk[self.numeric_cols].apply(pd.to_numeric, errors="coerce")
+        self.coerced += int((numeric.isna() & chunk[self.numeric_cols].notna()).to_numpy().sum())
+        if self.cov is not None:
+            self.cov.add(numeric.to_numpy(dtype=float))
+        if self.line is not None:
+            dates = pd.to_datetime(chunk[self.date_col], format=self.date_format, errors="coerce")
+            self.line.add(dates, numeric[self.numeric_cols[0]])
+        for col in list(self.bars):
+            present = chunk[col].notna()
+            self.bars[col].add(chunk[col][present].astype(str), numeric[self.numeric_cols[0]][present])
+            if len(self.bars[col]) >= MAX_CATEGORIES:
+                del self.bars[col]
 
+    def draw(self, slots):
+        heatmap_slot, line_slot, bar_slot = slots
+        y = self.numeric_cols[0] if self.numeric_cols else None
+        if self.cov is not None:
+            with heatmap_slot.container():
+                st.subheader("📊 Correlation Heatmap")
+                correlation_heatmap(self.cov.corr())
+        if self.line is not None:
+            with line_slot.container():
+                st.subheader(f"📈 Line Chart: {y} over {self.date_col}")
+                st.line_chart(self.line.series(y).rename_axis(self.date_col))
+        # Candidates drop out once they reach MAX_CATEGORIES values, so the chart can move to a later column.
+        bar_col = next(iter(self.bars), None)
+        if bar_col is None:
+            bar_slot.empty()
+        else:
+            with bar_slot.container():
+                st.subheader(f"📊 Bar Chart: Avg {y} by {bar_col}")
+                st.bar_chart(self.bars[bar_col].means().rename_axis(bar_col).rename(y))
 
-uploaded_file = st.file_uploader("Upload your CSV file", type=["csv"])
 
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
+def stream_upload(uploaded_file):
+    """Charts of the upload read CHUNK_ROWS rows at a time, redrawn as chunks arrive.
+
+    Column types are inferred once, from a uniform sample of the first chunk
+    (later chunks are coerced to those types); the correlation, per-category
+    means and the LTTB-reduced line are accumulated chunk by chunk, so memory
+    does not grow with the file.
+    """
+    reader = pd.read_csv(uploaded_file, chunksize=CHUNK_ROWS)
+    first = next(reader, pd.DataFrame())
     st.success("File uploaded successfully!")
     st.subheader("🔍 Data Preview")
-    st.write(df.head())
+    st.write(first.head())
+
+    stats = ChartStats(first.sample(n=min(len(first), SAMPLE_ROWS), random_state=0))
+    progress = st.progress(0.0)
+    slots = st.empty(), st.empty(), st.empty()
+    last_draw = time.monotonic()
+    for chunk in itertools.chain([first], reader):
+        stats.add(chunk)
+        progress.progress(min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0),
+                          text=f"Read {stats.rows:,} rows")
+        if time.monotonic() - last_draw >= REFRESH_SECONDS:
+            stats.draw(slots)
+            last_draw = time.monotonic()
+    progress.empty()
+    stats.draw(slots)
+    if stats.coerced:
+        st.warning(f"⚠️ {stats.coerced:,} non-numeric values in numeric columns were treated as missing.")
+    st.caption(f"Streamed {stats.rows:,} rows in chunks of {CHUNK_ROWS:,}.")
+
+
+# ------------------------ Page ------------------------
+def main():
+    st.title("📈 Auto Chart Generator from CSV")
+
+
+    uploaded_file = st.file_uploader("Upload your CSV file", type=["csv"])
+    streaming = st.toggle("Streaming mode", value=True,
+                          help="Read the upload in chunks with bounded memory; charts update as chunks are read.")
+
+    if uploaded_file and streaming:
+        stream_upload(uploaded_file)
+    elif uploaded_file:
+        df = pd.read_csv(uploaded_file)
+        st.success("File uploaded successfully!")
+        st.subheader("🔍 Data Preview")
+        st.write(df.head())
 
     
-    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
-    if len(numeric_cols) >= 2:
-        st.subheader("📊 Correlation Heatmap")
-        fig, ax = plt.subplots()
-        sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", ax=ax)
-        st.pyplot(fig)
-
-  
-    date_cols = df.select_dtypes(include=['datetime64', 'object']).columns
-    for col in date_cols:
-        try:
-            df[col] = pd.to_datetime(df[col])
-            df = df.sort_values(by=col)
-            st.subheader(f"📈 Line Chart: {numeric_cols[0]} over {col}")
-            st.line_chart(df.set_index(col)[numeric_cols[0]])
-            break
-        except:
-            continue
-
-   
-    cat_cols = df.select_dtypes(include=['object']).columns.tolist()
-    for col in cat_cols:
-        if df[col].nunique() < 20:
+        numeric_cols, date_col, date_format, cat_cols = infer_types(df.sample(n=min(len(df), SAMPLE_ROWS), random_state=0))
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
+        if len(numeric_cols) >= 2:
+            st.subheader("📊 Correlation Heatmap")
+            correlation_heatmap(df[numeric_cols].corr())
+
+        if numeric_cols and date_col is not None:
+            df[date_col] = pd.to_datetime(df[date_col], format=date_format, errors="coerce")
+            df = df.sort_values(by=date_col)
+            st.subheader(f"📈 Line Chart: {numeric_cols[0]} over {date_col}")
+            st.line_chart(df.set_index(date_col)[numeric_cols[0]])
+
+        if numeric_cols and cat_cols:
+            col = cat_cols[0]
             st.subheader(f"📊 Bar Chart: Avg {numeric_cols[0]} by {col}")
             bar_data = df.groupby(col)[numeric_cols[0]].mean().sort_values()
             st.bar_chart(bar_data)
-            break
+
+
+if __name__ == "__main__":
+    main()
@@ -1,179 +1,362 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 
-# Page configuration
-st.set_page_config(page_title="🏏 IPL Cricket Insights", layout="wide")
-st.title("🏏 IPL 2025 Match Analysis Dashboard")
+import calendar_dim
+import chart_reduce
+import compute_worker
+import data_loader
+import figure_cache
+import match_store
+import perf
+import sections
+import sketches
+from agg_engine import Agg, AggEngine
+from data_loader import load_artifact, load_dataset
+from sections import Section
 
-# Load dataset
-df = pd.read_csv("Cricket_data_set.csv")  # Ensure this file is in the same folder
-df['date'] = pd.to_datetime(df['date'])
+# Chart aggregations, answered together by the shared aggregation engine
+AGGREGATIONS = {
+    "venues": Agg(by=("venue",), sort="desc", top=3, name="Count"),
+    "toss": Agg(by=("toss_winner", "toss_decision"), name="Count"),
+    "player_of_match": Agg(by=("player_of_the_match",), sort="desc", top=10, name="Count"),
+    "top_scorer": Agg(by=("top_scorer",), sort="desc", top=10, name="Count"),
+    "balls_left": Agg(by=("match_result",), measure="mean", value="balls_left", name="Avg Balls Left"),
+    "best_bowling": Agg(by=("best_bowling",), sort="desc", top=10, name="Count"),
+}
 
-# Sidebar Filters
-st.sidebar.header("🔍 Filter Data")
-teams = sorted(set(df['team1']).union(df['team2']))
-selected_teams = st.sidebar.multiselect("Select Teams", teams, default=teams)
 
-# Filter dataset
-filtered_df = df[(df['team1'].isin(selected_teams)) | (df['team2'].isin(selected_teams))]
+def aggregate(df):
+    return compute_worker.run("matches", AGGREGATIONS, AggEngine)
+
+
+def selected_results(df, rows, parts):
+    """Aggregations over the selected seasons' ``rows``; the last selection's result is kept per session."""
+    if rows is None:
+        return load_artifact("matches", "aggregations", aggregate)
+    key = (id(df), tuple(part["id"] for part in parts))
+    cached = st.session_state.get("cricket_selected")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    results = compute_worker.run("matches", AGGREGATIONS, AggEngine, rows=rows)
+    st.session_state["cricket_selected"] = (key, results)
+    return results
+
+
+# ------------------------ Seasons ------------------------
+def season_panel(manifest):
+    """Sidebar league and season pickers; returns the selected partitions of the match store."""
+    st.sidebar.header("🗓️ Seasons")
+    leagues = sorted({part["league"] for part in manifest["partitions"]})
+    picked_leagues = st.sidebar.multiselect("League", leagues, default=leagues, key="match_leagues")
+    seasons = sorted({part["season"] for part in match_store.partitions(manifest, leagues=picked_leagues)},
+                     reverse=True)
+    picked_seasons = st.sidebar.multiselect("Season", seasons, default=seasons, key="match_seasons")
+    if manifest["skipped"]:
+        st.sidebar.caption(f"{manifest['skipped']:,} matches without a league or a valid season/date are left out.")
+    return match_store.partitions(manifest, picked_leagues, picked_seasons)
+
+
+def selection_label(parts):
+    """E.g. "IPL 2025" or "IPL / PSL 2016-2025"."""
+    leagues = sorted({part["league"] for part in parts})
+    seasons = sorted({part["season"] for part in parts})
+    span = str(seasons[0]) if len(seasons) == 1 else f"{seasons[0]}-{seasons[-1]}"
+    return f"{' / '.join(leagues)} {span}"
+
+
+# Dataset Preview (the team filter only affects the preview, so it reruns alone)
+def preview_section(df, results, rows, parts):
+    teams = sorted(set().union(*(part["teams"] for part in parts)))
+    selected_teams = st.multiselect("Select Teams", teams, default=teams, key="selected_teams")
+
+    # Filter dataset: seasons without any selected team are skipped whole
+    team_rows = match_store.select_rows(df, parts, teams=selected_teams)
+    st.dataframe(df.head(10) if team_rows is None else df.iloc[np.flatnonzero(team_rows)[:10]])
 
-# Dataset Preview
-st.subheader("📋 Dataset Preview")
-st.dataframe(filtered_df.head(10))
 
 # 1. Venues hosting most matches
-st.subheader("🏟️ Top 3 Venues Hosting the Most Matches")
-venues = df['venue'].value_counts().reset_index().head(3)
-venues.columns = ['Venue', 'Count']
-fig1 = px.bar(venues, x='Venue', y='Count', color='Venue',
-              title="Top 3 Venues by Match Count", text='Count')
-fig1.update_traces(textposition='outside')
-fig1.update_layout(showlegend=False)
-st.plotly_chart(fig1, use_container_width=True)
+def venues_section(df, results, rows, parts):
+    venues = results["venues"].set_axis(['Venue', 'Count'], axis=1)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig1 = px.bar(venues, x='Venue', y='Count', color='Venue',
+                      title="Top 3 Venues by Match Count", text='Count')
+        fig1.update_traces(textposition='outside')
+        fig1.update_layout(showlegend=False)
+        return fig1
+
+    figure_cache.plotly_chart(figure)
+
 
 # 2. Toss wins and decisions
-st.subheader("🧢 Toss Decisions by Teams")
-toss_df = df.groupby(['toss_winner', 'toss_decision']).size().reset_index(name='Count')
-fig2 = px.bar(toss_df, x='toss_winner', y='Count', color='toss_decision',
-              title="Toss Decisions by Teams", barmode='group')
-fig2.update_layout(xaxis_title='Teams', yaxis_title='Toss Count')
-st.plotly_chart(fig2, use_container_width=True)
-
-# 3. Match win percentage by team
-st.subheader("🏆 Match Win Percentage by Team")
-all_teams = pd.concat([df['team1'], df['team2']])
-total_matches = all_teams.value_counts()
-match_wins = df['toss_winner'].value_counts()
-win_df = pd.DataFrame({
-    'Team': total_matches.index,
-    'Matches Played': total_matches.values,
-    'Matches Won': match_wins.reindex(total_matches.index).fillna(0).values
-})
-win_df['Win %'] = (win_df['Matches Won'] / win_df['Matches Played']) * 100
-win_df = win_df.sort_values(by='Win %', ascending=False)
-
-fig3 = px.bar(win_df, x='Team', y='Win %', color='Team',
-              title="Match Win Percentage by Team", text='Win %')
-fig3.update_traces(texttemplate='%{text:.2f}%', textposition='outside')
-fig3.update_layout(showlegend=False)
-st.plotly_chart(fig3, use_container_width=True)
+def toss_section(df, results, rows, parts):
+    toss_df = results["toss"]
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig2 = px.bar(toss_df, x='toss_winner', y='Count', color='toss_decision',
+                      title="Toss Decisions by Teams", barmode='group')
+        fig2.update_layout(xaxis_title='Teams', yaxis_title='Toss Count')
+        return fig2
+
+    figure_cache.plotly_chart(figure)
+
+
+# 3. Match win percentage by team (wins counted from match_winner, summed from the per-season team summaries)
+def win_percentage_section(df, results, rows, parts):
+    win_df = match_store.team_stats(parts)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig3 = px.bar(win_df, x='Team', y='Win %', color='Team',
+                      title="Match Win Percentage by Team", text='Win %')
+        fig3.update_traces(texttemplate='%{text:.2f}%', textposition='outside')
+        fig3.update_layout(showlegend=False)
+        return fig3
+
+    figure_cache.plotly_chart(figure)
+    st.dataframe(win_df.round(2))
+
 
 # 4. Average first vs second innings scores
-st.subheader("📊 First vs Second Innings Scores")
-if 'first_innings_score' in df.columns and 'second_innings_score' in df.columns:
-    innings_df = pd.DataFrame({
-        'First Innings': df['first_innings_score'],
-        'Second Innings': df['second_innings_score']
-    }).melt(var_name='Innings', value_name='Score')
+def innings_section(df, results, rows, parts):
+    if 'first_innings_score' not in df.columns or 'second_innings_score' not in df.columns:
+        st.warning("❌ Required columns 'first_innings_score' and 'second_innings_score' not found.")
+        return
+    if rows is not None:
+        df = df[rows]
+
+    def figure():
+        innings_df = pd.DataFrame({
+            'First Innings': df['first_innings_score'],
+            'Second Innings': df['second_innings_score']
+        }).melt(var_name='Innings', value_name='Score')
+        perf.phase("figure")
+        fig4 = chart_reduce.box_figure(innings_df, x='Innings', y='Score',
+                                       title="Boxplot: First vs Second Innings Score")
+        return fig4
 
-    fig4 = px.box(innings_df, x='Innings', y='Score', color='Innings',
-                  title="Boxplot: First vs Second Innings Score")
-    st.plotly_chart(fig4, use_container_width=True)
+    figure_cache.plotly_chart(figure)
 
     avg_first = df['first_innings_score'].mean()
     avg_second = df['second_innings_score'].mean()
     st.markdown(f"📌 **Average First Innings Score:** `{avg_first:.2f}` | **Average Second Innings Score:** `{avg_second:.2f}`")
-else:
-    st.warning("❌ Required columns 'first_innings_score' and 'second_innings_score' not found.")
+
 
 # 5. Top Performers
-st.subheader("🎖️ Top Performers")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    pom = df['player_of_the_match'].value_counts().head(10).reset_index()
-    pom.columns = ['Player', 'Count']
-    fig5 = px.bar(pom, x='Count', y='Player', orientation='h',
-                  title="Top 10 Players of the Match", color='Count', color_continuous_scale='sunset')
-    st.plotly_chart(fig5, use_container_width=True)
-
-with col2:
-    if 'top_scorer' in df.columns:
-        top_scorers = df['top_scorer'].value_counts().head(10).reset_index()
-        top_scorers.columns = ['Player', 'Count']
-        fig6 = px.bar(top_scorers, x='Count', y='Player', orientation='h',
-                      title="Top 10 Top Scorers", color='Count', color_continuous_scale='Blues')
-        st.plotly_chart(fig6, use_container_width=True)
-    else:
-        st.warning("❌ Column 'top_scorer' not found in dataset.")
-        
+def build_sketches(df):
+    return {col: sketches.build(df[col]) for col in ('player_of_the_match', 'top_scorer') if col in df.columns}
+
+
+def approximate_top(col, n=10):
+    """Player/Count rows of ``col`` from its sketch, captioned with the error bound."""
+    sketch = load_artifact("matches", "sketches", build_sketches)[col]
+    top = sketch.top(n, 'Player').rename(columns={'count': 'Count'})
+    st.caption(sketch.bounds(top))
+    return top
+
+
+def top_performers_section(df, results, rows, parts):
+    approximate = sketches.enabled() and rows is None
+    if sketches.enabled() and rows is not None:
+        st.caption("Approximate counts cover every season; with seasons selected the counts are exact.")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if approximate:
+            pom = approximate_top('player_of_the_match')
+        else:
+            pom = results["player_of_match"].set_axis(['Player', 'Count'], axis=1)
+
+        def figure():
+            import plotly.express as px
+            perf.phase("figure")
+            fig5 = px.bar(pom, x='Count', y='Player', orientation='h',
+                          title="Top 10 Players of the Match", color='Count', color_continuous_scale='sunset')
+            return fig5
+
+        figure_cache.plotly_chart(figure)
+
+    with col2:
+        if 'top_scorer' in df.columns:
+            if approximate:
+                top_scorers = approximate_top('top_scorer')
+            else:
+                top_scorers = results["top_scorer"].set_axis(['Player', 'Count'], axis=1)
+
+            def figure():
+                import plotly.express as px
+                perf.phase("figure")
+                fig6 = px.bar(top_scorers, x='Count', y='Player', orientation='h',
+                              title="Top 10 Top Scorers", color='Count', color_continuous_scale='Blues')
+                return fig6
+
+            figure_cache.plotly_chart(figure)
+        else:
+            st.warning("❌ Column 'top_scorer' not found in dataset.")
+
+
 # 6. Trend in Wide Ball Runs Over Time
-st.subheader("📈 Wide Ball Runs Over Time")
-if 'wide ball runs' in df.columns and 'date' in df.columns:
-    wide_df = df.groupby(df['date'].dt.date)['wide ball runs'].sum().reset_index()
-    wide_df.columns = ['Date', 'Wide Runs']
-    fig_wide = px.line(wide_df, x='Date', y='Wide Runs', title="Daily Wide Ball Runs Trend", markers=True)
-    st.plotly_chart(fig_wide, use_container_width=True)
-else:
-    st.warning("Columns 'wide ball runs' or 'date' not found.")
+def wide_runs_table(df, rows=None):
+    match_days = calendar_dim.load("matches", 'date')
+    return match_days.aggregate(("date",), df['wide ball runs'], "sum", rows=rows, name='Wide Runs').rename(
+        columns={'date': 'Date'})
+
+
+def wide_runs_section(df, results, rows, parts):
+    if 'wide ball runs' not in df.columns or 'date' not in df.columns:
+        st.warning("Columns 'wide ball runs' or 'date' not found.")
+        return
+
+    def figure():
+        import plotly.express as px
+        if rows is None:
+            wide_df = load_artifact("matches", "wide_runs", wide_runs_table)
+        else:
+            wide_df = wide_runs_table(df, rows)
+        perf.phase("figure")
+        fig_wide = px.line(wide_df, x='Date', y='Wide Runs', title="Daily Wide Ball Runs Trend", markers=True)
+        return fig_wide
+
+    figure_cache.plotly_chart(figure)
+
 
 # 7. Impact of Balls Left on Match Results
-st.subheader("⏳ Balls Left vs Match Result")
-if 'balls_left' in df.columns and 'match_result' in df.columns:
-    balls_outcome = df.groupby('match_result')['balls_left'].mean().reset_index()
-    balls_outcome.columns = ['Match Result', 'Avg Balls Left']
-    fig_balls = px.bar(balls_outcome, x='Match Result', y='Avg Balls Left', color='Match Result',
-                       title="Average Balls Left by Match Result", text='Avg Balls Left')
-    fig_balls.update_traces(texttemplate='%{text:.1f}', textposition='outside')
-    st.plotly_chart(fig_balls, use_container_width=True)
-else:
-    st.warning("Columns 'balls_left' or 'match_result' not found.")
+def balls_left_section(df, results, rows, parts):
+    if 'balls_left' not in df.columns or 'match_result' not in df.columns:
+        st.warning("Columns 'balls_left' or 'match_result' not found.")
+        return
+    balls_outcome = results["balls_left"].set_axis(['Match Result', 'Avg Balls Left'], axis=1)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig_balls = px.bar(balls_outcome, x='Match Result', y='Avg Balls Left', color='Match Result',
+                           title="Average Balls Left by Match Result", text='Avg Balls Left')
+        fig_balls.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+        return fig_balls
+
+    figure_cache.plotly_chart(figure)
+
 
 # 8. Bowlers with Best Bowling Figures Most Often
-st.subheader("🎯 Bowlers with Best Bowling Figures")
-if 'best_bowling' in df.columns:
-    best_bowlers = df['best_bowling'].value_counts().head(10).reset_index()
-    best_bowlers.columns = ['Figures', 'Count']
-    fig_bowlers = px.bar(best_bowlers, x='Figures', y='Count', color='Count',
-                         title="Top 10 Best Bowling Figures", text='Count')
-    fig_bowlers.update_traces(textposition='outside')
-    st.plotly_chart(fig_bowlers, use_container_width=True)
-else:
-    st.warning("Column 'best_bowling' not found.")
+def best_bowling_section(df, results, rows, parts):
+    if 'best_bowling' not in df.columns:
+        st.warning("Column 'best_bowling' not found.")
+        return
+    best_bowlers = results["best_bowling"].set_axis(['Figures', 'Count'], axis=1)
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig_bowlers = px.bar(best_bowlers, x='Figures', y='Count', color='Count',
+                             title="Top 10 Best Bowling Figures", text='Count')
+        fig_bowlers.update_traces(textposition='outside')
+        return fig_bowlers
+
+    figure_cache.plotly_chart(figure)
+
 
 # 9. Relationship Between Wickets Taken and Runs Conceded
-st.subheader("📉 Wickets Taken vs Runs Conceded")
-if 'best_bowling_wickets1' in df.columns and 'best_bowling_runs' in df.columns:
-    fig_relation = px.scatter(df, x='best_bowling_wickets1', y='best_bowling_runs', trendline='ols',
-                              title="Wickets vs Runs Conceded", color='best_bowling_wickets1',
-                              labels={'best_bowling_wickets1': 'Wickets', 'best_bowling_runs': 'Runs Conceded'})
-    st.plotly_chart(fig_relation, use_container_width=True)
-else:
-    st.warning("Columns 'best_bowling_wickets1' or 'best_bowling_runs' not found.")
+def wickets_vs_runs_section(df, results, rows, parts):
+    if 'best_bowling_wickets1' not in df.columns or 'best_bowling_runs' not in df.columns:
+        st.warning("Columns 'best_bowling_wickets1' or 'best_bowling_runs' not found.")
+        return
+
+    def figure():
+        perf.phase("figure")
+        fig_relation = chart_reduce.scatter_density_figure(
+            df if rows is None else df[rows], x='best_bowling_wickets1', y='best_bowling_runs',
+            title="Wickets vs Runs Conceded", color='best_bowling_wickets1',
+            labels={'best_bowling_wickets1': 'Wickets', 'best_bowling_runs': 'Runs Conceded'})
+        return fig_relation
 
+    figure_cache.plotly_chart(figure)
 
 
 # Section 10: Toss Winner vs Match Winner
-st.subheader("🧢📊 Toss Winner vs Match Winner")
+def toss_vs_match_section(df, results, rows, parts):
+    # Check if required columns are present
+    required_columns = {'toss_winner', 'match_winner'}
+    if not required_columns.issubset(df.columns):
+        st.warning("Required columns 'toss_winner' and/or 'match_winner' not found in the dataset.")
+        return
+
+    def figure():
+        import plotly.express as px
+        # Count outcomes from the per-season team summaries (each match counts once, for its toss winner)
+        won = int(match_store.team_stats(parts)['Won Toss and Match'].sum())
+        matches = sum(part["rows"] for part in parts)
+        toss_outcome = pd.DataFrame({'Won After Toss?': ['Yes', 'No'], 'Count': [won, matches - won]})
+        toss_outcome = toss_outcome.sort_values('Count', ascending=False, kind='stable')
+
+        # Plot pie chart
+        perf.phase("figure")
+        fig_toss = px.pie(
+            toss_outcome,
+            names='Won After Toss?',
+            values='Count',
+            title="How Often Do Teams Win After Winning the Toss?",
+            hole=0.4
+        )
+        return fig_toss
+
+    figure_cache.plotly_chart(figure)
+
+
+SECTIONS = [
+    Section("preview", "📋 Dataset Preview", preview_section, inputs=("selected_teams",)),
+    Section("venues", "🏟️ Top 3 Venues Hosting the Most Matches", venues_section),
+    Section("toss", "🧢 Toss Decisions by Teams", toss_section),
+    Section("win_percentage", "🏆 Match Win Percentage by Team", win_percentage_section),
+    Section("innings", "📊 First vs Second Innings Scores", innings_section),
+    Section("top_performers", "🎖️ Top Performers", top_performers_section),
+    Section("wide_runs", "📈 Wide Ball Runs Over Time", wide_runs_section),
+    Section("balls_left", "⏳ Balls Left vs Match Result", balls_left_section),
+    Section("best_bowling", "🎯 Bowlers with Best Bowling Figures", best_bowling_section),
+    Section("wickets_vs_runs", "📉 Wickets Taken vs Runs Conceded", wickets_vs_runs_section),
+    Section("toss_vs_match", "🧢📊 Toss Winner vs Match Winner", toss_vs_match_section),
+]
+
+
+def main():
+    # Page configuration
+    st.set_page_config(page_title="🏏 IPL Cricket Insights", layout="wide")
 
-# Check if required columns are present
-required_columns = {'toss_winner', 'match_winner'}
-if required_columns.issubset(df.columns):
-    # Create a new column to check if toss winner also won the match
-    df['toss_win_match_win'] = (df['toss_winner'] == df['match_winner']).astype(int)
+    chart_reduce.controls()
+    sketches.controls()
+    perf.start("cricket")
 
-    # Count outcomes
-    toss_outcome = df['toss_win_match_win'].value_counts().reset_index()
-    toss_outcome.columns = ['Won After Toss?', 'Count']
-    toss_outcome['Won After Toss?'] = toss_outcome['Won After Toss?'].map({1: 'Yes', 0: 'No'})
+    # Load every season (Cricket_data_set.csv plus matches/*.csv), partitioned by league and season
+    perf.section("load", phase="load")
+    manifest = match_store.sync()
+    df = load_dataset("matches")
+    perf.section("seasons")
+    parts = season_panel(manifest)
+    if not parts:
+        st.title("🏏 Match Analysis Dashboard")
+        st.warning("⚠️ Select at least one league and season.")
+        perf.finish()
+        return
+    st.title(f"🏏 {selection_label(parts)} Match Analysis Dashboard")
+    rows = None if len(parts) == len(manifest["partitions"]) else match_store.select_rows(df, parts)
+    perf.section("aggregations")
+    results = selected_results(df, rows, parts)
 
-    # Plot pie chart
-    fig_toss = px.pie(
-        toss_outcome,
-        names='Won After Toss?',
-        values='Count',
-        title="How Often Do Teams Win After Winning the Toss?",
-        hole=0.4
-    )
-    st.plotly_chart(fig_toss, use_container_width=True)
+    version = (data_loader.version("matches"), [(part["league"], part["season"]) for part in parts])
+    sections.render("cricket", SECTIONS, df, results, rows, parts, version=version)
 
-else:
-    st.warning("Required columns 'toss_winner' and/or 'match_winner' not found in the dataset.")
+    # Footer
+    st.markdown("---")
+    st.markdown("📊 Built by **Raghav Sharma** using `Streamlit`, `Pandas`, and `Plotly` 🎯")
 
+    perf.finish()
 
 
-# Footer
-st.markdown("---")
-st.markdown("📊 Built by **Raghav Sharma** using `Streamlit`, `Pandas`, and `Plotly` 🎯")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Single-pass, bounded-memory statistics for CSVs read in chunks.
+
+Used by stream.py's streaming mode and (``Reservoir``) by schema_infer.py;
+every accumulator takes one chunk at a time and keeps state whose size does
+not depend on the number of rows:
+
+* ``Reservoir``: uniform row sample of everything seen so far (Algorithm R)
+* ``Covariance``: pairwise-complete co-moments merged chunk by chunk (Chan et
+  al.'s parallel form of Welford's update), so ``corr()`` matches
+  ``DataFrame.corr()`` on the whole file
+* ``GroupMeans``: running sum and count of a value per category
+* ``LineDownsampler``: a bounded buffer of (x, y) points, reduced with LTTB
+  whenever it fills up
+
+    cov = Covariance(["price", "qty"])
+    for chunk in pd.read_csv(path, chunksize=100_000):
+        cov.add(chunk[["price", "qty"]].to_numpy(dtype=float))
+    cov.corr()
+"""
+import numpy as np
+import pandas as pd
+
+from chart_reduce import LINE_POINTS, lttb
+
+
+class Reservoir:
+    def __init__(self, size=10_000, seed=0):
+        self.size = size
+        self.seen = 0
+        self.rows = None  # DataFrame indexed by reservoir slot
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, chunk):
+        chunk = chunk.reset_index(drop=True)
+        fill = min(len(chunk), max(self.size - self.seen, 0))
+        head = chunk.iloc[:fill].set_axis(np.arange(self.seen, self.seen + fill))
+        self.rows = head if self.rows is None else pd.concat([self.rows, head])
+        rest = chunk.iloc[fill:]
+        if len(rest):
+            # Row t (0-based over the whole stream) replaces a uniform slot in [0, t] if that slot exists.
+            t = self.seen + fill + np.arange(len(rest))
+            slots = (self._rng.random(len(rest)) * (t + 1)).astype(np.int64)
+            taken = np.flatnonzero(slots < self.size)
+            # A slot hit twice in one chunk keeps the later row, as the sequential algorithm would.
+            slots, first_from_end = np.unique(slots[taken][::-1], return_index=True)
+            rows = taken[::-1][first_from_end]
+            replacement = rest.iloc[rows].set_axis(slots)
+            self.rows = pd.concat([self.rows.drop(index=slots), replacement]).sort_index()
+        self.seen += len(chunk)
+
+    def sample(self):
+        return self.rows.reset_index(drop=True) if self.rows is not None else pd.DataFrame()
+
+
+class Covariance:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        p = len(self.columns)
+        # [i, j] entries cover the rows where both column i and column j are present.
+        self.n = np.zeros((p, p))
+        self.mean = np.zeros((p, p))  # mean of column i
+        self.m2 = np.zeros((p, p))    # squared deviations of column i
+        self.c = np.zeros((p, p))     # co-moment of columns i and j
+
+    def add(self, values):
+        """Merge a 2-D float array (rows x columns, NaN for missing) into the totals."""
+        X = np.asarray(values, dtype=float)
+        if not len(X):
+            return
+        present = ~np.isnan(X)
+        weights = present.astype(float)
+        # Centre on the chunk's column means first so the sums below do not cancel.
+        counts = weights.sum(axis=0)
+        shift = np.where(present, X, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        Xc = np.where(present, X - shift, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n = weights.T @ weights
+            sums = Xc.T @ weights
+            centred_mean = np.where(n > 0, sums / n, 0.0)
+            m2 = (Xc ** 2).T @ weights - sums * centred_mean
+            c = Xc.T @ Xc - sums * centred_mean.T
+            chunk_mean = centred_mean + shift[:, None]
+
+            total = self.n + n
+            delta = chunk_mean - self.mean
+            weight = np.where(total > 0, self.n * n / total, 0.0)
+            self.c += c + delta * delta.T * weight
+            self.m2 += m2 + delta ** 2 * weight
+            self.mean += np.where(total > 0, delta * n / total, 0.0)
+        self.n = total
+
+    def corr(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.c / np.sqrt(self.m2 * self.m2.T)
+        corr[(self.n < 2) | ~np.isfinite(corr)] = np.nan
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.columns, columns=self.columns)
+
+
+class GroupMeans:
+    def __init__(self):
+        self.sums = pd.Series(dtype=float)
+        self.counts = pd.Series(dtype=float)
+
+    def add(self, keys, values):
+        grouped = pd.Series(np.asarray(values, dtype=float)).groupby(np.asarray(keys, dtype=object))
+        self.sums = self.sums.add(grouped.sum(), fill_value=0)
+        self.counts = self.counts.add(grouped.count(), fill_value=0)
+
+    def __len__(self):
+        return len(self.sums)
+
+    def means(self):
+        """Mean per category, ascending (categories with no values are NaN)."""
+        return (self.sums / self.counts.where(self.counts > 0)).sort_values()
+
+
+class LineDownsampler:
+    def __init__(self, points=LINE_POINTS, buffer_factor=4):
+        self.points = points
+        self.capacity = points * buffer_factor
+        self.x = np.empty(0, dtype="datetime64[ns]")
+        self.y = np.empty(0, dtype=float)
+
+    def add(self, x, y):
+        x = np.asarray(x, dtype="datetime64[ns]")
+        y = np.asarray(y, dtype=float)
+        keep = ~(np.isnat(x) | np.isnan(y))
+        self.x = np.concatenate([self.x, x[keep]])
+        self.y = np.concatenate([self.y, y[keep]])
+        if len(self.x) > self.capacity:
+            self._reduce()
+
+    def _reduce(self):
+        order = np.argsort(self.x, kind="stable")
+        self.x, self.y = self.x[order], self.y[order]
+        keep = lttb(self.x, self.y, self.points)
+        self.x, self.y = self.x[keep], self.y[keep]
+
+    def series(self, name=None):
+        """The points so far, sorted by x and at most ``points`` long."""
+        self._reduce()
+        return pd.Series(self.y, index=pd.DatetimeIndex(self.x), name=name)
@@ -0,0 +1,84 @@
+"""Start a dashboard with its libraries imported and its data loaded in advance.
+
+Without this, the first session after the server starts (e.g. right after an
+autoscaled pod comes up) pays for every import and the dataset parse before
+its first chart. ``warm_start.py`` does that work in the server process
+before Streamlit starts listening:
+
+* imports the page module, i.e. every library it imports at the top
+* imports the libraries its sections import only when drawn (``PAGES``)
+* loads the page's datasets into the shared ``data_loader`` cache (the
+  match store is synced first)
+* with ``DASHBOARD_COMPUTE_WORKERS`` set, starts the worker pool
+
+Then it runs ``streamlit run`` in the same process, so the first session finds
+the modules in ``sys.modules`` and the frames in the loader cache. Arguments
+after the script go to ``streamlit run``.
+
+    python warm_start.py stream1.py
+    python warm_start.py wether.py --server.port 8502
+"""
+import importlib
+import os
+import sys
+import time
+
+import data_loader
+
+# script -> datasets it loads, libraries its sections import on first use
+PAGES = {
+    "Ai_job_streamlit.py": {"datasets": ("ai_job",), "libraries": ("plotly.express",)},
+    "stream1.py": {"datasets": ("matches",), "libraries": ("plotly.express",)},
+    "flight_streamlit.py": {"datasets": ("flight",), "libraries": ("plotly.express",)},
+    "Ecommerence_streamlit.py": {"datasets": ("ecommerce",), "libraries": ("plotly.express",)},
+    "wether.py": {"datasets": (), "libraries": ("plotly.express", "matplotlib.pyplot", "seaborn")},
+    "stream.py": {"datasets": (), "libraries": ("matplotlib.pyplot", "seaborn")},
+}
+
+
+def warm(script):
+    """Import ``script``'s libraries and load its datasets; returns seconds per step."""
+    page = PAGES.get(os.path.basename(script), {"datasets": (), "libraries": ()})
+    steps = {}
+    start = time.perf_counter()
+    importlib.import_module(os.path.splitext(os.path.basename(script))[0])
+    steps["imports"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in page["libraries"]:
+        importlib.import_module(name)
+    steps["deferred_imports"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in page["datasets"]:
+        if data_loader.DATASETS[name].get("partitioned"):
+            import match_store
+            match_store.sync()
+        if os.path.exists(data_loader.dataset_path(name)):
+            data_loader.load_dataset(name)
+    steps["datasets"] = time.perf_counter() - start
+
+    import compute_worker
+
+    start = time.perf_counter()
+    compute_worker.warm()
+    steps["workers"] = time.perf_counter() - start
+    return steps
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 2
+    script, streamlit_args = argv[0], argv[1:]
+    steps = warm(script)
+    print("warm start: " + ", ".join(f"{step} {seconds:.2f}s" for step, seconds in steps.items()), flush=True)
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", script, *streamlit_args]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,216 @@
+"""Open-Meteo forecast client shared by the weather dashboard.
+
+One pooled ``requests.Session`` (keep-alive, retries with backoff, timeouts)
+plus a process-wide response cache keyed by (lat, lon, variables, timezone).
+Open-Meteo refreshes its hourly forecast once an hour, so cached responses
+expire at the next top of the hour. For a grace period after that the stale
+response is still served while a background thread re-fetches it
+(stale-while-revalidate), and it is also served if the re-fetch fails.
+Concurrent misses on the same key wait for one fetch instead of each
+sending a request.
+
+Set ``OPEN_METEO_URL`` to point the client at ``weather_stub_server.py``.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = os.environ.get("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+HOURLY = ("temperature_2m", "windspeed_10m", "winddirection_10m")
+
+TIMEOUT = (3.05, 10)        # (connect, read) seconds
+STALE_GRACE_SECONDS = 15 * 60
+POOL_SIZE = 16
+
+
+# ------------------------ City Coordinates ------------------------
+city_coords = {
+    "Delhi": (28.61, 77.23),
+    "Mumbai": (19.07, 72.87),
+    "Kolkata": (22.57, 88.36),
+    "Shimla": (31.10, 77.17),
+    "Ludhiana": (30.91, 75.85),
+    "Manali": (32.24, 77.19),
+    "Bangalore": (12.97, 77.59),
+    "Hyderabad": (17.38, 78.48),
+    "Chennai": (13.08, 80.27),
+    "Jaipur": (26.91, 75.79),
+    "Ahmedabad": (23.03, 72.58),
+    "Lucknow": (26.85, 80.95),
+    "Indore": (22.72, 75.87),
+    "Amritsar": (31.63, 74.87),
+    "Chandigarh": (30.74, 76.79),
+    "Jalandhar": (31.33, 75.57)
+}
+
+
+class WeatherError(Exception):
+    pass
+
+
+_session = None
+_session_lock = threading.Lock()
+_cache_lock = threading.Lock()
+_cache = {}          # key -> {"payload", "expires"}
+_refreshing = set()
+_inflight = {}       # key -> Future of the fetch a miss started
+stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "refreshes": 0}
+
+
+def session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def next_hour(now):
+    return (int(now) // 3600 + 1) * 3600
+
+
+def _fetch(lat, lon, hourly, timezone):
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": ",".join(hourly),
+        "timezone": timezone,
+    }
+    try:
+        res = session().get(BASE_URL, params=params, timeout=TIMEOUT)
+        res.raise_for_status()
+        payload = res.json()
+    except (requests.RequestException, ValueError) as exc:
+        raise WeatherError(f"Open-Meteo request failed: {exc}") from exc
+    if "hourly" not in payload:
+        raise WeatherError(f"Open-Meteo response has no hourly data: {payload.get('reason', payload)}")
+    return payload
+
+
+def _store(key, payload):
+    with _cache_lock:
+        _cache[key] = {"payload": payload, "expires": next_hour(time.time())}
+
+
+def _count(name):
+    with _cache_lock:
+        stats[name] += 1
+
+
+def _refresh(key):
+    try:
+        _store(key, _fetch(*key))
+        _count("refreshes")
+    except WeatherError:
+        _count("errors")
+    finally:
+        with _cache_lock:
+            _refreshing.discard(key)
+
+
+def get_forecast(lat, lon, hourly=HOURLY, timezone="auto"):
+    """Return the Open-Meteo forecast payload for one coordinate."""
+    key = (round(lat, 4), round(lon, 4), tuple(hourly), timezone)
+    now = time.time()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and now < entry["expires"]:
+            stats["hits"] += 1
+            return entry["payload"]
+        if entry is not None and now < entry["expires"] + STALE_GRACE_SECONDS:
+            stats["stale_hits"] += 1
+            if key not in _refreshing:
+                _refreshing.add(key)
+                threading.Thread(target=_refresh, args=(key,), daemon=True).start()
+            return entry["payload"]
+        # concurrent misses on one key share a single fetch
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            stats["misses"] += 1
+            future = _inflight[key] = Future()
+        else:
+            stats["coalesced"] += 1
+
+    if leader:
+        try:
+            payload = _fetch(*key)
+        except Exception as exc:
+            _count("errors")
+            future.set_exception(exc)
+        else:
+            _store(key, payload)
+            future.set_result(payload)
+        finally:
+            with _cache_lock:
+                del _inflight[key]
+    try:
+        return future.result()
+    except WeatherError:
+        if entry is not None:
+            # stale-if-error: an old forecast beats an error page
+            return entry["payload"]
+        raise
+
+
+def fetch_many(coords, hourly=HOURLY, timezone="auto"):
+    """Fetch forecasts for ``{name: (lat, lon)}`` concurrently.
+
+    Requests run on a thread pool sized to the session's connection pool, so
+    wall-clock time is close to one round trip rather than one per city.
+    Returns ``(payloads, errors)`` dicts keyed by name.
+    """
+    payloads, errors = {}, {}
+    if not coords:
+        return payloads, errors
+    with ThreadPoolExecutor(max_workers=min(POOL_SIZE, len(coords))) as pool:
+        futures = {
+            name: pool.submit(get_forecast, lat, lon, hourly, timezone)
+            for name, (lat, lon) in coords.items()
+        }
+        for name, future in futures.items():
+            try:
+                payloads[name] = future.result()
+            except WeatherError as exc:
+                errors[name] = exc
+    return payloads, errors
+
+
+def hourly_frame(payload):
+    """The hourly block of a payload as the frame the dashboard charts."""
+    hourly = payload["hourly"]
+    return pd.DataFrame({
+        "Time": pd.to_datetime(hourly["time"]),
+        "Temperature (°C)": hourly["temperature_2m"],
+        "Wind Speed (km/h)": hourly["windspeed_10m"],
+        "Wind Direction (°)": hourly["winddirection_10m"]
+    })
+
+
+def long_frame(payloads):
+    """Stack ``{city: payload}`` into one long-format frame with a City column."""
+    frames = [hourly_frame(payload).assign(City=city) for city, payload in payloads.items()]
+    if not frames:
+        return hourly_frame({"hourly": {v: [] for v in ("time", *HOURLY)}}).assign(City=[])
+    return pd.concat(frames, ignore_index=True)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
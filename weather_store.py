@@ -0,0 +1,141 @@
+"""Append-only local store of hourly weather readings with daily/weekly rollups.
+
+Layout under ``WEATHER_STORE_DIR`` (default ``.weather_store``)::
+
+    <city>/hourly/<YYYY-MM-DD>.csv   one partition per city and day
+    <city>/daily.csv                 min/max/sum/count per day
+    <city>/weekly.csv                the same per ISO week (weeks start Monday)
+
+Appends dedupe on (city, Time), keeping the latest reading, so re-fetching a
+forecast simply refreshes the hours it covers. Range queries open only the
+partitions whose day falls in the range, and history charts read the small
+rollup files instead of re-resampling raw hours.
+"""
+import os
+import threading
+
+import pandas as pd
+
+STORE_DIR = os.environ.get("WEATHER_STORE_DIR", ".weather_store")
+MEASURES = {"Temperature (°C)": "temp", "Wind Speed (km/h)": "wind"}
+
+_lock = threading.Lock()
+_last_appended = {}  # city -> hash of the last frame written
+
+
+def _city_dir(city):
+    return os.path.join(STORE_DIR, city)
+
+
+def _partition_path(city, day):
+    return os.path.join(_city_dir(city), "hourly", f"{day:%Y-%m-%d}.csv")
+
+
+def _write(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _read(path, date_cols):
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, parse_dates=date_cols)
+
+
+def _summarize(hourly, key):
+    grouped = hourly.groupby(key)
+    parts = []
+    for col, prefix in MEASURES.items():
+        stats = grouped[col].agg(["min", "max", "sum", "count"])
+        stats.columns = [f"{prefix}_{stat}" for stat in stats.columns]
+        parts.append(stats)
+    return pd.concat(parts, axis=1)
+
+
+def _merge_rollup(path, key, fresh):
+    """Replace the rows of ``fresh``'s keys in the rollup file at ``path``."""
+    existing = _read(path, [key])
+    if existing is not None:
+        existing = existing.set_index(key)
+        existing = existing[~existing.index.isin(fresh.index)]
+        fresh = pd.concat([existing, fresh])
+    _write(fresh.sort_index().reset_index(), path)
+
+
+def append(city, hourly_df):
+    """Persist hourly readings for ``city``; returns the number of days touched."""
+    frame_hash = int(pd.util.hash_pandas_object(hourly_df, index=False).sum())
+    with _lock:
+        if _last_appended.get(city) == frame_hash:
+            return 0
+        days = hourly_df["Time"].dt.normalize()
+        daily = []
+        for day, rows in hourly_df.groupby(days):
+            path = _partition_path(city, day)
+            existing = _read(path, ["Time"])
+            if existing is not None:
+                rows = pd.concat([existing, rows])
+            rows = rows.drop_duplicates(subset="Time", keep="last").sort_values("Time")
+            _write(rows, path)
+            daily.append(rows.assign(Date=day))
+        if not daily:
+            return 0
+
+        touched = pd.concat(daily)
+        _merge_rollup(os.path.join(_city_dir(city), "daily.csv"), "Date", _summarize(touched, "Date"))
+
+        # Weekly rows are rebuilt from the daily rollup of each touched week.
+        daily_rollup = read_rollup(city, "daily")
+        week = daily_rollup["Date"].dt.to_period("W-SUN").dt.start_time
+        touched_weeks = touched["Date"].dt.to_period("W-SUN").dt.start_time.unique()
+        in_touched = week.isin(touched_weeks)
+        weekly = daily_rollup[in_touched].assign(Week=week[in_touched]).groupby("Week").agg({
+            **{f"{p}_min": "min" for p in MEASURES.values()},
+            **{f"{p}_max": "max" for p in MEASURES.values()},
+            **{f"{p}_sum": "sum" for p in MEASURES.values()},
+            **{f"{p}_count": "sum" for p in MEASURES.values()},
+        })
+        _merge_rollup(os.path.join(_city_dir(city), "weekly.csv"), "Week", weekly)
+        _last_appended[city] = frame_hash
+        return len(daily)
+
+
+def cities():
+    if not os.path.isdir(STORE_DIR):
+        return []
+    return sorted(d for d in os.listdir(STORE_DIR) if os.path.isdir(_city_dir(d)))
+
+
+def read_hourly(city, start=None, end=None):
+    """Hourly readings for ``city`` between ``start`` and ``end`` (inclusive days)."""
+    directory = os.path.join(_city_dir(city), "hourly")
+    if not os.path.isdir(directory):
+        return pd.DataFrame(columns=["Time", *MEASURES])
+    start = pd.Timestamp(start).normalize() if start is not None else None
+    end = pd.Timestamp(end).normalize() if end is not None else None
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".csv"):
+            continue
+        day = pd.Timestamp(name[:-4])
+        if (start is None or day >= start) and (end is None or day <= end):
+            frames.append(pd.read_csv(os.path.join(directory, name), parse_dates=["Time"]))
+    if not frames:
+        return pd.DataFrame(columns=["Time", *MEASURES])
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_rollup(city, level="daily", start=None, end=None):
+    """Daily or weekly rollup for ``city`` with mean columns added."""
+    key = "Date" if level == "daily" else "Week"
+    rollup = _read(os.path.join(_city_dir(city), f"{level}.csv"), [key])
+    if rollup is None:
+        return pd.DataFrame(columns=[key])
+    if start is not None:
+        rollup = rollup[rollup[key] >= pd.Timestamp(start)]
+    if end is not None:
+        rollup = rollup[rollup[key] <= pd.Timestamp(end)]
+    means = {f"{p}_mean": rollup[f"{p}_sum"] / rollup[f"{p}_count"] for p in MEASURES.values()}
+    return rollup.assign(**means).reset_index(drop=True)
@@ -0,0 +1,166 @@
+"""Local stand-in for the Open-Meteo forecast API.
+
+Serves ``GET /v1/forecast`` with a deterministic synthetic forecast in the
+API's schema, or with the payload in ``--fixtures`` (``<lat>_<lon>.json``)
+for a location that has one; none are checked in. ``--days`` sets the
+length of synthetic forecasts (Open-Meteo returns 7 days) so payload size
+can be scaled. ``--latency`` adds a delay to every response so cache and
+concurrency behaviour can be measured offline; ``GET /stats`` returns the
+request counters. ``--record`` fetches a payload for every dashboard city
+from the real API into the fixtures directory.
+
+    python weather_stub_server.py --port 8765 --latency 200
+    OPEN_METEO_URL=http://127.0.0.1:8765/v1/forecast streamlit run wether.py
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "open_meteo")
+UNITS = {"temperature_2m": "°C", "windspeed_10m": "km/h", "winddirection_10m": "°"}
+
+
+def fixture_name(lat, lon):
+    return f"{float(lat):.2f}_{float(lon):.2f}.json"
+
+
+def synthetic_payload(lat, lon, hourly=tuple(UNITS), days=7, start=None):
+    """A deterministic Open-Meteo-shaped forecast for one coordinate."""
+    lat, lon = float(lat), float(lon)
+    start = start or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    hours = days * 24
+    times = [(start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(hours)]
+    base = 32 - 0.45 * abs(lat - 10) - (8 if lat > 30 else 0)
+    series = {
+        "temperature_2m": [
+            round(base + 6 * math.sin((h % 24 - 9) / 24 * 2 * math.pi) + math.sin(h / 17 + lon), 1)
+            for h in range(hours)
+        ],
+        "windspeed_10m": [round(8 + 5 * abs(math.sin(h / 11 + lat)), 1) for h in range(hours)],
+        "winddirection_10m": [int((180 + 120 * math.sin(h / 29 + lon)) % 360) for h in range(hours)],
+    }
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "generationtime_ms": 0.1,
+        "utc_offset_seconds": 19800,
+        "timezone": "Asia/Kolkata",
+        "timezone_abbreviation": "IST",
+        "elevation": 0.0,
+        "hourly_units": {"time": "iso8601", **{v: UNITS.get(v, "") for v in hourly}},
+        "hourly": {"time": times, **{v: series[v] for v in hourly if v in series}},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "OpenMeteoStub/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            self._send_json(200, self.server.stats)
+            return
+        if url.path != "/v1/forecast":
+            self._send_json(404, {"error": True, "reason": f"unknown path {url.path}"})
+            return
+
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        query = parse_qs(url.query)
+        try:
+            lat, lon = query["latitude"][0], query["longitude"][0]
+        except KeyError:
+            self._send_json(400, {"error": True, "reason": "latitude and longitude are required"})
+            return
+        hourly = tuple(query.get("hourly", [",".join(UNITS)])[0].split(","))
+
+        path = os.path.join(self.server.fixtures, fixture_name(lat, lon))
+        if os.path.exists(path):
+            with open(path) as f:
+                payload = json.load(f)
+        else:
+            payload = synthetic_payload(lat, lon, hourly, days=self.server.days)
+        self._send_json(200, payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(port=0, latency=0.0, fixtures=FIXTURES_DIR, verbose=False, days=7):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fixtures = fixtures
+    server.verbose = verbose
+    server.days = days
+    server.stats = {"requests": 0}
+    server.stats_lock = threading.Lock()
+    return server
+
+
+def start_in_thread(latency=0.0, fixtures=FIXTURES_DIR, days=7):
+    """Start a stub server on a free port; returns ``(server, forecast_url)``."""
+    server = make_server(latency=latency, fixtures=fixtures, days=days)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/v1/forecast"
+
+
+def record(fixtures):
+    import requests
+    from weather_client import city_coords
+
+    os.makedirs(fixtures, exist_ok=True)
+    for city, (lat, lon) in city_coords.items():
+        res = requests.get(
+            "https://api.open-meteo.com/v1/forecast",
+            params={"latitude": lat, "longitude": lon, "hourly": ",".join(UNITS), "timezone": "auto"},
+            timeout=(3.05, 10),
+        )
+        res.raise_for_status()
+        with open(os.path.join(fixtures, fixture_name(lat, lon)), "w") as f:
+            json.dump(res.json(), f)
+        print(f"recorded {city}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="added delay per request, in ms")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--days", type=int, default=7, help="days of hourly data in synthetic forecasts")
+    parser.add_argument("--record", action="store_true", help="record real payloads for every city and exit")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.fixtures)
+        return
+    server = make_server(args.port, args.latency / 1000, args.fixtures, args.verbose, args.days)
+    print(f"serving http://127.0.0.1:{server.server_address[1]}/v1/forecast (latency {args.latency:.0f} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,232 @@
-import requests
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-st.set_page_config(page_title="🌦️ Weather Dashboard", layout="wide")
-st.title("🌦️  Weather Dashboard")
-
-# ------------------------ City Coordinates ------------------------
-city_coords = {
-    "Delhi": (28.61, 77.23),
-    "Mumbai": (19.07, 72.87),
-    "Kolkata": (22.57, 88.36),
-    "Shimla": (31.10, 77.17),
-    "Ludhiana": (30.91, 75.85),
-    "Manali": (32.24, 77.19),
-    "Bangalore": (12.97, 77.59),
-    "Hyderabad": (17.38, 78.48),
-    "Chennai": (13.08, 80.27),
-    "Jaipur": (26.91, 75.79),
-    "Ahmedabad": (23.03, 72.58),
-    "Lucknow": (26.85, 80.95),
-    "Indore": (22.72, 75.87),
-    "Amritsar": (31.63, 74.87),
-    "Chandigarh": (30.74, 76.79),
-    "Jalandhar": (31.33, 75.57)
-}
-
-# ------------------------ City Selection ------------------------
-city = st.selectbox("📍 Select a City", list(city_coords.keys()))
-
-if city:
-    lat, lon = city_coords[city]
 
-    # ------------------------ API Call ------------------------
-    url = (
-        f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={lat}&longitude={lon}&hourly=temperature_2m,windspeed_10m,winddirection_10m"
-        f"&timezone=auto"
-    )
-    res = requests.get(url)
-    data = res.json()
+import calendar_dim
+import chart_reduce
+import figure_cache
+import perf
+import sections
+import weather_store
+from sections import Section
+from weather_client import WeatherError, city_coords, fetch_many, get_forecast, hourly_frame, long_frame
 
-    # ------------------------ Data Processing ------------------------
-    hourly_df = pd.DataFrame({
-        "Time": pd.to_datetime(data["hourly"]["time"]),
-        "Temperature (°C)": data["hourly"]["temperature_2m"],
-        "Wind Speed (km/h)": data["hourly"]["windspeed_10m"],
-        "Wind Direction (°)": data["hourly"]["winddirection_10m"]
-    })
-
-    # ------------------------ Line Chart: Temperature ------------------------
-    st.subheader(f"📈 Hourly Temperature in {city}")
-    fig_temp = px.line(hourly_df, x="Time", y="Temperature (°C)", markers=True, color_discrete_sequence=['orange'])
-    st.plotly_chart(fig_temp, use_container_width=True)
-
-    # ------------------------ Area Chart: Wind Speed ------------------------
-    st.subheader(f"💨 Wind Speed Trend in {city}")
-    fig_wind = px.area(hourly_df, x="Time", y="Wind Speed (km/h)", title="Wind Speed Over Time", color_discrete_sequence=['skyblue'])
-    st.plotly_chart(fig_wind, use_container_width=True)
-
-    # ------------------------ Heatmap: Temperature by Hour & Day ------------------------
-    st.subheader("🔥 Temperature Heatmap (Hourly)")
-
-    temp_pivot = hourly_df.copy()
-    temp_pivot["Hour"] = temp_pivot["Time"].dt.hour
-    temp_pivot["Day"] = temp_pivot["Time"].dt.date
-    heatmap_data = temp_pivot.pivot(index="Day", columns="Hour", values="Temperature (°C)")
 
+# ------------------------ Multi-City Comparison ------------------------
+def compare_temperature_section(compare_df):
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig_temp_cmp = px.line(compare_df, x="Time", y="Temperature (°C)", color="City")
+        return fig_temp_cmp
+
+    figure_cache.plotly_chart(figure)
+
+
+def compare_wind_section(compare_df):
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig_wind_cmp = px.line(compare_df, x="Time", y="Wind Speed (km/h)", color="City")
+        return fig_wind_cmp
+
+    figure_cache.plotly_chart(figure)
+
+
+def compare_heatmap_section(compare_df):
+    def figure():
+        import plotly.express as px
+        city_hour = compare_df.pivot(index="City", columns="Time", values="Temperature (°C)")
+        perf.phase("figure")
+        fig_city_hour = px.imshow(city_hour, aspect="auto", color_continuous_scale="RdBu_r",
+                                  labels={"x": "Time", "y": "City", "color": "°C"})
+        return fig_city_hour
+
+    figure_cache.plotly_chart(figure)
+
+
+COMPARE_SECTIONS = [
+    Section("compare_temperature", "📈 Hourly Temperature by City", compare_temperature_section),
+    Section("compare_wind", "💨 Wind Speed by City", compare_wind_section),
+    Section("compare_heatmap", "🔥 Temperature Heatmap (City × Hour)", compare_heatmap_section),
+]
+
+
+# ------------------------ Line Chart: Temperature ------------------------
+def temperature_section(city, hourly_df):
+    def figure():
+        import plotly.express as px
+        temp_points = chart_reduce.downsample(hourly_df, "Time", "Temperature (°C)")
+        perf.phase("figure")
+        fig_temp = px.line(temp_points, x="Time", y="Temperature (°C)", markers=True, color_discrete_sequence=['orange'])
+        return fig_temp
+
+    figure_cache.plotly_chart(figure)
+
+
+# ------------------------ Area Chart: Wind Speed ------------------------
+def wind_section(city, hourly_df):
+    def figure():
+        import plotly.express as px
+        wind_points = chart_reduce.downsample(hourly_df, "Time", "Wind Speed (km/h)")
+        perf.phase("figure")
+        fig_wind = px.area(wind_points, x="Time", y="Wind Speed (km/h)", title="Wind Speed Over Time", color_discrete_sequence=['skyblue'])
+        return fig_wind
+
+    figure_cache.plotly_chart(figure)
+
+
+# ------------------------ Heatmap: Temperature by Hour & Day ------------------------
+def heatmap_section(city, hourly_df):
+    hours = calendar_dim.TimeDim.build(hourly_df["Time"])
+    temp_pivot = hours.aggregate(("date", "hour"), hourly_df["Temperature (°C)"], "mean")
+    temp_pivot["date"] = temp_pivot["date"].dt.date
+    heatmap_data = temp_pivot.pivot(index="date", columns="hour", values="Temperature (°C)")
+    heatmap_data = heatmap_data.rename_axis(index="Day", columns="Hour")
+
+    # matplotlib and seaborn take seconds to import and only this chart uses them
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    perf.phase("figure")
     fig, ax = plt.subplots(figsize=(12, 3))
     sns.heatmap(heatmap_data, cmap="coolwarm", annot=True, fmt=".1f", linewidths=0.1, ax=ax)
     ax.set_title("Temperature Heatmap")
-    st.pyplot(fig)
-
-    # ------------------------ Bar Chart: Max/Min Temp ------------------------
-    st.subheader("📊 Daily Max and Min Temperature")
-
-    temp_summary = hourly_df.resample("D", on="Time").agg({"Temperature (°C)": ["max", "min"]}).reset_index()
-    temp_summary.columns = ["Date", "Max Temp (°C)", "Min Temp (°C)"]
-
-    fig_bar = px.bar(temp_summary, x="Date", y=["Max Temp (°C)", "Min Temp (°C)"],
-                     barmode="group", title="Daily Max & Min Temperature")
-    st.plotly_chart(fig_bar, use_container_width=True)
-
-    # ------------------------ Dual Y-Axis Line Chart ------------------------
-    st.subheader("📈 Compare Temperature and Wind Speed")
-    fig_dual = px.line()
-    fig_dual.add_scatter(x=hourly_df["Time"], y=hourly_df["Temperature (°C)"],
-                         mode='lines', name='Temperature (°C)', line=dict(color='orange'))
-    fig_dual.add_scatter(x=hourly_df["Time"], y=hourly_df["Wind Speed (km/h)"],
-                         mode='lines', name='Wind Speed (km/h)', line=dict(color='blue'))
-    fig_dual.update_layout(title="Temperature vs Wind Speed Over Time", xaxis_title="Time")
-    st.plotly_chart(fig_dual, use_container_width=True)
-
-    # ------------------------ Polar Plot: Wind Direction ------------------------
-    st.subheader("🧭 Wind Direction Polar Plot")
-    fig_polar = px.line_polar(r=hourly_df["Wind Speed (km/h)"],
-                              theta=hourly_df["Wind Direction (°)"],
-                              title="Wind Direction & Speed", line_close=True)
-    st.plotly_chart(fig_polar, use_container_width=True)
+    chart_reduce.pyplot(fig)
+
+
+# ------------------------ Bar Chart: Max/Min Temp ------------------------
+def daily_range_section(city, hourly_df):
+    days = calendar_dim.TimeDim.build(hourly_df["Time"])
+    temperature = hourly_df["Temperature (°C)"]
+    daily_max = days.aggregate(("date",), temperature, "max", empty=True, name="Max Temp (°C)")
+    daily_min = days.aggregate(("date",), temperature, "min", empty=True, name="Min Temp (°C)")
+    temp_summary = daily_max.assign(**{"Min Temp (°C)": daily_min["Min Temp (°C)"]}).rename(columns={"date": "Date"})
+
+    def figure():
+        import plotly.express as px
+        perf.phase("figure")
+        fig_bar = px.bar(temp_summary, x="Date", y=["Max Temp (°C)", "Min Temp (°C)"],
+                         barmode="group", title="Daily Max & Min Temperature")
+        return fig_bar
+
+    figure_cache.plotly_chart(figure)
+
+
+# ------------------------ Dual Y-Axis Line Chart ------------------------
+def temperature_vs_wind_section(city, hourly_df):
+    def figure():
+        import plotly.express as px
+        temp_points = chart_reduce.downsample(hourly_df, "Time", "Temperature (°C)")
+        wind_points = chart_reduce.downsample(hourly_df, "Time", "Wind Speed (km/h)")
+        perf.phase("figure")
+        fig_dual = px.line()
+        fig_dual.add_scatter(x=temp_points["Time"], y=temp_points["Temperature (°C)"],
+                             mode='lines', name='Temperature (°C)', line=dict(color='orange'))
+        fig_dual.add_scatter(x=wind_points["Time"], y=wind_points["Wind Speed (km/h)"],
+                             mode='lines', name='Wind Speed (km/h)', line=dict(color='blue'))
+        fig_dual.update_layout(title="Temperature vs Wind Speed Over Time", xaxis_title="Time")
+        return fig_dual
+
+    figure_cache.plotly_chart(figure)
+
+
+# ------------------------ Polar Plot: Wind Direction ------------------------
+def wind_direction_section(city, hourly_df):
+    def figure():
+        import plotly.express as px
+        # rows LTTB keeps for the speed line, so each kept speed stays paired with its direction
+        wind_points = chart_reduce.downsample(hourly_df, "Time", "Wind Speed (km/h)")
+        perf.phase("figure")
+        # svg: past 1,000 points px switches to scatterpolargl, which rejects the line's "shape"
+        fig_polar = px.line_polar(r=wind_points["Wind Speed (km/h)"],
+                                  theta=wind_points["Wind Direction (°)"],
+                                  title="Wind Direction & Speed", line_close=True, render_mode="svg")
+        return fig_polar
+
+    figure_cache.plotly_chart(figure)
+
+
+# ------------------------ History: Stored Daily/Weekly Rollups ------------------------
+def history_section(city, hourly_df):
+    level = st.radio("Rollup", ["daily", "weekly"], horizontal=True, format_func=str.title, key="rollup")
+    history = weather_store.read_rollup(city, level)
+    if history.empty:
+        st.info(f"ℹ️ No stored {level} history for {city} yet.")
+        return
+    period = "Date" if level == "daily" else "Week"
+    history = history.rename(columns={"temp_min": "Min Temp (°C)", "temp_mean": "Mean Temp (°C)",
+                                      "temp_max": "Max Temp (°C)"})
+
+    # Not cached: the store grows on every fetch, which the page's version does not cover
+    import plotly.express as px
+    perf.phase("figure")
+    fig_history = px.line(history, x=period, y=["Min Temp (°C)", "Mean Temp (°C)", "Max Temp (°C)"],
+                          markers=True, title=f"{level.title()} Temperature History")
+    fig_history.update_layout(yaxis_title="Temperature (°C)")
+    chart_reduce.plotly_chart(fig_history)
+
+
+SECTIONS = [
+    Section("temperature", "📈 Hourly Temperature in {city}", temperature_section),
+    Section("wind", "💨 Wind Speed Trend in {city}", wind_section),
+    Section("heatmap", "🔥 Temperature Heatmap (Hourly)", heatmap_section),
+    Section("daily_range", "📊 Daily Max and Min Temperature", daily_range_section),
+    Section("temperature_vs_wind", "📈 Compare Temperature and Wind Speed", temperature_vs_wind_section),
+    Section("wind_direction", "🧭 Wind Direction Polar Plot", wind_direction_section),
+    Section("history", "📚 Stored Temperature History for {city}", history_section, inputs=("rollup",)),
+]
+
+
+def main():
+    st.set_page_config(page_title="🌦️ Weather Dashboard", layout="wide")
+    st.title("🌦️  Weather Dashboard")
+    chart_reduce.controls()
+    perf.start("weather")
+
+    mode = st.radio("View", ["Single city", "Compare cities"], horizontal=True, key="weather_mode")
+
+    if mode == "Compare cities":
+        cities = st.multiselect("📍 Select Cities", list(city_coords.keys()), default=["Delhi", "Shimla", "Chennai"],
+                                key="compare_cities")
+        perf.section("fetch", phase="load")
+        payloads, errors = fetch_many({c: city_coords[c] for c in cities})
+        for c, exc in errors.items():
+            st.warning(f"⚠️ Could not load the forecast for {c}: {exc}")
+        perf.section("process")
+        for c, payload in payloads.items():
+            weather_store.append(c, hourly_frame(payload))
+        compare_df = long_frame(payloads)
+
+        if not compare_df.empty:
+            sections.render("weather_compare", COMPARE_SECTIONS, compare_df,
+                            version=figure_cache.frame_version(compare_df))
+        perf.finish()
+        return
+
+    # ------------------------ City Selection ------------------------
+    city = st.selectbox("📍 Select a City", list(city_coords.keys()), key="city")
+    if not city:
+        perf.finish()
+        return
+    lat, lon = city_coords[city]
+
+    # ------------------------ API Call ------------------------
+    perf.section("fetch", phase="load")
+    try:
+        data = get_forecast(lat, lon)
+    except WeatherError as exc:
+        st.error(f"⚠️ Could not load the forecast for {city}: {exc}")
+        perf.finish()
+        return
+
+    # ------------------------ Data Processing ------------------------
+    perf.section("process")
+    hourly_df = hourly_frame(data)
+    weather_store.append(city, hourly_df)
+
+    sections.render("weather", SECTIONS, city, hourly_df, city=city,
+                    version=(city, figure_cache.frame_version(hourly_df)))
+    perf.finish()
+
+
+if __name__ == "__main__":
+    main()